@@ -0,0 +1,176 @@
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Literal, NamedTuple
+
+from ordered_set import OrderedSet
+
+from warp_fastapi import AppObject, AppProject, ProjectCreator
+from warp_fastapi.attributes import IntAttribute, NameAttribute, StringAttribute
+from warp_fastapi.code.code_objects.base import AbstractModuleCode, AbstractVariableCode, SimpleVariable
+from warp_fastapi.code.code_objects.model import ModelModuleCode
+from warp_fastapi.code.code_objects.repository import RepoModuleCode
+from warp_fastapi.code.code_objects.routes import RoutesModuleCode
+from warp_fastapi.code.code_objects.schema import SchemaModuleCode, find_base_att
+from warp_fastapi.code.code_objects.service import ServiceModuleCode
+from warp_fastapi.code.code_objects.tests import ConfTestModuleCode, TestModuleCode
+from warp_fastapi.config import StructureConfig
+
+Shape = Literal['tree', 'chain', 'mesh', 'self']
+SHAPES: tuple[Shape, ...] = ('tree', 'chain', 'mesh', 'self')
+
+OBJECT_MODULES: list[Callable[[AppObject, StructureConfig], AbstractModuleCode]] = [
+    ModelModuleCode,
+    RepoModuleCode,
+    RoutesModuleCode,
+    SchemaModuleCode,
+    ServiceModuleCode,
+]
+
+# upper bounds in milliseconds per object, a few times the slowest shape at 50 objects so only regressions fail
+THRESHOLDS: dict[str, float] = {
+    'ModelModuleCode': 5,
+    'RepoModuleCode': 5,
+    'RoutesModuleCode': 25,
+    'SchemaModuleCode': 10,
+    'ServiceModuleCode': 5,
+    'ServiceModuleCode[mesh]': 5,
+    'TestModuleCode': 15,
+    'ConfTestModuleCode': 40,
+    'render': 5,
+    'find_base_att': 0.2,
+    'create_project': 2000,
+}
+
+
+class Measurement(NamedTuple):
+    seconds: float
+    peak_kib: float
+
+
+def build_project(size: int, shape: Shape = 'tree', density: int = 1) -> AppProject:
+    objects = [
+        AppObject(f'entity{i}', NameAttribute(), StringAttribute('description'), IntAttribute('amount'))
+        for i in range(size)
+    ]
+    for i, obj in enumerate(objects):
+        if shape == 'tree' and i:
+            # a shallow tree, long one-to-many chains hit the recursion limit when tests are generated
+            parent = objects[(i - 1) // 4]
+            parent.add_one_to_many_rel(obj, f'{obj.name}_items', parent.name)
+        elif shape == 'chain' and i:
+            parent = objects[i - 1]
+            parent.add_one_to_many_rel(obj, f'{obj.name}_items', parent.name)
+        elif shape == 'mesh':
+            # every object is linked to the next objects, wrapping around at the end
+            for step in range(1, min(density, size - 1) + 1):
+                other = objects[(i + step) % size]
+                obj.add_many_to_many_rel(other, f'{other.name}_links', f'{obj.name}_links')
+        elif shape == 'self':
+            obj.add_many_to_one_rel(obj, 'parent', 'children', optional=True)
+    return AppProject('benchmark_app', *objects)
+
+
+def build_schema_sets(size: int) -> list[OrderedSet[AbstractVariableCode]]:
+    # read, create and edit attributes of a schema, they share a common prefix like the generated ones
+    common = [SimpleVariable(f'field{i}', 'str') for i in range(size)]
+    return [
+        OrderedSet([*common, SimpleVariable('id', 'int')]),
+        OrderedSet([*common, SimpleVariable('password', 'str')]),
+        OrderedSet([SimpleVariable(f'field{i}', 'str | None', 'None') for i in range(size)]),
+    ]
+
+
+def measure(func: Callable[[], object]) -> Measurement:
+    # time and memory are taken in separate runs, tracing allocations slows the code down
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Measurement(seconds, peak / 1024)
+
+
+def run_suite(
+    size: int, shape: Shape = 'tree', density: int = 1, create_project: bool = True
+) -> dict[str, Measurement]:
+    project = build_project(size, shape, density)
+    config = StructureConfig()
+    results: dict[str, Measurement] = {}
+    modules: list[AbstractModuleCode] = []
+    for module_cls in OBJECT_MODULES:
+        name = getattr(module_cls, '__name__')
+        results[name] = measure(lambda: [module_cls(obj, config) for obj in project.app_objects])
+        modules += [module_cls(obj, config) for obj in project.app_objects]
+    # services look up the cache namespaces of everything their deletes cascade to, which is most of a mesh
+    mesh = build_project(size, 'mesh', max(density, 3))
+    results['ServiceModuleCode[mesh]'] = measure(lambda: [ServiceModuleCode(obj, config) for obj in mesh.app_objects])
+    results['TestModuleCode'] = measure(lambda: TestModuleCode(project.app_objects, config))
+    results['ConfTestModuleCode'] = measure(lambda: ConfTestModuleCode(project.app_objects, config))
+    modules += [TestModuleCode(project.app_objects, config), ConfTestModuleCode(project.app_objects, config)]
+    results['render'] = measure(lambda: [str(module) for module in modules])
+    schema_sets = build_schema_sets(size)
+    results['find_base_att'] = measure(lambda: find_base_att(*schema_sets))
+    if create_project:
+        results['create_project'] = measure(lambda: generate(project))
+    return results
+
+
+def generate(project: AppProject, workers: int = 1) -> None:
+    with tempfile.TemporaryDirectory() as project_dir:
+        ProjectCreator(project, project_dir, workers=workers).create_project()
+
+
+def check_thresholds(results: dict[str, Measurement], size: int) -> list[str]:
+    failures: list[str] = []
+    for name, measurement in results.items():
+        per_object = measurement.seconds * 1000 / size
+        if per_object > THRESHOLDS[name]:
+            failures.append(f'{name}: {per_object:.2f}ms per object, threshold {THRESHOLDS[name]}ms')
+    return failures
+
+
+def time_generation(size: int, workers: int = 1) -> float:
+    project = build_project(size)
+    start = time.perf_counter()
+    generate(project, workers)
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark project generation for synthetic projects.')
+    parser.add_argument('sizes', nargs='*', type=int, default=[10, 100, 1000])
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--suite', action='store_true', help='time every generation stage instead of the whole run')
+    parser.add_argument('--shape', choices=SHAPES, default='tree')
+    parser.add_argument('--density', type=int, default=3, help='many to many links per object of a mesh')
+    parser.add_argument('--skip-create', action='store_true', help="don't write and format the project")
+    parser.add_argument('--check', action='store_true', help='exit with an error when a stage exceeds its threshold')
+    args = parser.parse_args(argv)
+    failed = False
+    for size in args.sizes:
+        if not args.suite:
+            print(f'{size:>5} objects: {time_generation(size, args.workers):8.2f}s')
+            continue
+        results = run_suite(size, args.shape, args.density, not args.skip_create)
+        print(f'{size} objects, {args.shape}')
+        for name, (seconds, peak_kib) in results.items():
+            print(f'  {name:<24} {seconds:9.3f}s {peak_kib:12.0f} KiB')
+        failures = check_thresholds(results, size) if args.check else []
+        for failure in failures:
+            print(f'  REGRESSION {failure}')
+        failed = failed or bool(failures)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import argparse
+import subprocess
+import sys
+
+# cumulative import time of warp_fastapi.cli in microseconds, it only needs argparse and the standard library
+IMPORT_BUDGET_US = 50_000
+
+
+def parse_import_time(stderr: str, module: str) -> int | None:
+    # `-X importtime` lines are 'import time: <self us> | <cumulative us> | <indented module name>'
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and line.split('|')[2].strip() == module:
+            return int(line.split('|')[1])
+    return None
+
+
+def time_cli_import() -> int:
+    cmd = [sys.executable, '-X', 'importtime', '-c', 'import warp_fastapi.cli']
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    cumulative = parse_import_time(result.stderr, 'warp_fastapi.cli')
+    if cumulative is None:
+        raise ValueError('warp_fastapi.cli is missing from the import times!')
+    return cumulative
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the import time of the warp-fastapi CLI.')
+    parser.add_argument('--runs', type=int, default=5, help='the fastest run is reported')
+    parser.add_argument('--check', action='store_true', help='exit with an error when the import exceeds its budget')
+    args = parser.parse_args(argv)
+    fastest = min(time_cli_import() for _ in range(args.runs))
+    print(f'warp_fastapi.cli import: {fastest / 1000:.1f}ms, budget {IMPORT_BUDGET_US / 1000:.0f}ms')
+    if args.check and fastest > IMPORT_BUDGET_US:
+        print('REGRESSION warp_fastapi.cli import exceeds its budget')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import pytest
+
+from benchmarks.generation import SHAPES, Measurement, build_project, build_schema_sets, check_thresholds, run_suite
+from benchmarks.startup import parse_import_time
+from warp_fastapi.relationships import many_to_many, many_to_one, one_to_many
+
+
+def test_build_project_shapes():
+    tree = build_project(6, 'tree')
+    assert [len(obj.relationships) for obj in tree.app_objects] == [4, 1, 0, 0, 0, 0]
+    chain = build_project(4, 'chain')
+    assert [len(obj.relationships) for obj in chain.app_objects] == [1, 1, 1, 0]
+    assert chain.app_objects[0].relationships[0].relationship_type == one_to_many
+    mesh = build_project(5, 'mesh', density=2)
+    assert all(len(obj.relationships) == 2 for obj in mesh.app_objects)
+    assert all(rel.relationship_type == many_to_many for rel in mesh.app_objects[0].relationships)
+    self_ref = build_project(3, 'self')
+    for obj in self_ref.app_objects:
+        assert obj.relationships[0].relationship_type == many_to_one
+        assert obj.is_relationship_self(obj.relationships[0])
+
+
+def test_build_schema_sets():
+    read, create, edit = build_schema_sets(3)
+    assert [len(s) for s in (read, create, edit)] == [4, 4, 3]
+    assert list(read)[:3] == list(create)[:3]
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_run_suite(shape):
+    results = run_suite(10, shape, density=2, create_project=False)
+    assert set(results) == {
+        'ModelModuleCode',
+        'RepoModuleCode',
+        'RoutesModuleCode',
+        'SchemaModuleCode',
+        'ServiceModuleCode',
+        'ServiceModuleCode[mesh]',
+        'TestModuleCode',
+        'ConfTestModuleCode',
+        'render',
+        'find_base_att',
+    }
+    assert all(measurement.seconds > 0 and measurement.peak_kib > 0 for measurement in results.values())
+
+
+def test_check_thresholds():
+    results = {'render': Measurement(0.001, 10), 'find_base_att': Measurement(10, 10)}
+    assert check_thresholds(results, 10) == ['find_base_att: 1000.00ms per object, threshold 0.2ms']
+    assert check_thresholds({'find_base_att': Measurement(0.001, 10)}, 10) == []
+    # the thresholds are per object, so the same time passes for a larger project
+    assert check_thresholds({'render': Measurement(0.1, 10)}, 10) == ['render: 10.00ms per object, threshold 5ms']
+    assert check_thresholds({'render': Measurement(0.1, 10)}, 100) == []
+
+
+def test_parse_import_time():
+    stderr = (
+        'import time: self [us] | cumulative | imported package\n'
+        'import time:       120 |        120 |   argparse\n'
+        'import time:       310 |        850 | warp_fastapi.cli\n'
+    )
+    assert parse_import_time(stderr, 'warp_fastapi.cli') == 850
+    assert parse_import_time(stderr, 'warp_fastapi') is None
@@ -0,0 +1,100 @@
+from warp_fastapi import AppObject, Attribute, AuthObject
+from warp_fastapi.app_object import AppConfig, CacheConfig
+from warp_fastapi.code.code_objects.cache import (
+    CacheModuleCode,
+    get_related_namespaces,
+    graph_memo,
+    is_cached,
+    takes_over_rows,
+    uses_cache,
+)
+from warp_fastapi.code.code_objects.routes import RoutesModuleCode
+from warp_fastapi.code.code_objects.service import ServiceModuleCode
+from warp_fastapi.code.code_objects.tests import ConfTestModuleCode
+from warp_fastapi.config import StructureConfig
+
+from .conftest import code_to_list
+
+
+def test_cache_module():
+    lines = code_to_list(CacheModuleCode(StructureConfig()))
+    assert 'from .settings import settings' in lines
+    assert '    def get(self, kind: str, key: Any, adapter: TypeAdapter[Any]) -> Any:' in lines
+    assert '        from redis import Redis  # type: ignore' in lines
+    assert '        with self._lock:' in lines
+    lines = code_to_list(CacheModuleCode(StructureConfig(async_mode=True)))
+    assert '    async def invalidate(self, *ids: int) -> None:' in lines
+    assert '            names.append(await self._key("items", id))' in lines
+    assert '        from redis.asyncio import Redis  # type: ignore' in lines
+
+
+def test_cache_namespaces(atts: list[Attribute]):
+    planet = AppObject('planet', *atts, config=AppConfig(cache=CacheConfig()))
+    starship = AppObject('starship', *atts)
+    alien = AppObject('alien', *atts, config=AppConfig(cache=CacheConfig(ttl=5)))
+    user = AuthObject('user', *atts, config=AppConfig(cache=CacheConfig()))
+    planet.add_one_to_many_rel(starship, 'ships', 'planet')
+    starship.add_one_to_many_rel(alien, 'crew', 'starship')
+    alien.add_many_to_one_rel(user, 'owner', 'aliens')
+    assert is_cached(planet) and not is_cached(starship) and not is_cached(user)
+    # deleting a planet cascades to its starships and their crew, assigning a starship takes it from another planet
+    assert get_related_namespaces(planet) == ['alien', 'planet']
+    assert get_related_namespaces(starship) == ['alien', 'planet']
+    assert get_related_namespaces(alien) == []
+    assert takes_over_rows(planet) and takes_over_rows(starship) and not takes_over_rows(alien)
+    assert uses_cache(user)
+    assert not uses_cache(AppObject('other', *atts))
+
+
+def test_cache_namespaces_follow_the_graph(atts: list[Attribute]):
+    planet = AppObject('planet', *atts)
+    starship = AppObject('starship', *atts)
+    tag = AppObject('tag', *atts, config=AppConfig(cache=CacheConfig()))
+    planet.add_one_to_many_rel(starship, 'ships', 'planet')
+    # nothing connected to the planet is cached, the objects it reaches get the same answer
+    assert get_related_namespaces(planet) == []
+    assert id(starship) in graph_memo.namespaces
+    assert id(tag) not in graph_memo.namespaces
+    # adding a relationship drops the remembered namespaces, deleting a planet now deletes tagged starships
+    starship.add_many_to_many_rel(tag, 'tags', 'ships')
+    assert get_related_namespaces(planet) == ['tag']
+    assert get_related_namespaces(starship) == ['tag']
+
+
+def test_cached_service(atts: list[Attribute]):
+    planet = AppObject('planet', *atts, config=AppConfig(cache=CacheConfig(ttl=30)))
+    starship = AppObject('starship', *atts)
+    planet.add_one_to_many_rel(starship, 'ships', 'planet')
+    lines = code_to_list(ServiceModuleCode(planet, StructureConfig()))
+    assert 'from ..cache import CacheBackend, ResponseCache, get_cache' in lines
+    assert 'item_adapter = TypeAdapter(PlanetResponse)' in lines
+    assert "        cached = self.cache.get('items', id, item_adapter)" in lines
+    # sparse objects miss fields of the cached response, so they are returned without caching them
+    assert '        db_planet = self.repository.get_by_id(id, fields)' in lines
+    assert '        if fields is not None:' in lines
+    assert "        return self.cache.set('lists', key, db_page, page_adapter)" in lines
+    assert '        self.cache.invalidate(id)' in lines
+    assert '        self.cache.invalidate(*[item.id for item in items])' in lines
+    assert (
+        "    return PlanetService(PlanetRepository(db), starship_repository=StarshipRepository(db), "
+        "cache=ResponseCache(cache or get_cache(), 'planet', 30, ('planet', )))"
+    ) in lines
+    lines = code_to_list(ServiceModuleCode(starship, StructureConfig(async_mode=True)))
+    assert 'item_adapter = TypeAdapter(StarshipResponse)' not in lines
+    assert '        return await self.repository.get_by_id(id, fields)' in lines
+    assert '        await self.cache.invalidate(*ids)' in lines
+    assert "cache=ResponseCache(cache or get_cache(), 'starship', 0, ('planet', )))" in lines[-1]
+
+
+def test_cached_routes_and_conftest(atts: list[Attribute]):
+    planet = AppObject('planet', *atts, config=AppConfig(cache=CacheConfig()))
+    lines = code_to_list(RoutesModuleCode(planet))
+    assert 'from ..cache import CacheBackend, get_cache' in lines
+    assert (
+        '                db: Annotated[Session, Depends(get_db)], cache: Annotated[CacheBackend, Depends(get_cache)],'
+    ) in lines
+    assert '    service = get_planet_service(db, cache)' in lines
+    assert 'from ..cache import CacheBackend, get_cache' not in code_to_list(RoutesModuleCode(AppObject('a', *atts)))
+    lines = code_to_list(ConfTestModuleCode([planet], StructureConfig()))
+    assert 'from app.cache import MemoryCache, get_cache' in lines
+    assert '    app.dependency_overrides[get_cache] = lambda: cache' in lines
@@ -0,0 +1,43 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from warp_fastapi.cli import main
+
+
+def test_cli_import_is_lazy():
+    code = (
+        'import sys, warp_fastapi.cli; '
+        "print(sorted(m for m in sys.modules if m.split('.')[0] in ('warp_fastapi', 'pydantic', 'black')))"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "['warp_fastapi', 'warp_fastapi.cli']"
+
+
+def test_cli_commands(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    project_file = tmp_path / 'project.json'
+    objects = {'planet': {'attributes': {'name': 'string'}}}
+    project_file.write_text(json.dumps({'name': 'galactic_app', 'objects': objects}))
+    output = tmp_path / 'out'
+    assert main(['new', str(project_file), '-o', str(output), '--async']) == 0
+    model_file = output / 'galactic_app' / 'app' / 'models' / 'planet_model.py'
+    assert 'name: Mapped[str]' in model_file.read_text()
+    assert main(['diff', str(project_file), '-o', str(output), '--async']) == 0
+
+    objects['planet']['attributes']['distance'] = 'int'
+    project_file.write_text(json.dumps({'name': 'galactic_app', 'objects': objects}))
+    capsys.readouterr()
+    assert main(['diff', str(project_file), '-o', str(output), '--async']) == 1
+    diff = capsys.readouterr().out
+    assert '+++ b/app/models/planet_model.py' in diff
+    assert '+    distance: Mapped[int]' in diff
+    assert main(['update', str(project_file), '-o', str(output), '--async']) == 0
+    assert 'distance: Mapped[int]' in model_file.read_text()
+
+
+def test_cli_bench(capsys: pytest.CaptureFixture[str]):
+    assert main(['bench', '2', '--suite', '--skip-create']) == 0
+    assert '2 objects, tree' in capsys.readouterr().out
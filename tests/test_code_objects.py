@@ -1,6 +1,14 @@
+from io import StringIO
+
 import pytest
 
-from warp_fastapi.code.code_objects.base import SimpleClassCode, SimpleDecoratorCode, SimpleFunctionCode, SimpleVariable
+from warp_fastapi.code.code_objects.base import (
+    CodeWriter,
+    SimpleClassCode,
+    SimpleDecoratorCode,
+    SimpleFunctionCode,
+    SimpleVariable,
+)
 from warp_fastapi.code.utils import get_module_str, ident_text
 
 
@@ -106,3 +114,34 @@ def test_classes(functions: list[SimpleFunctionCode], variables: list[SimpleVari
     def get_a():
         return a"""
     )
+
+
+def test_code_writer(functions: list[SimpleFunctionCode], variables: list[SimpleVariable]):
+    stream = StringIO()
+    writer = CodeWriter(stream)
+    writer.line('if TYPE_CHECKING:')
+    with writer.indent():
+        writer.lines('import a\n\nimport b')
+    writer.line()
+    SimpleClassCode('MyClass', attributes=list(variables), methods=list(functions)).render(writer)
+    with writer.indent():
+        functions[0].render(writer)
+    assert (
+        stream.getvalue()
+        == """if TYPE_CHECKING:
+    import a
+    import b
+
+class MyClass:
+
+    num: int = 1
+    text: str = text
+
+    def get_num():
+        return 1
+    def get_a():
+        return a
+    def get_num():
+        return 1
+"""
+    )
@@ -1,8 +1,17 @@
+import os
+import tarfile
+import zipfile
 from pathlib import Path
+from typing import Literal
+from unittest.mock import patch
+
+import pytest
 
 from warp_fastapi import AppProject
+from warp_fastapi.code.formatting import format_code
 from warp_fastapi.config import StructureConfig
 from warp_fastapi.create_project import ProjectCreator
+from warp_fastapi.output import ArchiveSink, MemorySink, StagedDiskSink
 
 
 def file_contains(filepath: Path, text: str):
@@ -60,3 +69,154 @@ def test_project_creation_wird_config(app_proj: AppProject, tmp_path: Path):
     model_file = model_dir / 'obj1_model.py'
     assert model_dir.is_dir()
     assert file_contains(model_file, 'sqlalchemy')
+
+
+def test_async_project_creation(app_proj: AppProject, tmp_path: Path):
+    creator = ProjectCreator(app_proj, str(tmp_path), StructureConfig(async_mode=True))
+    creator.create_project()
+    proj_dir = tmp_path / creator.project.name
+    assert file_contains(proj_dir / 'requirements.txt', 'aiosqlite')
+    assert file_contains(proj_dir / '.env', 'sqlite+aiosqlite:///')
+    assert file_contains(proj_dir / 'app/database.py', 'create_async_engine')
+    assert file_contains(proj_dir / 'alembic/env.py', 'async_engine_from_config')
+    assert file_contains(proj_dir / 'tests/conftest.py', 'create_async_engine')
+
+
+def test_orjson_project_creation(app_proj: AppProject, tmp_path: Path):
+    creator = ProjectCreator(app_proj, str(tmp_path), StructureConfig(orjson_mode=True))
+    creator.create_project()
+    proj_dir = tmp_path / creator.project.name
+    assert file_contains(proj_dir / 'requirements.txt', 'orjson')
+    assert file_contains(proj_dir / 'app/main.py', 'default_response_class=ORJSONResponse')
+    assert file_contains(proj_dir / 'tests/bench_list.py', 'def test_list_obj1(')
+
+
+def test_production_project_creation(app_proj: AppProject, tmp_path: Path):
+    creator = ProjectCreator(app_proj, str(tmp_path), StructureConfig(async_mode=True), deployment='production')
+    creator.create_project()
+    proj_dir = tmp_path / creator.project.name
+    assert file_contains(proj_dir / 'requirements.txt', 'gunicorn')
+    assert file_contains(proj_dir / 'requirements.txt', 'asyncpg')
+    assert file_contains(proj_dir / 'dockerfile', 'HEALTHCHECK')
+    assert not file_contains(proj_dir / 'dockerfile', '--reload')
+    assert file_contains(proj_dir / 'gunicorn.conf.py', 'uvicorn.workers.UvicornWorker')
+    assert not file_contains(proj_dir / 'compose.yml', './app:/app/app')
+    assert file_contains(proj_dir / 'startup.sh', 'gunicorn')
+    assert file_contains(proj_dir / 'app/main.py', '/health')
+
+
+def test_production_project_requirements(app_proj: AppProject, tmp_path: Path):
+    requirements = ['fastapi[all]', 'orjson']
+    config = StructureConfig(async_mode=True, orjson_mode=True, app_foldername='service')
+    creator = ProjectCreator(app_proj, str(tmp_path), config, requirements=requirements, deployment='production')
+    creator.create_project()
+    creator.update_project()
+    proj_dir = tmp_path / creator.project.name
+    # the given list is left alone and the second run writes the same requirements
+    assert requirements == ['fastapi[all]', 'orjson'] and creator.requirements is requirements
+    lines = (proj_dir / 'requirements.txt').read_text().splitlines()
+    assert lines == ['fastapi[all]', 'orjson', 'aiosqlite', 'asyncpg', 'gunicorn', 'uvicorn[standard]']
+    assert file_contains(proj_dir / 'startup.sh', 'gunicorn service.main:app -c gunicorn.conf.py')
+
+
+def test_update_project_writes_changed_files(app_proj: AppProject, tmp_path: Path):
+    creator = ProjectCreator(app_proj, str(tmp_path))
+    creator.create_project()
+    proj_dir = tmp_path / creator.project.name
+    assert (proj_dir / '.warp_manifest.json').is_file()
+    service_f = proj_dir / 'app/services/obj1_service.py'
+    model_f = proj_dir / 'app/models/obj1_model.py'
+    model_mtime = model_f.stat().st_mtime_ns
+    formatted_service = service_f.read_text()
+    service_f.write_text('SOME TEST FOR TESTING')
+    creator.update_project()
+    assert service_f.read_text() == formatted_service
+    assert model_f.stat().st_mtime_ns == model_mtime
+
+
+def test_parallel_project_creation(app_proj: AppProject, tmp_path: Path):
+    ProjectCreator(app_proj, str(tmp_path / 'serial')).create_project()
+    creator = ProjectCreator(app_proj, str(tmp_path / 'parallel'), workers=2)
+    creator.create_project()
+    serial_dir = tmp_path / 'serial' / creator.project.name
+    parallel_dir = tmp_path / 'parallel' / creator.project.name
+    serial_files = sorted(path.relative_to(serial_dir) for path in serial_dir.rglob('*') if path.is_file())
+    parallel_files = sorted(path.relative_to(parallel_dir) for path in parallel_dir.rglob('*') if path.is_file())
+    assert serial_files == parallel_files
+    for file in serial_files:
+        assert (serial_dir / file).read_bytes() == (parallel_dir / file).read_bytes()
+    service_f = parallel_dir / 'app/services/obj1_service.py'
+    formatted_service = service_f.read_text()
+    service_f.write_text('SOME TEST FOR TESTING')
+    creator.update_project()
+    assert service_f.read_text() == formatted_service
+
+
+def test_memory_sink_project_creation(app_proj: AppProject, tmp_path: Path):
+    ProjectCreator(app_proj, str(tmp_path)).create_project()
+    sink = MemorySink()
+    creator = ProjectCreator(app_proj, str(tmp_path / 'unused'), sink=sink)
+    creator.create_project()
+    assert not (tmp_path / 'unused').exists()
+    proj_dir = tmp_path / creator.project.name
+    disk_files = {path.relative_to(proj_dir).as_posix() for path in proj_dir.rglob('*') if path.is_file()}
+    assert set(sink.files) == disk_files
+    assert all(sink.files[name] == (proj_dir / name).read_text() for name in disk_files)
+    assert sink.is_dir('app/models')
+    with pytest.raises(FileExistsError):
+        creator.create_project()
+
+    sink.files['app/services/obj1_service.py'] = 'SOME TEST FOR TESTING'
+    formatted_model = sink.files['app/models/obj1_model.py']
+    with patch('warp_fastapi.create_project.format_code', wraps=format_code) as format_mock:
+        creator.update_project()
+    assert format_mock.call_count == 1
+    assert 'update_obj1' in sink.files['app/services/obj1_service.py']
+    assert sink.files['app/models/obj1_model.py'] is formatted_model
+
+
+@pytest.mark.parametrize('format', ['zip', 'tar'])
+def test_archive_sink_project_creation(app_proj: AppProject, tmp_path: Path, format: Literal['zip', 'tar']):
+    memory_sink = MemorySink()
+    ProjectCreator(app_proj, sink=memory_sink).create_project()
+    archive_file = tmp_path / f'project.{format}'
+    with ArchiveSink(archive_file, format, root=app_proj.name) as sink:
+        ProjectCreator(app_proj, sink=sink, workers=2).create_project()
+    if format == 'zip':
+        with zipfile.ZipFile(archive_file) as archive:
+            files = {name: archive.read(name).decode() for name in archive.namelist()}
+    else:
+        with tarfile.open(archive_file) as archive:
+            extract = archive.extractfile
+            files = {info.name: extract(info).read().decode() for info in archive}  # type: ignore [union-attr]
+    assert files == {f'{app_proj.name}/{name}': text for name, text in memory_sink.files.items()}
+
+
+def test_staged_project_creation(app_proj: AppProject, tmp_path: Path):
+    ProjectCreator(app_proj, str(tmp_path / 'direct')).create_project()
+    staged_dir = tmp_path / 'staged' / app_proj.name
+    creator = ProjectCreator(app_proj, sink=StagedDiskSink(staged_dir, fsync=False))
+    with patch('warp_fastapi.output.os.fsync') as fsync_mock:
+        creator.create_project()
+    assert fsync_mock.call_count == 0
+    assert [path.name for path in (tmp_path / 'staged').iterdir()] == [app_proj.name]
+    direct_dir = tmp_path / 'direct' / app_proj.name
+    direct_files = sorted(path.relative_to(direct_dir) for path in direct_dir.rglob('*') if path.is_file())
+    staged_files = sorted(path.relative_to(staged_dir) for path in staged_dir.rglob('*') if path.is_file())
+    assert direct_files == staged_files
+    assert all((direct_dir / file).read_bytes() == (staged_dir / file).read_bytes() for file in direct_files)
+    assert (staged_dir / 'alembic/versions').is_dir()
+
+    service_f = staged_dir / 'app/services/obj1_service.py'
+    formatted_service = service_f.read_text()
+    service_f.write_text('SOME TEST FOR TESTING')
+    creator.sink = StagedDiskSink(staged_dir)
+    with patch('warp_fastapi.create_project.get_alembic_ini_code', side_effect=RuntimeError('interrupted')):
+        with pytest.raises(RuntimeError):
+            creator.update_project()
+    assert service_f.read_text() == 'SOME TEST FOR TESTING'
+    assert [path.name for path in (tmp_path / 'staged').iterdir()] == [app_proj.name]
+    with patch('warp_fastapi.output.os.fsync', wraps=os.fsync) as fsync_mock:
+        creator.update_project()
+    assert fsync_mock.call_count > 0
+    assert service_f.read_text() == formatted_service
@@ -9,14 +9,66 @@ def test_db_module():
     config = StructureConfig()
     config.settings_file = 'test_settings'
     m = DatabaseModuleCode(config)
-    r = """from sqlalchemy import create_engine
+    r = """from typing import Any
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, mapped_column, Mapped
+from sqlalchemy.pool import QueuePool, StaticPool
 from .test_settings import settings
 
 SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_engine_options(database_url: str) -> dict[str, Any]:
+    url = make_url(database_url)
+    connect_args: dict[str, Any] = {}
+    options: dict[str, Any] = {"connect_args": connect_args}
+    if url.get_backend_name() == "sqlite":
+        # sqlite connections are shared between request threads, in-memory databases need a single connection
+        connect_args["check_same_thread"] = False
+        if url.database in (None, "", ":memory:"):
+            options["poolclass"] = StaticPool
+        return options
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    return options
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **get_engine_options(SQLALCHEMY_DATABASE_URL))
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+pool_events = {"checkouts": 0, "invalidations": 0}
+
+
+@event.listens_for(engine, "checkout")
+def count_checkout(*args: Any) -> None:
+    pool_events["checkouts"] += 1
+
+
+@event.listens_for(engine, "invalidate")
+def count_invalidation(*args: Any) -> None:
+    pool_events["invalidations"] += 1
+
+
+def get_pool_metrics() -> dict[str, int]:
+    metrics = dict(pool_events)
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        # overflow is negative while the pool has not opened all of its connections yet
+        metrics.update(
+            pool_size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    return metrics
+
 
 class Base(DeclarativeBase):
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -31,3 +83,73 @@ def test_base_db_module(app_objs: list[AppObject]):
 from .models.obj1_model import Obj1 # noqa
 from .models.obj2_model import Obj2 # noqa"""
     assert_code_lines(m, r)
+
+
+def test_async_db_module():
+    config = StructureConfig(async_mode=True)
+    m = DatabaseModuleCode(config)
+    r = """from typing import Any
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, mapped_column, Mapped
+from sqlalchemy.pool import QueuePool, StaticPool
+from .settings import settings
+
+SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URL
+
+
+def get_engine_options(database_url: str) -> dict[str, Any]:
+    url = make_url(database_url)
+    connect_args: dict[str, Any] = {}
+    options: dict[str, Any] = {"connect_args": connect_args}
+    if url.get_backend_name() == "sqlite":
+        # in-memory databases need a single connection
+        if url.database in (None, "", ":memory:"):
+            options["poolclass"] = StaticPool
+        return options
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    return options
+
+
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, **get_engine_options(SQLALCHEMY_DATABASE_URL))
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+pool_events = {"checkouts": 0, "invalidations": 0}
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def count_checkout(*args: Any) -> None:
+    pool_events["checkouts"] += 1
+
+
+@event.listens_for(engine.sync_engine, "invalidate")
+def count_invalidation(*args: Any) -> None:
+    pool_events["invalidations"] += 1
+
+
+def get_pool_metrics() -> dict[str, int]:
+    metrics = dict(pool_events)
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        # overflow is negative while the pool has not opened all of its connections yet
+        metrics.update(
+            pool_size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    return metrics
+
+
+class Base(DeclarativeBase):
+    id: Mapped[int] = mapped_column(primary_key=True)
+"""
+    assert_code_lines(m, r)
@@ -18,3 +18,16 @@ def get_db():
         db.close()
 """
     assert_code_lines(m, r)
+
+
+def test_async_dep_module():
+    config = StructureConfig(async_mode=True)
+    m = DependanciesModuleCode(config)
+    r = """
+from typing import Any
+from .database import SessionLocal
+async def get_db():
+    async with SessionLocal() as db:
+        yield db
+"""
+    assert_code_lines(m, r)
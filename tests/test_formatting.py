@@ -0,0 +1,61 @@
+from warp_fastapi.code.formatting import format_code, remove_unused_imports
+
+
+def test_remove_unused_imports():
+    code = """from typing import TYPE_CHECKING, Any, Optional
+from sqlalchemy import Column, ForeignKey
+import os.path
+from .database import Base # noqa
+from .models import *
+if TYPE_CHECKING:
+    from .planet import Planet
+    from .alien import Alien
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+planet: 'Planet' = Column(ForeignKey('planet.id'))
+value: Optional[int] = None
+"""
+    r = """from typing import TYPE_CHECKING, Optional
+from sqlalchemy import Column, ForeignKey
+from .database import Base # noqa
+from .models import *
+if TYPE_CHECKING:
+    from .planet import Planet
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+planet: 'Planet' = Column(ForeignKey('planet.id'))
+value: Optional[int] = None
+"""
+    assert remove_unused_imports(code) == r
+
+
+def test_remove_unused_imports_from_blocks():
+    code = """from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .planet import Planet
+x = 1
+"""
+    r = """from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    pass
+x = 1
+"""
+    assert remove_unused_imports(code) == r
+
+
+def test_format_code():
+    code = """from fastapi import APIRouter,HTTPException
+router=APIRouter( prefix='/planets')
+"""
+    r = """from fastapi import APIRouter
+
+router = APIRouter(prefix="/planets")
+"""
+    assert format_code(code) == r
+    assert format_code('') == ''
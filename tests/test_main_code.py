@@ -2,7 +2,7 @@ from warp_fastapi import AppProject
 from warp_fastapi.code.code_objects.main import MainModuleCode
 from warp_fastapi.config import StructureConfig
 
-from .conftest import assert_code_lines
+from .conftest import assert_code_lines, code_to_list
 
 
 def test_main_module(app_proj: AppProject):
@@ -12,6 +12,7 @@ def test_main_module(app_proj: AppProject):
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 from .routes.main_routes import router
+from .database import get_pool_metrics
 from .settings import settings
 
 app = FastAPI(title=settings.PROJECT_NAME)
@@ -26,5 +27,21 @@ if settings.BACKEND_CORS_ORIGINS:
     )
 
 app.include_router(router, prefix=settings.API_V1_STRING)
+
+
+@app.get("/health", tags=["metrics"])
+def health() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@app.get("/metrics/db-pool", tags=["metrics"])
+def db_pool_metrics() -> dict[str, int]:
+    return get_pool_metrics()
 """
     assert_code_lines(m, r)
+
+
+def test_orjson_main_module(app_proj: AppProject):
+    lines = code_to_list(MainModuleCode(app_proj, StructureConfig(orjson_mode=True)))
+    assert 'from fastapi.responses import ORJSONResponse' in lines
+    assert 'app = FastAPI(title=settings.PROJECT_NAME, default_response_class=ORJSONResponse)' in lines
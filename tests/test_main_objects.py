@@ -1,3 +1,4 @@
+import pickle
 from datetime import date
 
 import pytest
@@ -108,6 +109,53 @@ def test_app_object(app_objs: list[AppObject], atts: list[Attribute]):
     assert 'Name most follow snake_case rule' in str(e_2.value)
 
 
+def test_relationship_index(atts: list[Attribute]):
+    obj = AppObject('some_name', *atts)
+    rel_obj = AppObject('rel_obj', *atts)
+    obj.add_many_to_many_rel(rel_obj, 'rel_objs', 'some_names')
+    rel = obj.relationships[0]
+    assert obj.is_rel_backref(rel) is False
+    assert rel_obj.is_rel_backref(rel) is True
+    # relationships are indexed by identity, an equal copy is a different relationship
+    with pytest.raises(AttributeError):
+        obj.is_rel_backref(rel.model_copy())
+    rel_copy = create_relationship('other', rel_obj, one_to_many)
+    obj.relationships.append(rel_copy)
+    assert obj.is_relationship_many(rel_copy) is True
+    obj.relationships = [rel_copy]
+    with pytest.raises(AttributeError):
+        obj.is_relationship_many(rel)
+    loaded = pickle.loads(pickle.dumps(rel_obj))
+    assert loaded.is_rel_backref(loaded.back_populates_relationships[0]) is True
+
+
+def test_graph_equality_and_dump(atts: list[Attribute]):
+    def build() -> AppProject:
+        objs = [AppObject(f'obj{i}', *atts) for i in range(3)]
+        for i, obj in enumerate(objs):
+            obj.add_many_to_many_rel(objs[i - 1], 'prev', 'next')
+        objs[0].add_many_to_one_rel(objs[0], 'parent', 'children')
+        return AppProject('cyclic', *objs)
+
+    project = build()
+    other = build()
+    obj = project.app_objects[0]
+    assert obj == other.app_objects[0]
+    assert obj != project.app_objects[1]
+    assert obj != AuthObject('obj0', *atts)
+    assert {obj, other.app_objects[0]} == {obj}
+    assert obj.relationships[0] == other.app_objects[0].relationships[0]
+    assert obj.relationships[0] != obj.relationships[1]
+    assert hash(obj.relationships[1]) == hash(other.app_objects[0].relationships[1])
+    assert project == other
+    dump = project.model_dump()
+    obj_dump = dump['app_objects'][0]
+    assert obj_dump['relationships'][0]['related_object'] == 'obj2'
+    assert obj_dump['relationships'][0]['back_populates_object'] == 'obj0'
+    assert obj_dump['back_populates_relationships'] == ['obj1.prev', 'obj0.parent']
+    assert "related_object='obj2'" in str(obj)
+
+
 def test_app_config(atts: list[Attribute]):
     config = AppConfig(class_name='custom_class', plural='custom_plural')
     obj = AppObject('some_name', *atts, config=config)
@@ -124,6 +172,18 @@ def test_app_config(atts: list[Attribute]):
     assert obj.table_name == 'custom_table'
 
 
+def test_names_follow_config_changes(atts: list[Attribute]):
+    obj = AppObject('big_city', *atts, config=AppConfig())
+    assert obj.names == ('big_city', 'BigCity', 'big_cities', 'big-cities', 'BigCities')
+    assert obj.names is AppObject('big_city', *atts).names
+    obj.config.plural = 'towns'
+    assert obj.table_name == 'towns'
+    assert obj.route_name == 'towns'
+    assert obj.plural_class_name == 'Towns'
+    obj.name = 'small_city'
+    assert obj.class_name == 'SmallCity'
+
+
 def test_plural_generation(atts: list[Attribute]):
     obj1 = AppObject('nice_city', *atts)
     assert obj1.route_name == 'nice-cities'
@@ -1,4 +1,7 @@
+import pytest
+
 from warp_fastapi import AppObject, Attribute
+from warp_fastapi.app_object import AppConfig
 from warp_fastapi.code.code_objects.model import (
     AssociationTableCode,
     AttributeCode,
@@ -9,9 +12,10 @@ from warp_fastapi.code.code_objects.model import (
     RelationshipCode,
 )
 from warp_fastapi.config import StructureConfig
+from warp_fastapi.data_types import string_type
 from warp_fastapi.relationships import BackpopulatesRelationship, many_to_many, many_to_one, one_to_many, one_to_one
 
-from .conftest import assert_code_lines
+from .conftest import assert_code_lines, code_to_list
 
 
 def test_attribute_code(complex_att: Attribute, atts: list[Attribute], complex_int_att: Attribute):
@@ -82,7 +86,7 @@ def test_foreign_key(atts: list[Attribute]):
     obj1.add_relationship(obj2, one_to_many, 'rel')
     obj1_rel = obj1.relationships[1]
     fk = ForeignKeyCode(obj1_rel, obj1)
-    assert str(fk) == "rel_id: Mapped[int] = mapped_column(ForeignKey('object2s.id'))"
+    assert str(fk) == "rel_id: Mapped[int] = mapped_column(ForeignKey('object2s.id'), index=True)"
 
 
 def test_association_table(atts: list[Attribute]):
@@ -95,8 +99,8 @@ def test_association_table(atts: list[Attribute]):
     assert str(c) == (
         "object2_object1_association = Table"
         "('object2_object1',Base.metadata,Column('object2_id', Integer, "
-        "ForeignKey('object2s.id')),Column('object1_id', Integer, "
-        "ForeignKey('object1s.id')))"
+        "ForeignKey('object2s.id'), index=True),Column('object1_id', Integer, "
+        "ForeignKey('object1s.id'), index=True))"
     )
     r = RelationshipCode(rel, obj1)
     assert str(r) == (
@@ -126,7 +130,7 @@ def test_model_class(app_objs_with_rel: tuple[AppObject, AppObject]):
     date: Mapped[date] = mapped_column(Date)
     time: Mapped[time] = mapped_column(Time)
     rel1: Mapped[list[Object2]] = relationship(back_populates='back_rel1', cascade='all, delete-orphan')
-    rel2_id: Mapped[int] = mapped_column(ForeignKey('object3s.id'))
+    rel2_id: Mapped[int] = mapped_column(ForeignKey('object3s.id'), index=True)
     rel2: Mapped[Object3] = relationship(back_populates='back_rel2')
     rel3: Mapped[list[Object4]] = relationship(secondary=object4_object1_association,"""
         """ back_populates='back_rel3', cascade='all, delete')
@@ -148,8 +152,8 @@ def test_model_module(app_objs_with_rel: tuple[AppObject, AppObject]):
     m1 = ModelModuleCode(obj1, config)
     assoc_table_line = (
         "object4_object1_association = Table('object4_object1',Base.metadata,Column"
-        "('object4_id', Integer, ForeignKey('object4s.id')),Column('object1_id', "
-        "Integer, ForeignKey('object1s.id')))"
+        "('object4_id', Integer, ForeignKey('object4s.id'), index=True),Column('object1_id', "
+        "Integer, ForeignKey('object1s.id'), index=True))"
     )
     r1 = (
         f"""
@@ -173,7 +177,7 @@ class Object1(Base):
     date: Mapped[date] = mapped_column(Date)
     time: Mapped[time] = mapped_column(Time)
     rel1: Mapped[list[Object2]] = relationship(back_populates='back_rel1', cascade='all, delete-orphan')
-    rel2_id: Mapped[int] = mapped_column(ForeignKey('object3s.id'))
+    rel2_id: Mapped[int] = mapped_column(ForeignKey('object3s.id'), index=True)
     rel2: Mapped[Object3] = relationship(back_populates='back_rel2')
     rel3: Mapped[list[Object4]] = relationship(secondary=object4_object1_association,"""
         f""" back_populates='back_rel3', cascade='all, delete')
@@ -209,3 +213,69 @@ class Object4(Base):
         return [back_rel3.id for back_rel3 in self.back_rel3]
 """
     assert_code_lines(m2, r2)
+
+
+def test_async_model_class(app_objs_with_rel: tuple[AppObject, AppObject]):
+    c = ModelClassCode(app_objs_with_rel[0], StructureConfig(async_mode=True))
+    lines = code_to_list(c)
+    assert "    rel2: Mapped[Object3] = relationship(back_populates='back_rel2', lazy='raise')" in lines
+    assert (
+        "    rel1: Mapped[list[Object2]] = relationship(back_populates='back_rel1', "
+        "cascade='all, delete-orphan', lazy='raise')"
+    ) in lines
+
+
+def test_model_load_strategies(atts: list[Attribute]):
+    obj1 = AppObject('object1', *atts, config=AppConfig(lazy='raise'))
+    obj2 = AppObject('object2', *atts)
+    obj1.add_one_to_many_rel(obj2, 'rel1', 'back_rel1', lazy='ids')
+    obj1.add_many_to_one_rel(obj2, 'rel2', 'back_rel2')
+    lines = code_to_list(ModelClassCode(obj1))
+    assert (
+        "    rel1: Mapped[list[Object2]] = relationship(back_populates='back_rel1', "
+        "cascade='all, delete-orphan', foreign_keys=[rel1_id])"
+    ) in lines
+    assert (
+        "    rel2: Mapped[Object2] = relationship(back_populates='back_rel2', foreign_keys=[rel2_id], lazy='raise')"
+        in lines
+    )
+    assert "        ids = self.__dict__.get('_rel1_ids')" in lines
+    lines = code_to_list(ModelClassCode(obj2, StructureConfig(async_mode=True)))
+    assert "        ids = self.__dict__.get('_back_rel1_ids')" not in lines
+    assert any("lazy='raise'" in line and 'back_rel2' in line for line in lines)
+
+
+def test_model_indexes(atts: list[Attribute]):
+    name_att = Attribute('name', string_type, indexed=True)
+    tags_att = Attribute('tags', string_type, index_type='gin')
+    obj1 = AppObject('object1', name_att, tags_att, atts[1])
+    obj2 = AppObject('object2', *atts)
+    obj1.add_many_to_one_rel(obj2, 'rel', 'back_rel')
+    obj1.add_index('rel_id', 'name', unique=True)
+    assert str(AttributeCode(name_att)) == 'name: Mapped[str] = mapped_column(String, index=True)'
+    assert str(AttributeCode(tags_att)) == 'tags: Mapped[str] = mapped_column(String)'
+    lines = code_to_list(ModelModuleCode(obj1))
+    assert 'from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table' in lines
+    assert (
+        "    __table_args__ = (Index('ix_object1s_tags', 'tags', postgresql_using='gin'), "
+        "Index('ix_object1s_rel_id_name', 'rel_id', 'name', unique=True), )"
+    ) in lines
+    assert "    rel_id: Mapped[int] = mapped_column(ForeignKey('object2s.id'), index=True)" in lines
+    assert not any('Index' in line for line in code_to_list(ModelModuleCode(obj2)))
+    with pytest.raises(AttributeError) as e:
+        obj1.add_index('name', 'missing')
+    assert str(e.value) == 'Column missing not found in object object1!'
+    with pytest.raises(ValueError) as value_error:
+        obj1.add_index('name', 'tags', unique=True, index_type='gin')
+    assert str(value_error.value) == 'Unique indexes must use the btree index method, not gin!'
+
+
+def test_model_unique_index_type(atts: list[Attribute]):
+    code_att = Attribute('code', string_type, unique=True, index_type='btree')
+    obj = AppObject('object1', code_att, *atts)
+    assert str(AttributeCode(code_att)) == 'code: Mapped[str] = mapped_column(String)'
+    lines = code_to_list(ModelModuleCode(obj))
+    assert "    __table_args__ = (Index('ix_object1s_code', 'code', unique=True, postgresql_using='btree'), )" in lines
+    with pytest.raises(ValueError) as e:
+        Attribute('tags', string_type, unique=True, index_type='gin')
+    assert str(e.value) == 'Unique indexes must use the btree index method, not gin!'
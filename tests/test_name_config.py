@@ -24,6 +24,10 @@ def test_main_config(app_obj: AppObject):
     assert config.get_settings_folder() == '.'
     assert config.get_settings_path() == str(Path('settings'))
     assert config.get_module_for_settings('x') == '.x'
+    assert config.get_cache_filename() == 'cache'
+    assert config.get_cache_folder() == '.'
+    assert config.get_cache_path() == str(Path('cache'))
+    assert config.get_module_for_cache('settings') == '.settings'
     assert config.get_model_filename(app_obj) == 'app_model'
     assert config.get_model_folder(app_obj) == 'models'
     assert config.get_model_path(app_obj) == str(Path('models/app_model'))
@@ -46,6 +50,7 @@ def test_main_config(app_obj: AppObject):
     assert config.get_read_cls_schema(app_obj) == 'AppResponse'
     assert config.get_read_full_cls_schema(app_obj) == 'AppInfo'
     assert config.get_edit_cls_schema(app_obj) == 'AppEdit'
+    assert config.get_bulk_edit_cls_schema(app_obj) == 'AppBulkEdit'
     assert config.get_db_cls_schema(app_obj) == 'AppDatabase'
     assert config.get_common_schema_filename() == 'common_schema'
     assert config.get_common_schema_folder() == 'schemas'
@@ -100,6 +105,29 @@ def test_wird_config(app_obj: AppObject):
     assert config.get_module_for_schema(app_obj, 'm') == '...m'
     assert config.get_base_cls_schema(app_obj) == 'appSomethingElse'
 
+    config.schema_file = 'schemas/{name}'
+    assert config.get_module_for_schema(app_obj, 'm') == '..m'
+
     with pytest.raises(AttributeError) as e:
         StructureConfig(wrong_key='something')  # type: ignore [call-arg]
     assert "'StructureConfig' object has no attribute 'wrong_key'" in str(e)
+
+
+def test_module_lookups_are_memoized(app_obj: AppObject):
+    config = StructureConfig()
+
+    def lookups() -> list[str]:
+        return [
+            config.get_module_for_model(app_obj, 'base'),
+            config.get_module_for_route(app_obj, 'base'),
+            config.get_module_for_schema(app_obj, 'base'),
+            config.get_module_for_repository(app_obj, 'base'),
+            config.get_module_for_service(app_obj, 'base'),
+            config.get_module_for_tests('base'),
+            config.get_module_for_alembic('base'),
+        ]
+
+    modules = lookups()
+    # the tests and alembic modules resolve the same dependency from the project root
+    assert len(config._module_cache) == 6
+    assert lookups() == modules
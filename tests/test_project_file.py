@@ -0,0 +1,123 @@
+import json
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from warp_fastapi import AppObject, AppProject, AuthObject, project_file as pf
+from warp_fastapi.app_object import AppConfig, CacheConfig
+from warp_fastapi.attributes import IntAttribute, StringAttribute, UsernameAttribute
+from warp_fastapi.config import StructureConfig
+from warp_fastapi.create_project import get_object_modules
+from warp_fastapi.project_file import CACHE_FOLDER, load_project
+
+PROJECT_YAML = """
+name: galactic_app
+auth_object: user
+objects:
+  planet:
+    attributes:
+      planet_name: string
+      distance: {type: int, optional: true, indexed: true}
+    relationships:
+      - {name: inhabited_by, type: one_to_many, object: starship, back_populates: planet}
+    config: {cache: {ttl: 30}}
+  starship:
+    attributes:
+      ship_name: string
+    relationships:
+      - {name: crew, type: many_to_many, object: user, back_populates: ships, lazy: selectin}
+      - {name: escort, type: many_to_one, object: starship, back_populates: escorted, optional: true}
+    indexes:
+      - {columns: [planet_id, ship_name], unique: true}
+    secure: true
+  user:
+    attributes:
+      username: {type: string, unique: true}
+      password: string
+"""
+
+
+def build_galactic_app() -> AppProject:
+    planet = AppObject(
+        'planet',
+        StringAttribute('planet_name'),
+        IntAttribute('distance', optional=True, indexed=True),
+        config=AppConfig(cache=CacheConfig(ttl=30)),
+    )
+    starship = AppObject('starship', StringAttribute('ship_name'), secure=True)
+    user = AuthObject('user', UsernameAttribute(), StringAttribute('password'))
+    planet.add_one_to_many_rel(starship, 'inhabited_by', 'planet')
+    starship.add_many_to_many_rel(user, 'crew', 'ships', lazy='selectin')
+    starship.add_many_to_one_rel(starship, 'escort', 'escorted', optional=True)
+    starship.add_index('planet_id', 'ship_name', unique=True)
+    return AppProject('galactic_app', planet, starship, auth_object=user)
+
+
+@pytest.fixture
+def project_path(tmp_path: Path) -> Path:
+    path = tmp_path / 'project.yaml'
+    path.write_text(PROJECT_YAML)
+    return path
+
+
+def test_load_project(project_path: Path):
+    project = load_project(project_path, use_cache=False)
+    expected = build_galactic_app()
+    assert project.model_dump() == expected.model_dump()
+    assert isinstance(project.auth_object, AuthObject)
+    assert [obj.name for obj in project.app_objects] == ['planet', 'starship', 'user']
+    assert not (project_path.parent / CACHE_FOLDER).exists()
+
+
+def test_load_json_project(tmp_path: Path):
+    path = tmp_path / 'project.json'
+    path.write_text(json.dumps({'name': 'app', 'objects': {'planet': {'attributes': {'name': 'string'}}}}))
+    project = load_project(path)
+    assert project.app_objects[0].attributes[0].type.python_type == 'str'
+
+
+def test_cached_project(project_path: Path, monkeypatch: pytest.MonkeyPatch):
+    project = load_project(project_path)
+    cache_files = list((project_path.parent / CACHE_FOLDER).iterdir())
+    assert len(cache_files) == 1
+
+    def fail(*args: object) -> None:
+        raise AssertionError('cached project was parsed again')
+
+    monkeypatch.setattr(pf, 'parse_project_file', fail)
+    cached = load_project(project_path)
+    monkeypatch.undo()
+    assert cached.model_dump() == project.model_dump()
+    starship = cached.app_objects[1]
+    assert starship.is_rel_backref(starship.back_populates_relationships[0])
+    assert starship.is_relationship_self(starship.relationships[1])
+    config = StructureConfig()
+    for obj, cached_obj in zip(project.app_objects, cached.app_objects):
+        modules = zip(get_object_modules(obj, config), get_object_modules(cached_obj, config))
+        assert all(str(module) == str(cached_module) for module, cached_module in modules)
+
+    project_path.write_text(PROJECT_YAML.replace('ship_name', 'name'))
+    assert load_project(project_path).app_objects[1].attributes[0].name == 'name'
+    new_cache_files = list((project_path.parent / CACHE_FOLDER).iterdir())
+    assert len(new_cache_files) == 1
+    assert new_cache_files != cache_files
+
+    new_cache_files[0].write_bytes(b'damaged')
+    assert load_project(project_path).app_objects[1].attributes[0].name == 'name'
+
+
+def test_project_file_errors(tmp_path: Path):
+    path = tmp_path / 'project.json'
+    path.write_text(json.dumps({'name': 'app', 'objects': {'planet': {'attributes': {'name': 'strin'}}}}))
+    with pytest.raises(ValidationError):
+        load_project(path)
+    objects = {'planet': {'relationships': [{'name': 'moons', 'type': 'one_to_many', 'object': 'moon'}]}}
+    path.write_text(json.dumps({'name': 'app', 'objects': objects}))
+    with pytest.raises(ValueError) as e:
+        load_project(path)
+    assert 'Object moon of relationship planet.moons not found in project file!' in str(e.value)
+    path.write_text(json.dumps({'name': 'app', 'objects': {}, 'auth_object': 'user'}))
+    with pytest.raises(ValueError) as e:
+        load_project(path)
+    assert 'Auth object user not found in project file!' in str(e.value)
@@ -1,8 +1,9 @@
 from warp_fastapi import AppObject
+from warp_fastapi.app_object import AppConfig
 from warp_fastapi.code.code_objects.repository import RepoBaseModule, RepoModuleCode
 from warp_fastapi.config import StructureConfig
 
-from .conftest import assert_code_lines
+from .conftest import assert_code_lines, code_to_list
 
 
 def test_base_repo_module():
@@ -10,27 +11,40 @@ def test_base_repo_module():
     m = RepoBaseModule(config)
     r = """
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import CursorResult, Select, Table, bindparam, delete, func, insert, inspect, select, text, update
+from sqlalchemy.orm import MANYTOONE, Mapper, aliased, lazyload, load_only, selectinload
 from ..database import Base
-from typing import Type, Dict, Any, Optional, TypeVar
+from ..settings import settings
+from typing import Type, Dict, Any, Container, Optional, Sequence, TypeVar, cast
 from fastapi import HTTPException
 
 class Repository:
-    def __init__(self, db: Session, model_type: type[Base]):
+    def __init__(
+        self,
+        db: Session,
+        model_type: type[Base],
+        load_options: Sequence[Any] = (),
+        id_relationships: Sequence[str] = (),
+    ):
         self.db = db
         self.model_type = model_type
+        self.load_options = list(load_options)
+        self.id_relationships = list(id_relationships)
+        # RETURNING rows cannot be joined, so joined relationships are loaded with a second select instead
+        joined = [rel.key for rel in inspect(model_type).relationships if rel.lazy == 'joined']
+        self.returning_options = self.load_options + [selectinload(getattr(model_type, name)) for name in joined]
 
-    def get_by_id(self, id: int):
-        db_obj = self.db.get(self.model_type, id)
-        if not db_obj:
-            raise HTTPException(status_code=404, detail=f"{self.model_type.__name__} with ID {id} not found!")
+    def get_by_id(self, id: int, fields: Sequence[str] | None = None):
+        db_obj = self._get(id, self._read_options(fields))
+        self._load_ids([db_obj], fields)
         return db_obj
 
     def get_all(self, skip: int, limit: int):
-        return self.db.scalars(select(self.model_type).offset(skip).limit(limit)).all()
+        results = self.db.scalars(self._select().offset(skip).limit(limit)).unique().all()
+        return self._load_ids(results)
 
     def get_by_ids(self, ids:list[int]):
-        results = self.db.query(self.model_type).filter(self.model_type.id.in_(ids)).all()
+        results = self.db.scalars(select(self.model_type).where(self.model_type.id.in_(ids))).unique().all()
         if len(results) != len(ids):
             raise HTTPException(status_code=400,
             detail=(f'{len(ids)-len(results)} ids not '
@@ -41,25 +55,257 @@ class Repository:
         instance = self.model_type(**data)
         self.db.add(instance)
         self.db.commit()
-        self.db.refresh(instance)
+        self._load_ids([instance])
         return instance
 
     def update(self, id: int, data: dict[str, Any]):
-        instance = self.get_by_id(id)
-        if not instance:
-            raise HTTPException(status_code=404, detail=f"{self.model_type.__name__} with ID {id} not found!")
+        values = self._column_values(data)
+        if values:
+            return self._update_returning(id, values)
+        instance = self._get(id, self.load_options + self._collection_options(inspect(self.model_type), data))
         for key, value in data.items():
             setattr(instance, key, value)
 
         self.db.commit()
-        self.db.refresh(instance)
+        self._load_ids([instance])
         return instance
 
     def edit(self, id: int, data: dict[str, Any]):
-        instance = self.get_by_id(id)
+        values = self._column_values({key: value for key, value in data.items() if value})
+        if values:
+            return self._update_returning(id, values)
+        instance = self._get(id, self.load_options + self._collection_options(inspect(self.model_type), data))
+
+        self._apply_edit(instance, data)
+
+        self.db.commit()
+        self._load_ids([instance])
+        return instance
+
+    def delete(self, id: int):
+        if self._plain_delete():
+            statement = delete(self.model_type).where(self.model_type.id == id)
+            result = cast(CursorResult[Any], self.db.execute(statement))
+            if not result.rowcount:
+                raise HTTPException(status_code=404, detail=f"{self.model_type.__name__} with ID {id} not found!")
+        else:
+            instance = self._get(id, self._collection_options(inspect(self.model_type)))
+            self.db.delete(instance)
+        self.db.commit()
+        return True
+
+    def bulk_create(self, rows: list[dict[str, Any]]):
+        if not rows:
+            return []
+        if not self.db.get_bind().dialect.insert_executemany_returning:
+            instances = [self.model_type(**row) for row in rows]
+            self.db.add_all(instances)
+            self.db.flush()
+            ids = [instance.id for instance in instances]
+        else:
+            keys = inspect(self.model_type).relationships.keys()
+            links = [{key: row.pop(key) for key in keys if key in row} for row in rows]
+            # ids are matched to their links by position, which only needs ordered RETURNING when links exist
+            statement = insert(self.model_type).returning(self.model_type.id, sort_by_parameter_order=any(links))
+            ids = list(self.db.scalars(statement, rows))
+            self._link(ids, links)
+        self.db.commit()
+        return self._get_many(ids)
+
+    def bulk_update(self, rows: list[dict[str, Any]]):
+        ids = [row['id'] for row in rows]
+        if self._has_relationships(rows):
+            instances = self._get_many_for_write(ids, {key for row in rows for key in row})
+            for row in rows:
+                self._apply_edit(instances[row['id']], row)
+        else:
+            self._check_ids(ids)
+            rows = [{key: value for key, value in row.items() if value or key == 'id'} for row in rows]
+            rows = [row for row in rows if len(row) > 1]
+            if rows:
+                self.db.execute(update(self.model_type), rows)
+        self.db.commit()
+        return self._get_many(ids)
+
+    def bulk_delete(self, ids: list[int]):
+        if self._plain_delete():
+            self._check_ids(ids)
+            self.db.execute(delete(self.model_type).where(self.model_type.id.in_(ids)))
+        else:
+            # the unit of work applies relationship cascades and batches the deletes per table
+            instances = self._get_many_for_write(ids)
+            for instance in instances.values():
+                self.db.delete(instance)
+        self.db.commit()
+        return len(set(ids))
+
+    def search(
+        self,
+        attribute: str | None,
+        value: str | None,
+        sort: str | None,
+        skip: int,
+        limit: int,
+        fields: Sequence[str] | None = None,
+    ):
+        statement = self._filter(self._select(fields), attribute, value)
+        if sort in self.model_type.__table__.columns.keys():
+            statement = statement.order_by(sort)
+        results = self.db.scalars(statement.offset(skip).limit(limit)).unique().all()
+        return self._load_ids(results, fields)
+
+    def get_page(
+        self,
+        cursor: int | None,
+        limit: int,
+        attribute: str | None = None,
+        value: str | None = None,
+        fields: Sequence[str] | None = None,
+    ):
+        statement = self._filter(self._select(fields), attribute, value)
+        if cursor is not None:
+            statement = statement.where(self.model_type.id > cursor)
+        statement = statement.order_by(self.model_type.id).limit(limit + 1)
+        results = self.db.scalars(statement).unique().all()
+        next_cursor = results[limit - 1].id if len(results) > limit else None
+        return self._load_ids(results[:limit], fields), next_cursor
+
+    def count(self, attribute: str | None = None, value: str | None = None) -> int:
+        statement = self._filter(select(func.count()).select_from(self.model_type), attribute, value)
+        return self.db.scalar(statement)
+
+    def estimate_count(self, attribute: str | None = None, value: str | None = None) -> int:
+        # table statistics spare large tables a full scan, filtered and small tables are counted exactly
+        if not (attribute and value):
+            estimate = self._table_estimate()
+            if estimate is not None and estimate >= settings.COUNT_ESTIMATE_MIN_ROWS:
+                return estimate
+        return self.count(attribute, value)
+
+    def _get(self, id: int, options: list[Any]):
+        # unlike Session.get a select also runs the options for an instance that is already in the session, it
+        # fills the unloaded attributes without overwriting the loaded ones
+        statement = select(self.model_type).where(self.model_type.id == id).options(*options)
+        db_obj = self.db.scalars(statement).unique().one_or_none()
+        if not db_obj:
+            raise HTTPException(status_code=404, detail=f"{self.model_type.__name__} with ID {id} not found!")
+        return db_obj
+
+    def _table_estimate(self) -> int | None:
+        # the statistics are refreshed by ANALYZE, and on PostgreSQL by autovacuum
+        dialect = self.db.get_bind().dialect.name
+        if dialect == 'postgresql':
+            statement = text('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)')
+        elif dialect == 'sqlite':
+            if not self.db.scalar(text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")):
+                return None
+            statement = text('SELECT stat FROM sqlite_stat1 WHERE tbl = :table LIMIT 1')
+        else:
+            return None
+        stat = self.db.scalar(statement, {'table': inspect(self.model_type).tables[0].name})
+        if stat is None:
+            return None
+        # the sqlite stat starts with the number of rows, PostgreSQL reports -1 for tables never analyzed
+        rows = int(str(stat).split()[0])
+        return rows if rows >= 0 else None
+
+    def _update_returning(self, id: int, values: dict[str, Any]):
+        statement = (
+            update(self.model_type)
+            .where(self.model_type.id == id)
+            .values(values)
+            .returning(self.model_type)
+            .options(*self.returning_options)
+        )
+        instance = self.db.scalars(statement).unique().one_or_none()
         if not instance:
             raise HTTPException(status_code=404, detail=f"{self.model_type.__name__} with ID {id} not found!")
+        self.db.commit()
+        self._load_ids([instance])
+        return instance
+
+    def _column_values(self, data: dict[str, Any]) -> dict[str, Any] | None:
+        # to-one relationships become foreign key values, collections need the unit of work
+        if not self.db.get_bind().dialect.update_returning:
+            return None
+        relationships = inspect(self.model_type).relationships
+        values: dict[str, Any] = {}
+        for key, value in data.items():
+            if key not in relationships:
+                values[key] = value
+            elif relationships[key].direction is MANYTOONE:
+                column = next(iter(relationships[key].local_columns))
+                values[str(column.key)] = value.id if value is not None else None
+            else:
+                return None
+        return values
 
+    def _plain_delete(self) -> bool:
+        # without cascades a row can be deleted without loading it and its relationships first
+        relationships = inspect(self.model_type).relationships
+        return all(rel.direction is MANYTOONE and not rel.cascade.delete for rel in relationships)
+
+    def _get_many(self, ids: list[int]):
+        statement = self._select().where(self.model_type.id.in_(ids)).execution_options(populate_existing=True)
+        instances = {instance.id: instance for instance in self.db.scalars(statement).unique().all()}
+        return self._load_ids([instances[id] for id in dict.fromkeys(ids)])
+
+    def _get_many_for_write(self, ids: list[int], keys: Container[str] | None = None) -> dict[int, Any]:
+        options = self._collection_options(inspect(self.model_type), keys)
+        statement = select(self.model_type).where(self.model_type.id.in_(ids)).options(*options)
+        instances = {instance.id: instance for instance in self.db.scalars(statement).unique().all()}
+        self._check_found(ids, instances)
+        return instances
+
+    def _check_ids(self, ids: list[int]):
+        found = set(self.db.scalars(select(self.model_type.id).where(self.model_type.id.in_(ids))))
+        self._check_found(ids, found)
+
+    def _check_found(self, ids: list[int], found: Container[int]) -> None:
+        missing = [id for id in dict.fromkeys(ids) if id not in found]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"{self.model_type.__name__} with IDs {missing} not found!")
+
+    def _link(self, ids: list[int], links: list[dict[str, list[Any]]]) -> None:
+        for key, prop in inspect(self.model_type).relationships.items():
+            pairs = [(id, related.id) for id, link in zip(ids, links) for related in link.get(key) or []]
+            if not pairs:
+                continue
+            if prop.secondary is not None:
+                parent_key = str(prop.synchronize_pairs[0][1].key)
+                related_key = str((prop.secondary_synchronize_pairs or [])[0][1].key)
+                values = [{parent_key: id, related_key: related_id} for id, related_id in pairs]
+                self.db.execute(insert(cast(Table, prop.secondary)), values)
+            else:
+                table = prop.target
+                statement = (
+                    update(table)
+                    .where(table.c.id == bindparam('_related_id'))
+                    .values({str(prop.synchronize_pairs[0][1].key): bindparam('_parent_id')})
+                )
+                values = [{'_parent_id': id, '_related_id': related_id} for id, related_id in pairs]
+                self.db.execute(statement, values)
+
+    def _collection_options(
+        self, mapper: Mapper[Any], keys: Container[str] | None = None, parent: Any = None, path: tuple[Any, ...] = ()
+    ) -> list[Any]:
+        # writes replace, append to or cascade over collections, which are loaded up front instead of on access
+        options: list[Any] = []
+        for rel in mapper.relationships:
+            if rel.direction is MANYTOONE or (keys is not None and rel.key not in keys):
+                continue
+            option = parent.selectinload(rel.class_attribute) if parent else selectinload(rel.class_attribute)
+            options.append(option)
+            if rel.cascade.delete and rel.mapper not in path:
+                # deleted children unlink their own collections, so these are loaded as well
+                options += self._collection_options(rel.mapper, None, option, (*path, mapper))
+        return options
+
+    def _has_relationships(self, rows: list[dict[str, Any]]) -> bool:
+        keys = inspect(self.model_type).relationships.keys()
+        return any(row.get(key) for row in rows for key in keys)
+
+    def _apply_edit(self, instance: Any, data: dict[str, Any]) -> None:
         for key, value in data.items():
             if value:
                 if isinstance(getattr(instance, key), list) and isinstance(value, list):
@@ -68,31 +314,52 @@ class Repository:
                 else:
                     setattr(instance, key, value)
 
-        self.db.commit()
-        self.db.refresh(instance)
-        return instance
+    def _select(self, fields: Sequence[str] | None = None) -> Select[Any]:
+        return select(self.model_type).options(*self._read_options(fields))
 
-    def delete(self, id: int):
-        instance = self.get_by_id(id)
-        if not instance:
-            raise HTTPException(status_code=404, detail=f"{self.model_type.__name__} with ID {id} not found!")
+    def _read_options(self, fields: Sequence[str] | None) -> list[Any]:
+        if fields is None:
+            return self.load_options
+        # only the requested columns and relationships are loaded, the other relationships stay unloaded
+        mapper = inspect(self.model_type)
+        columns = mapper.column_attrs.keys()
+        options = [load_only(*(getattr(self.model_type, key) for key in columns if key in fields or key == 'id'))]
+        options.append(lazyload('*'))
+        for key in mapper.relationships.keys():
+            if f'{key}_id' in fields and f'{key}_id' not in columns and key not in self.id_relationships:
+                options.append(selectinload(getattr(self.model_type, key)))
+        return options
 
-        self.db.delete(instance)
-        self.db.commit()
-        return True
+    def _load_ids(self, instances: Sequence[Any], fields: Sequence[str] | None = None) -> Sequence[Any]:
+        if not instances:
+            return instances
+        ids = [instance.id for instance in instances]
+        for name in self.id_relationships:
+            if fields is not None and f'{name}_id' not in fields:
+                continue
+            relationship = getattr(self.model_type, name)
+            related = aliased(relationship.property.mapper.class_)
+            statement = (
+                select(self.model_type.id, related.id)
+                .join(relationship.of_type(related))
+                .where(self.model_type.id.in_(ids))
+                .order_by(related.id)
+            )
+            related_ids: dict[int, list[int]] = {id: [] for id in ids}
+            for parent_id, related_id in self.db.execute(statement):
+                related_ids[parent_id].append(related_id)
+            for instance in instances:
+                instance.__dict__[f'_{name}_ids'] = related_ids[instance.id]
+        return instances
 
-    def search(self, attribute: str | None, value: str | None, sort: str | None, skip: int, limit: int):
-        columns = self.model_type.__table__.columns.keys()
-        statement = select(self.model_type)
+    def _filter(self, statement: Select[Any], attribute: str | None, value: str | None) -> Select[Any]:
         if attribute and value:
-            if attribute not in columns:
+            if attribute not in self.model_type.__table__.columns.keys():
                 raise HTTPException(status_code=406,
                 detail=(f"Attribute {attribute} in "
                     f"{self.model_type.__name__} not found!"))
             statement = statement.filter_by(**{attribute: value})
-        if sort in columns:
-            statement = statement.order_by(sort)
-        return self.db.scalars(statement.offset(skip).limit(limit)).all()
+        return statement
 """
     assert_code_lines(m, r)
 
@@ -110,3 +377,43 @@ class AppRepository(Repository):
         super().__init__(db, App)
 """
     assert_code_lines(m, r)
+
+
+def test_async_repo_code(app_obj: AppObject):
+    config = StructureConfig(async_mode=True)
+    base_lines = code_to_list(RepoBaseModule(config))
+    assert 'from sqlalchemy.ext.asyncio import AsyncSession' in base_lines
+    assert '        db: AsyncSession,' in base_lines
+    assert '    async def get_by_id(self, id: int, fields: Sequence[str] | None = None):' in base_lines
+    assert '        db_obj = (await self.db.scalars(statement)).unique().one_or_none()' in base_lines
+    assert '        results = (await self.db.scalars(statement.offset(skip).limit(limit))).unique().all()' in base_lines
+    assert '            for parent_id, related_id in await self.db.execute(statement):' in base_lines
+    assert '            await self.db.delete(instance)' in base_lines
+    assert '            result = cast(CursorResult[Any], await self.db.execute(statement))' in base_lines
+    assert '            return await self._update_returning(id, values)' in base_lines
+    r = """
+from sqlalchemy.ext.asyncio import AsyncSession
+from .base import Repository
+from ..models.app_model import App
+class AppRepository(Repository):
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, App)
+"""
+    assert_code_lines(RepoModuleCode(app_obj, config), r)
+
+
+def test_repo_load_strategies(app_obj: AppObject):
+    obj2 = AppObject('object2', *app_obj.attributes, config=AppConfig(lazy='joined'))
+    app_obj.add_one_to_many_rel(obj2, 'rel1', 'back_rel1', lazy='ids')
+    app_obj.add_many_to_one_rel(obj2, 'rel2', 'back_rel2', lazy='raise')
+    r = """
+from sqlalchemy.orm import Session
+from .base import Repository
+from ..models.app_model import App
+class AppRepository(Repository):
+    def __init__(self, db: Session):
+        super().__init__(db, App, id_relationships=['rel1'])
+"""
+    assert_code_lines(RepoModuleCode(app_obj, StructureConfig()), r)
+    lines = code_to_list(RepoModuleCode(obj2, StructureConfig()))
+    assert '        super().__init__(db, Object2, load_options=[selectinload(Object2.back_rel2)])' in lines
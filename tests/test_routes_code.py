@@ -1,8 +1,11 @@
-from warp_fastapi import AppObject
+from warp_fastapi import AppObject, Attribute
+from warp_fastapi.app_object import AppConfig, CacheConfig
 from warp_fastapi.code.code_objects.routes import MainRouterCode, RoutesModuleCode
+from warp_fastapi.code.code_objects.schema import CommonSchemaModule
+from warp_fastapi.code.code_objects.service import ServiceModuleCode
 from warp_fastapi.config import StructureConfig
 
-from .conftest import assert_code_lines
+from .conftest import assert_code_lines, code_to_list
 
 
 def test_routes_code(app_obj: AppObject):
@@ -11,17 +14,23 @@ def test_routes_code(app_obj: AppObject):
     print(m)
     r = (
         """
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, Body, HTTPException, Depends, Query, Request
 from fastapi.responses import JSONResponse
 from typing import Annotated
 from sqlalchemy.orm import Session
 from ..dependancies import get_db, get_current_user
-from ..schemas.app_schema import AppResponse, AppCreate, AppEdit
+from ..schemas.app_schema import (
+    AppResponse, AppCreate, AppEdit, AppBulkEdit, AppsResponse
+)
 from ..repository.app_repository import AppRepository
 from ..services.app_service import AppService, get_app_service
-from ..schemas.common_schema import QuerySchema
+from ..schemas.common_schema import (
+    QuerySchema, check_batch_size, decode_cursor, field_selector, keyset_page, offset_page, render_response
+)
+from ..settings import settings
 
 router = APIRouter(prefix="/apps", tags=['app'])
+select_fields = field_selector(AppResponse)
 @router.post("/", response_model=AppResponse, status_code=201)
 def create_app(app: AppCreate,
                   db: Annotated[Session, Depends(get_db)]):
@@ -29,25 +38,56 @@ def create_app(app: AppCreate,
 """
         + '    \n'
         + """    return service.create_app(app)
+@router.post("/bulk", response_model=list[AppResponse], status_code=201)
+def bulk_create_app(items: list[AppCreate],
+                  db: Annotated[Session, Depends(get_db)]):
+    check_batch_size(items, settings.BULK_MAX_BATCH_SIZE)
+    service = get_app_service(db)
+"""
+        + '    \n'
+        + """    return service.bulk_create_app(items)
+@router.patch("/bulk", response_model=list[AppResponse], status_code=200)
+def bulk_edit_app(items: list[AppBulkEdit],
+                  db: Annotated[Session, Depends(get_db)]):
+    check_batch_size(items, settings.BULK_MAX_BATCH_SIZE)
+    service = get_app_service(db)
+    return service.bulk_edit_app(items)
+@router.delete("/bulk", status_code=200)
+def bulk_delete_app(ids: Annotated[list[int], Body()],
+                  db: Annotated[Session, Depends(get_db)]):
+    check_batch_size(ids, settings.BULK_MAX_BATCH_SIZE)
+    service = get_app_service(db)
+    deleted = service.bulk_delete_app(ids)
+    return JSONResponse(content={"message":"Resources successfully deleted.", "deleted": deleted})
 @router.get("/{id}", response_model=AppResponse, status_code=200)
 def read_app(id: int,
-                db: Annotated[Session, Depends(get_db)]):
+                db: Annotated[Session, Depends(get_db)],
+                fields: Annotated[list[str] | None, Depends(select_fields)]):
     service = get_app_service(db)
-    return service.get_app(id)
+    return render_response(service.get_app(id, fields), fields)
 
-@router.get("/", response_model=list[AppResponse], status_code=200)
+@router.get("/", response_model=AppsResponse, status_code=200)
 def get_all_app(
+    request: Request,
     db: Annotated[Session, Depends(get_db)],
-    skip: int = 0, limit: int = 100,):
+    fields: Annotated[list[str] | None, Depends(select_fields)],
+    cursor: str | None = None, limit: Annotated[int, Query(gt=0, le=1000)] = 100,):
     service = get_app_service(db)
-    return service.search_app(None, None, None, skip, limit)
+    results, next_id = service.page_app(decode_cursor(cursor), limit, fields=fields)
+    return render_response(keyset_page(request, results, next_id, limit), fields)
 
-@router.get("/search/", response_model=list[AppResponse], status_code=200)
+@router.get("/search/", response_model=AppsResponse, status_code=200)
 def search_app(
+    request: Request,
     q: Annotated[QuerySchema, Depends(QuerySchema)],
-    db: Annotated[Session, Depends(get_db)]):
+    db: Annotated[Session, Depends(get_db)],
+    fields: Annotated[list[str] | None, Depends(select_fields)]):
     service = get_app_service(db)
-    return service.search_app(**q.model_dump())
+    if q.sort:
+        results = service.search_app(q.attribute, q.value, q.sort, q.skip, q.limit, fields)
+        return render_response(offset_page(request, results, q.skip, q.limit), fields)
+    results, next_id = service.page_app(decode_cursor(q.cursor), q.limit, q.attribute, q.value, fields)
+    return render_response(keyset_page(request, results, next_id, q.limit), fields)
 
 @router.put("/{id}", response_model=AppResponse, status_code=200)
 def update_app(
@@ -89,3 +129,55 @@ router.include_router(obj1_route.router)
 router.include_router(obj2_route.router)
 """
     assert_code_lines(m, r)
+
+
+def test_async_routes_code(app_obj: AppObject):
+    config = StructureConfig(async_mode=True)
+    lines = code_to_list(RoutesModuleCode(app_obj, config))
+    assert 'from sqlalchemy.ext.asyncio import AsyncSession' in lines
+    assert 'async def read_app(id: int,' in lines
+    assert '                db: Annotated[AsyncSession, Depends(get_db)],' in lines
+    assert '    return render_response(await service.get_app(id, fields), fields)' in lines
+    assert '    await service.delete_app(id)' in lines
+    assert not any(line.startswith('def ') for line in lines)
+
+
+def test_list_totals(atts: list[Attribute]):
+    planet = AppObject('planet', *atts, config=AppConfig(total='estimate', cache=CacheConfig()))
+    starship = AppObject('starship', *atts, config=AppConfig(total='exact'))
+    lines = code_to_list(RoutesModuleCode(planet))
+    list_total = 'service.count_planet()), fields)'
+    assert f'    return render_response(keyset_page(request, results, next_id, limit, {list_total}' in lines
+    search_total = 'service.count_planet(q.attribute, q.value)), fields)'
+    assert f'        return render_response(offset_page(request, results, q.skip, q.limit, {search_total}' in lines
+    assert f'    return render_response(keyset_page(request, results, next_id, q.limit, {search_total}' in lines
+    lines = code_to_list(ServiceModuleCode(planet, StructureConfig()))
+    assert 'count_adapter = TypeAdapter(int)' in lines
+    assert '    def count_planet(self, attribute: str|None = None, value: str|None = None):' in lines
+    assert '        total = self.repository.estimate_count(attribute, value)' in lines
+    assert "        return self.cache.set('lists', key, total, count_adapter)" in lines
+    lines = code_to_list(ServiceModuleCode(starship, StructureConfig(async_mode=True)))
+    assert '        return await self.repository.count(attribute, value)' in lines
+    lines = code_to_list(RoutesModuleCode(starship, StructureConfig(async_mode=True)))
+    total = 'await service.count_starship()'
+    assert f'    return render_response(keyset_page(request, results, next_id, limit, {total}), fields)' in lines
+    lines = code_to_list(RoutesModuleCode(AppObject('moon', *atts)))
+    assert '    return render_response(keyset_page(request, results, next_id, limit), fields)' in lines
+    lines = code_to_list(ServiceModuleCode(AppObject('moon', *atts), StructureConfig()))
+    assert not any('count_moon' in line for line in lines)
+
+
+def test_orjson_routes(app_obj: AppObject):
+    config = StructureConfig(orjson_mode=True)
+    lines = code_to_list(RoutesModuleCode(app_obj, config))
+    assert '    return render_response(service.get_app(id, fields), fields, AppResponse)' in lines
+    page = 'keyset_page(request, results, next_id, limit), fields, AppsResponse)'
+    assert f'    return render_response({page}' in lines
+    page = 'offset_page(request, results, q.skip, q.limit), fields, AppsResponse)'
+    assert f'        return render_response({page}' in lines
+    lines = code_to_list(CommonSchemaModule(config))
+    assert 'from fastapi.responses import ORJSONResponse, Response' in lines
+    assert 'def render_response(content: Any, fields: list[str] | None, schema: type[BaseModel]) -> Any:' in lines
+    response = 'Response(schema.model_validate(content).model_dump_json(), media_type="application/json")'
+    assert f'        return {response}' in lines
+    assert '    return ORJSONResponse(jsonable_encoder(content))' in lines
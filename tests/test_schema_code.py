@@ -1,5 +1,17 @@
+import random
+
+import pytest
+from ordered_set import OrderedSet
+
 from warp_fastapi import AppObject, Attribute
-from warp_fastapi.code.code_objects.schema import AttributeCode, CommonSchemaModule, RelationshipCode, SchemaModuleCode
+from warp_fastapi.code.code_objects.base import AbstractVariableCode, SimpleVariable
+from warp_fastapi.code.code_objects.schema import (
+    AttributeCode,
+    CommonSchemaModule,
+    RelationshipCode,
+    SchemaModuleCode,
+    find_base_att,
+)
 from warp_fastapi.config import StructureConfig
 from warp_fastapi.data_types import email_type
 
@@ -10,15 +22,19 @@ def test_common_schema():
     config = StructureConfig()
     m = CommonSchemaModule(config)
     r = """
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from pydantic import AnyUrl, BaseModel, Field
-from typing import Annotated, Literal
-from fastapi import Query
+from typing import Annotated, Any, Callable, Literal
+from fastapi import HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 
 class Pagination(BaseModel):
-    total: int
-    current_page: int
+    total: int | None = None
+    current_page: int | None = None
     next_page: AnyUrl | None = None
     prev_page: AnyUrl | None = None
+    next_cursor: str | None = None
     limit: int | None = None
     offset: int | None = None
 
@@ -26,8 +42,66 @@ class QuerySchema(BaseModel):
     attribute: Annotated[str | None, Query()] = Field(max_length=100)
     value: Annotated[str | None, Query()] = Field(max_length=1000)
     sort: Annotated[str | None, Query()] = Field(max_length=100, default=None)
+    cursor: Annotated[str | None, Query()] = Field(max_length=100, default=None)
     skip: int = Field(ge=0, default=0)
-    limit: int = Field(le=1000, default=100)
+    limit: int = Field(gt=0, le=1000, default=100)
+
+def encode_cursor(id: int) -> str:
+    return urlsafe_b64encode(str(id).encode()).decode()
+
+def decode_cursor(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    try:
+        return int(urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor!")
+
+def keyset_page(
+    request: Request, data: list[Any], next_id: int | None, limit: int, total: int | None = None
+) -> dict[str, Any]:
+    page: dict[str, Any] = {"data": data, "limit": limit, "total": total}
+    if next_id is not None:
+        page["next_cursor"] = encode_cursor(next_id)
+        page["next_page"] = str(request.url.include_query_params(cursor=page["next_cursor"]))
+    return page
+
+def offset_page(
+    request: Request, data: list[Any], skip: int, limit: int, total: int | None = None
+) -> dict[str, Any]:
+    page: dict[str, Any] = {
+        "data": data, "limit": limit, "offset": skip, "current_page": skip // limit + 1, "total": total
+    }
+    if len(data) == limit:
+        page["next_page"] = str(request.url.include_query_params(skip=skip + limit))
+    if skip > 0:
+        page["prev_page"] = str(request.url.include_query_params(skip=max(skip - limit, 0)))
+    return page
+
+def field_selector(schema: type[BaseModel]) -> Callable[..., list[str] | None]:
+    def select_fields(fields: Annotated[str | None, Query(max_length=1000)] = None) -> list[str] | None:
+        if not fields:
+            return None
+        selected = list(dict.fromkeys(["id", *(field.strip() for field in fields.split(",") if field.strip())]))
+        unknown = [field for field in selected if field not in schema.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields {unknown}!")
+        return selected
+    return select_fields
+
+def render_response(content: Any, fields: list[str] | None) -> Any:
+    # sparse responses skip the response model, so only the requested attributes are read and serialized
+    if fields is None:
+        return content
+    if isinstance(content, dict):
+        content = {**content, "data": [{field: getattr(item, field) for field in fields} for item in content["data"]]}
+    else:
+        content = {field: getattr(content, field) for field in fields}
+    return JSONResponse(jsonable_encoder(content))
+
+def check_batch_size(items: list[Any], max_size: int) -> None:
+    if len(items) > max_size:
+        raise HTTPException(status_code=413, detail=f"Batch of {len(items)} items exceeds the limit of {max_size}!")
 """
     assert_code_lines(m, r)
 
@@ -74,8 +148,6 @@ class Object1Base(BaseModel):
     rel1_id: list[int] | None = None
     rel2_id: int
     rel3_id: list[int] | None = None
-class Object1sResponse(Pagination):
-    data: list[Object1Response]
 class Object1Response(Object1Base):
     id: int
     model_config = ConfigDict(from_attributes=True)
@@ -89,5 +161,53 @@ class Object1Edit(BaseModel):
     rel1_id: list[int] | None = None
     rel2_id: int | None = None
     rel3_id: list[int] | None = None
+class Object1BulkEdit(Object1Edit):
+    id: int
+class Object1sResponse(Pagination):
+    data: list[Object1Response]
 """
     assert_code_lines(m1, r1)
+
+
+def greedy_base_att(*sets: OrderedSet[AbstractVariableCode]) -> OrderedSet[AbstractVariableCode]:
+    # the previous quadratic search, kept as the reference for find_base_att
+    union_sets = sets[0]
+    for i in range(len(sets) - 1):
+        union_sets = union_sets.union(sets[i + 1])
+    unknow_set: OrderedSet[AbstractVariableCode] = OrderedSet([])
+    current_len = sum([len(s) for s in sets])
+    for x in union_sets:
+        unknow_set.add(x)
+        new_sets: list[OrderedSet[AbstractVariableCode]] = []
+        for s in sets:
+            new_set = OrderedSet(s - unknow_set)
+            if not list(new_set) + list(unknow_set) == list(s):
+                new_set = s
+            new_sets.append(new_set)
+        new_len = sum([len(s) for s in new_sets]) + len(unknow_set)
+        if new_len < current_len:
+            current_len = new_len
+        else:
+            unknow_set.remove(x)
+    return unknow_set
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_find_base_att_matches_greedy_search(seed: int):
+    rnd = random.Random(seed)
+    pool: list[AbstractVariableCode] = [
+        SimpleVariable(f'att{i}', rnd.choice(['int', 'str', 'str | None'])) for i in range(rnd.randint(1, 15))
+    ]
+    sets = [OrderedSet(rnd.sample(pool, rnd.randint(0, len(pool)))) for _ in range(rnd.randint(1, 4))]
+    assert [str(x) for x in find_base_att(*sets)] == [str(x) for x in greedy_base_att(*sets)]
+
+
+def test_find_base_att_wide_schemas():
+    common: list[AbstractVariableCode] = [SimpleVariable(f'field{i}', 'str') for i in range(300)]
+    read: OrderedSet[AbstractVariableCode] = OrderedSet([SimpleVariable('id', 'int'), *common])
+    create = OrderedSet(common)
+    edit: OrderedSet[AbstractVariableCode] = OrderedSet(
+        [SimpleVariable(f'field{i}', 'str | None', 'None') for i in range(300)]
+    )
+    base = find_base_att(read, create, edit)
+    assert list(base) == common
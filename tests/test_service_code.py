@@ -2,20 +2,28 @@ from warp_fastapi import AppObject
 from warp_fastapi.code.code_objects.service import ServiceModuleCode
 from warp_fastapi.config import StructureConfig
 
-from .conftest import assert_code_lines
+from .conftest import assert_code_lines, code_to_list
 
 
 def test_simple_service(app_obj: AppObject):
     m = ServiceModuleCode(app_obj, StructureConfig())
-    r = """
-from ..schemas.app_schema import AppCreate, AppDatabase, AppEdit, AppResponse
+    search_line = (
+        '    def search_app(self, attribute: str|None, value: str|None, sort: str|None, skip: int, limit: int, '
+        'fields: list[str]|None = None):'
+    )
+    page_line = (
+        '    def page_app(self, cursor: int|None, limit: int, attribute: str|None = None, value: str|None = None, '
+        'fields: list[str]|None = None):'
+    )
+    r = f"""
+from ..schemas.app_schema import AppBulkEdit, AppCreate, AppDatabase, AppEdit, AppResponse
 from ..repository.app_repository import AppRepository
 from sqlalchemy.orm import Session
 class AppService:
     def __init__(self, repository: AppRepository):
         self.repository = repository
-    def get_app(self, id: int):
-        return self.repository.get_by_id(id)
+    def get_app(self, id: int, fields: list[str]|None = None):
+        return self.repository.get_by_id(id, fields)
     def create_app(self, app: AppCreate):
         app_data = app.model_dump()
         db_app = self.repository.create(app_data)
@@ -30,9 +38,19 @@ class AppService:
         return db_app
     def delete_app(self, id: int):
         return self.repository.delete(id)
-    def search_app(self, attribute: str|None, value: str|None, sort: str|None, skip: int, limit: int):
-        db_results = self.repository.search(attribute, value, sort, skip, limit)
+    def bulk_create_app(self, items: list[AppCreate]):
+        rows = [item.model_dump() for item in items]
+        return self.repository.bulk_create(rows)
+    def bulk_edit_app(self, items: list[AppBulkEdit]):
+        rows = [item.model_dump(exclude_unset=True) for item in items]
+        return self.repository.bulk_update(rows)
+    def bulk_delete_app(self, ids: list[int]):
+        return self.repository.bulk_delete(ids)
+{search_line}
+        db_results = self.repository.search(attribute, value, sort, skip, limit, fields)
         return db_results
+{page_line}
+        return self.repository.get_page(cursor, limit, attribute, value, fields)
 def get_app_service(db: Session):
     return AppService(AppRepository(db))
 """
@@ -43,6 +61,14 @@ def get_app_service(db: Session):
 def test_complex_service(app_objs_with_rel: tuple[AppObject, AppObject]):
     obj = app_objs_with_rel[0]
     m = ServiceModuleCode(obj, StructureConfig())
+    search_line = (
+        '    def search_object1(self, attribute: str|None, value: str|None, sort: str|None, skip: int, limit: int, '
+        'fields: list[str]|None = None):'
+    )
+    page_line = (
+        '    def page_object1(self, cursor: int|None, limit: int, attribute: str|None = None, value: str|None = None, '
+        'fields: list[str]|None = None):'
+    )
     return_service_line = (
         'return Object1Service(Object1Repository(db), '
         'object2_repository=Object2Repository(db), '
@@ -51,7 +77,7 @@ def test_complex_service(app_objs_with_rel: tuple[AppObject, AppObject]):
     )
     r = (
         f"""
-from ..schemas.object1_schema import Object1Create, Object1Database, Object1Edit, Object1Response
+from ..schemas.object1_schema import Object1BulkEdit, Object1Create, Object1Database, Object1Edit, Object1Response
 from ..repository.object1_repository import Object1Repository
 from sqlalchemy.orm import Session
 from ..repository.object2_repository import Object2Repository
@@ -84,8 +110,25 @@ class Object1Service:
         data = object1.model_dump(exclude_unset=True,exclude={{"rel1_id", "rel2_id", "rel3_id"}})
         data.update(id_data)
         return data
-    def get_object1(self, id: int):
-        return self.repository.get_by_id(id)
+    def _prepare_bulk_data(self, items: list[Object1Create]|list[Object1BulkEdit], exclude_unset: bool = False):
+        rows = [item.model_dump(exclude_unset=exclude_unset) for item in items]
+        rel1_ids = list({{id for row in rows for id in row.get('rel1_id') or []}})
+        rel1 = {{obj.id: obj for obj in self.object2_repository.get_by_ids(rel1_ids)}} if rel1_ids else {{}}
+        rel2_ids = list({{row['rel2_id'] for row in rows if row.get('rel2_id')}})
+        if rel2_ids:
+            self.object3_repository.get_by_ids(rel2_ids)
+        rel3_ids = list({{id for row in rows for id in row.get('rel3_id') or []}})
+        rel3 = {{obj.id: obj for obj in self.object4_repository.get_by_ids(rel3_ids)}} if rel3_ids else {{}}
+        for row in rows:
+            rel1_id = row.pop('rel1_id', None)
+            if rel1_id:
+                row['rel1'] = [rel1[id] for id in rel1_id]
+            rel3_id = row.pop('rel3_id', None)
+            if rel3_id:
+                row['rel3'] = [rel3[id] for id in rel3_id]
+        return rows
+    def get_object1(self, id: int, fields: list[str]|None = None):
+        return self.repository.get_by_id(id, fields)
     def create_object1(self, object1: Object1Create):
         object1_data = self._prepare_db_data(object1)
         db_object1 = self.repository.create(object1_data)
@@ -100,12 +143,35 @@ class Object1Service:
         return db_object1
     def delete_object1(self, id: int):
         return self.repository.delete(id)
-    def search_object1(self, attribute: str|None, value: str|None, sort: str|None, skip: int, limit: int):
-        db_results = self.repository.search(attribute, value, sort, skip, limit)
+    def bulk_create_object1(self, items: list[Object1Create]):
+        rows = self._prepare_bulk_data(items)
+        return self.repository.bulk_create(rows)
+    def bulk_edit_object1(self, items: list[Object1BulkEdit]):
+        rows = self._prepare_bulk_data(items, exclude_unset=True)
+        return self.repository.bulk_update(rows)
+    def bulk_delete_object1(self, ids: list[int]):
+        return self.repository.bulk_delete(ids)
+{search_line}
+        db_results = self.repository.search(attribute, value, sort, skip, limit, fields)
         return db_results
+{page_line}
+        return self.repository.get_page(cursor, limit, attribute, value, fields)
 def get_object1_service(db: Session):
     {return_service_line}
 """
     )
     print(m)
     assert_code_lines(m, r)
+
+
+def test_async_service(app_objs_with_rel: tuple[AppObject, AppObject]):
+    obj = app_objs_with_rel[0]
+    lines = code_to_list(ServiceModuleCode(obj, StructureConfig(async_mode=True)))
+    assert 'from sqlalchemy.ext.asyncio import AsyncSession' in lines
+    assert '    async def _get_id_data(self, object1: Object1Create|Object1Edit):' in lines
+    assert '            rel2 = await self.object3_repository.get_by_id(object1.rel2_id)' in lines
+    assert '        rel1, rel2, rel3 = await self._get_id_data(object1)' in lines
+    assert '    async def edit_object1(self, id: int, object1: Object1Edit):' in lines
+    assert '        db_object1 = await self.repository.edit(id, object1_data)' in lines
+    assert '        return await self.repository.delete(id)' in lines
+    assert 'def get_object1_service(db: AsyncSession):' in lines
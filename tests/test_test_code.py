@@ -1,6 +1,8 @@
 from warp_fastapi import AppObject, Attribute
-from warp_fastapi.code.code_objects.tests import ConfTestModuleCode, TestModuleCode as TModuleCode
+from warp_fastapi.app_object import AppConfig, CacheConfig
+from warp_fastapi.code.code_objects.tests import ConfTestModuleCode, ListBenchModuleCode, TestModuleCode as TModuleCode
 from warp_fastapi.config import StructureConfig
+from warp_fastapi.relationships import many_to_one
 
 from .conftest import assert_code_lines
 
@@ -9,8 +11,9 @@ def test_conftest_code(app_objs_with_rel: tuple[AppObject, AppObject]):
     m = ConfTestModuleCode(list(app_objs_with_rel), StructureConfig())
     r = """
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import Engine
 from sqlalchemy.pool import StaticPool
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -25,7 +28,7 @@ def base_client():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool
     )
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
     Base.metadata.create_all(bind=engine)
     def override_get_db():
         try:
@@ -40,6 +43,14 @@ def client(base_client: FastAPI):
     with TestClient(base_client) as c:
         yield c
 @pytest.fixture
+def statements():
+    executed: list[str] = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+    event.listen(Engine, "before_cursor_execute", count)
+    yield executed
+    event.remove(Engine, "before_cursor_execute", count)
+@pytest.fixture
 def get_object1() -> dict[str,str|int]:
     return {"name": "name", "desc": "desc", "date": "2020-11-20", "time": "07:44", "rel2_id": "1"}
 @pytest.fixture
@@ -59,8 +70,8 @@ def test_tmodule_code(app_objs_with_rel: tuple[AppObject, AppObject], complex_in
 import pytest
 from fastapi.testclient import TestClient
 from app.security import is_valid_password
-def test_object1(client: TestClient, get_object1: dict[str,str|int], """
-        """get_object3: dict[str,str|int], get_object4: dict[str,str|int]):
+def test_object1(client: TestClient, get_object1: dict[str,str|int], statements: list[str], """
+        """get_object2: dict[str,str|int], get_object3: dict[str,str|int], get_object4: dict[str,str|int]):
     client.post('/api/v1/object3s',json=get_object3)
     client.post('/api/v1/object4s',json=get_object4)
     response = client.post('/api/v1/object1s',json=get_object1)
@@ -84,6 +95,33 @@ def test_object1(client: TestClient, get_object1: dict[str,str|int], """
     assert data['time'] == '07:44'
     assert data['att'] == 1
     assert data['rel2_id'] == 1
+    statements.clear()
+    response = client.patch(f"/api/v1/object1s/{id}",json=get_object1)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data['name'] == 'name'
+    assert data['desc'] == 'desc'
+    assert data['date'] == '2020-11-20'
+    assert data['time'] == '07:44'
+    assert data['att'] == 1
+    assert data['rel2_id'] == 1
+    writes = [index for index, statement in enumerate(statements) if not statement.startswith("SELECT")]
+    assert len(writes) == 1, statements
+    update = statements[writes[0]:]
+    assert update[0].startswith("UPDATE object1s SET") and " RETURNING " in update[0], update
+    # the row comes back with the UPDATE, only its relationships are selected afterwards
+    assert [statement.split()[0] for statement in update] == ["UPDATE", "SELECT", "SELECT"], update
+    new_rel1 = client.post('/api/v1/object2s',json=get_object2).json()
+    response = client.put(f"/api/v1/object1s/{id}",json={**get_object1, 'rel1_id': [new_rel1['id']], 'rel3_id': [1]})
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data['rel1_id'] == [new_rel1['id']]
+    assert data['rel3_id'] == [1]
+    response = client.put(f"/api/v1/object1s/{id}",json={**get_object1, 'rel1_id': [], 'rel3_id': []})
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data['rel1_id'] == []
+    assert data['rel3_id'] == []
     response = client.delete(f"/api/v1/object1s/{id}")
     assert response.status_code == 200, response.text
     data = response.json()
@@ -92,7 +130,44 @@ def test_object1(client: TestClient, get_object1: dict[str,str|int], """
     assert response.status_code == 404, response.text
     data = response.json()
     assert data["detail"] == f"Object1 with ID {id} not found!"
-def test_object4(client: TestClient, get_object4: dict[str,str|int], """
+    response = client.post('/api/v1/object1s/bulk',json=[get_object1])
+    assert response.status_code == 201, response.text
+    data = response.json()[0]
+    assert data['name'] == 'name'
+    assert data['desc'] == 'desc'
+    assert data['date'] == '2020-11-20'
+    assert data['time'] == '07:44'
+    assert data['att'] == 1
+    assert data['rel2_id'] == 1
+    response = client.request("DELETE", '/api/v1/object1s/bulk', json=[data["id"]])
+    assert response.status_code == 200, response.text
+    assert response.json()["deleted"] == 1
+def test_object1_pages(client: TestClient, get_object1: dict[str,str|int], get_object3: dict[str,str|int]):
+    client.post('/api/v1/object3s',json=get_object3)
+    ids: list[int] = []
+    for index in range(5):
+        response = client.post('/api/v1/object1s',json={**get_object1, 'att': index})
+        assert response.status_code == 201, response.text
+        ids.append(response.json()["id"])
+    seen: list[int] = []
+    pages = 0
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        response = client.get('/api/v1/object1s/', params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        seen += [row["id"] for row in page["data"]]
+        pages += 1
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    # the cursor walks every row once and in order
+    assert pages == 3
+    assert seen == sorted(ids)
+    response = client.get('/api/v1/object1s/', params={"cursor": "not a cursor"})
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == "Invalid cursor!"
+def test_object4(client: TestClient, get_object4: dict[str,str|int], statements: list[str], """
         """get_object1: dict[str,str|int], get_object3: dict[str,str|int]):
     client.post('/api/v1/object3s',json=get_object3)
     client.post('/api/v1/object1s',json=get_object1)
@@ -109,6 +184,26 @@ def test_object4(client: TestClient, get_object4: dict[str,str|int], """
     assert data["id"] == id
     assert data['name'] == 'name'
     assert data['desc'] == 'desc'
+    statements.clear()
+    response = client.patch(f"/api/v1/object4s/{id}",json=get_object4)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data['name'] == 'name'
+    assert data['desc'] == 'desc'
+    writes = [index for index, statement in enumerate(statements) if not statement.startswith("SELECT")]
+    assert len(writes) == 1, statements
+    update = statements[writes[0]:]
+    assert update[0].startswith("UPDATE object4s SET") and " RETURNING " in update[0], update
+    # the row comes back with the UPDATE, only its relationships are selected afterwards
+    assert [statement.split()[0] for statement in update] == ["UPDATE", "SELECT"], update
+    response = client.put(f"/api/v1/object4s/{id}",json={**get_object4, 'back_rel3_id': [1]})
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data['back_rel3_id'] == [1]
+    response = client.put(f"/api/v1/object4s/{id}",json={**get_object4, 'back_rel3_id': []})
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data['back_rel3_id'] == []
     response = client.delete(f"/api/v1/object4s/{id}")
     assert response.status_code == 200, response.text
     data = response.json()
@@ -117,7 +212,130 @@ def test_object4(client: TestClient, get_object4: dict[str,str|int], """
     assert response.status_code == 404, response.text
     data = response.json()
     assert data["detail"] == f"Object4 with ID {id} not found!"
+    response = client.post('/api/v1/object4s/bulk',json=[get_object4])
+    assert response.status_code == 201, response.text
+    data = response.json()[0]
+    assert data['name'] == 'name'
+    assert data['desc'] == 'desc'
+    response = client.request("DELETE", '/api/v1/object4s/bulk', json=[data["id"]])
+    assert response.status_code == 200, response.text
+    assert response.json()["deleted"] == 1
+def test_object4_pages(client: TestClient, get_object4: dict[str,str|int]):
+    ids: list[int] = []
+    for index in range(5):
+        response = client.post('/api/v1/object4s',json=get_object4)
+        assert response.status_code == 201, response.text
+        ids.append(response.json()["id"])
+    seen: list[int] = []
+    pages = 0
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        response = client.get('/api/v1/object4s/', params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        seen += [row["id"] for row in page["data"]]
+        pages += 1
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    # the cursor walks every row once and in order
+    assert pages == 3
+    assert seen == sorted(ids)
+    response = client.get('/api/v1/object4s/', params={"cursor": "not a cursor"})
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == "Invalid cursor!"
 """
     )
     print(m)
     assert_code_lines(m, r)
+
+
+def test_patch_check(atts: list[Attribute]):
+    obj1 = AppObject('object1', *atts)
+    obj2 = AppObject('object2', *atts, config=AppConfig(lazy='selectin'))
+    obj1.add_one_to_many_rel(obj2, 'rel', 'back_rel')
+    m = TModuleCode([obj1, obj2], StructureConfig(async_mode=True))
+    check = m.get_patch_check(obj2)
+    assert 'assert update[0].startswith("UPDATE object2s SET") and " RETURNING " in update[0], update' in check
+    assert 'assert [statement.split()[0] for statement in update] == ["UPDATE", "SELECT"], update' in check
+    check = m.get_patch_check(obj1)
+    assert (
+        'assert not [statement for statement in update if "FROM object1s WHERE object1s.id = ?" in statement], update'
+    ) in check
+    assert 'assert all(statement.startswith("SELECT") for statement in statements), statements' == (
+        m.get_patch_check(AppObject('object3'))
+    )
+
+
+def test_page_test_unique_rows(atts: list[Attribute], complex_int_att: Attribute):
+    obj = AppObject('object1', Attribute('code', atts[0].type, unique=True), complex_int_att, *atts)
+    lines = str(TModuleCode.get_page_test(obj)).splitlines()
+    row = "{**get_object1, 'code': f'{index}code', 'att': index}"
+    assert f"        response = client.post('/api/v1/object1s',json={row})" in lines
+
+
+def test_previous_owner_test(atts: list[Attribute]):
+    obj1 = AppObject('object1', *atts, config=AppConfig(cache=CacheConfig()))
+    obj2 = AppObject('object2', *atts)
+    obj1.add_one_to_many_rel(obj2, 'rel', 'back_rel')
+    lines = str(TModuleCode.get_owner_test(obj1)).splitlines()
+    assert 'def test_object1_previous_owner(client: TestClient, get_object1: dict[str,str|int], ' in lines[0]
+    assert "    child = client.post('/api/v1/object2s',json=get_object2).json()" in lines
+    assert "    assert response.json()['rel_id'] == []" in lines
+    # uncached objects and objects that only hold references to their owners don't get the test
+    assert TModuleCode.get_owner_test(obj2) is None
+    obj3 = AppObject('object3', *atts)
+    obj3.add_one_to_many_rel(obj1, 'rel', 'back_rel')
+    assert TModuleCode.get_owner_test(obj3) is None
+
+
+def test_list_bench_code(atts: list[Attribute], complex_int_att: Attribute):
+    obj1 = AppObject('object1', *atts, complex_int_att, secure=True)
+    obj2 = AppObject('object2', *atts)
+    obj1.add_relationship(obj2, many_to_one, 'rel', 'back_rel')
+    m = ListBenchModuleCode([obj1, obj2], StructureConfig())
+    r = (
+        """
+import time
+from collections.abc import Callable
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from app.schemas.object1_schema import Object1sResponse
+from app.schemas.object2_schema import Object2sResponse
+ROWS: int = 500
+ROUNDS: int = 50
+def bench(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return ROUNDS / (time.perf_counter() - start)
+def report(client: TestClient, url: str, schema: type[BaseModel]) -> None:
+    page = client.get(url).json()
+    # the renderers validate the same page and only differ in how it is serialized
+    results = {
+        "endpoint": bench(lambda: client.get(url)),
+        "json": bench(lambda: JSONResponse(schema.model_validate(page).model_dump(mode="json"))),
+        "orjson": bench(lambda: ORJSONResponse(schema.model_validate(page).model_dump(mode="json"))),
+        "model_dump_json": bench(
+            lambda: Response(schema.model_validate(page).model_dump_json(), media_type="application/json")
+        ),
+    }
+    print(f"\\n{url}, {len(page['data'])} items")
+    for name, per_second in results.items():
+        print(f"  {name:<16} {per_second:10.0f}/s")
+def test_list_object1(secure_client: TestClient, get_object1: dict[str,str|int], """
+        """get_object2: dict[str,str|int]) -> None:
+    secure_client.post('/api/v1/object2s',json=get_object2)
+    rows = [{**get_object1, "name": f"name{i}", "desc": f"desc{i}", "att": i} for i in range(ROWS)]
+    response = secure_client.post("/api/v1/object1s/bulk", json=rows)
+    assert response.status_code == 201, response.text
+    report(secure_client, "/api/v1/object1s/?limit=100", Object1sResponse)
+def test_list_object2(client: TestClient, get_object2: dict[str,str|int]) -> None:
+    rows = [{**get_object2, "name": f"name{i}", "desc": f"desc{i}"} for i in range(ROWS)]
+    response = client.post("/api/v1/object2s/bulk", json=rows)
+    assert response.status_code == 201, response.text
+    report(client, "/api/v1/object2s/?limit=100", Object2sResponse)
+"""
+    )
+    assert_code_lines(m, r)
@@ -1,6 +1,26 @@
-from .app_object import AppObject, AuthObject
-from .app_project import AppProject
-from .attributes import Attribute
-from .create_project import ProjectCreator
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .app_object import AppObject, AuthObject
+    from .app_project import AppProject
+    from .attributes import Attribute
+    from .create_project import ProjectCreator
 
 __all__ = ['ProjectCreator', 'AppObject', 'AuthObject', 'AppProject', 'Attribute']
+
+# the CLI imports the package on every run, the pydantic models and code generators are imported on first use
+_LAZY_IMPORTS = {
+    'AppObject': 'app_object',
+    'AuthObject': 'app_object',
+    'AppProject': 'app_project',
+    'Attribute': 'attributes',
+    'ProjectCreator': 'create_project',
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(f'.{_LAZY_IMPORTS[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
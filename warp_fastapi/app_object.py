@@ -4,20 +4,26 @@ Main module for definition of application objects. Contains AppObject and AppCon
 from __future__ import annotations
 
 import re
+from collections.abc import Iterator
+from functools import cache
+from typing import Any, Literal, NamedTuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr, field_serializer
 
 from .attributes import (
     Attribute,
     DescriptionAttribute,
     EmailAttribute,
+    IndexType,
     NameAttribute,
     StringAttribute,
     UsernameAttribute,
+    check_unique_index,
 )
 from .base import TemplateModel
 from .relationships import (
     BackpopulatesRelationship,
+    LoadStrategy,
     Relationship,
     RelationshipType,
     create_relationship,
@@ -28,6 +34,20 @@ from .relationships import (
 )
 
 
+class CacheConfig(BaseModel):
+    """
+    A class representing the response cache of an AppObject.
+
+    Attributes:
+        ttl (int): Seconds a cached response is kept.
+    """
+
+    ttl: int = 60
+
+
+TotalStrategy = Literal['exact', 'estimate', 'skip']
+
+
 # TODO:add name validation for these attributes
 class AppConfig(BaseModel):
     """
@@ -39,6 +59,10 @@ class AppConfig(BaseModel):
         class_name (str | None): The class name for the app.
         plural (str | None): The plural form of the app name.
         plural_class_name (str | None): The plural class name for the app.
+        lazy (LoadStrategy | None): Default loading strategy for the relationships of the app.
+        cache (CacheConfig | None): Caches the read endpoints of the app when set.
+        total (TotalStrategy): How list endpoints fill the total of a page: counted exactly, estimated from the
+            table statistics of the database, or skipped.
     """
 
     route_name: str | None = None
@@ -46,6 +70,162 @@ class AppConfig(BaseModel):
     class_name: str | None = None
     plural: str | None = None
     plural_class_name: str | None = None
+    lazy: LoadStrategy | None = None
+    cache: CacheConfig | None = None
+    total: TotalStrategy = 'skip'
+
+
+class ObjectNames(NamedTuple):
+    """
+    The names derived from the name and config of an AppObject.
+    """
+
+    name: str
+    class_name: str
+    table_name: str
+    route_name: str
+    plural_class_name: str
+
+
+def get_plural(word: str) -> str:
+    """
+    Gets the english plural of a word.
+
+    Args:
+        word (str): The word in singular.
+
+    Returns:
+        str: The plural of the word.
+    """
+    if re.search('[sxz]$', word) or re.search('[^aeioudgkprt]h$', word):
+        return re.sub('$', 'es', word)
+    if re.search('[^aeiou]y$', word):
+        return re.sub('y$', 'ies', word)
+    return word + 's'
+
+
+def get_class_name(name: str) -> str:
+    """
+    Converts a name to a class name.
+
+    Args:
+        name (str): The name to convert.
+
+    Returns:
+        str: The class name.
+    """
+    splite_names = name.split('_')
+    name = ''.join([split_name.capitalize() for split_name in splite_names])
+    return name
+
+
+@cache
+def get_object_names(
+    name: str,
+    plural: str | None = None,
+    class_name: str | None = None,
+    table_name: str | None = None,
+    route_name: str | None = None,
+    plural_class_name: str | None = None,
+) -> ObjectNames:
+    """
+    Computes the names of an object once for every combination of name and config overrides.
+
+    Args:
+        name (str): The name of the object.
+        plural (str | None): The plural override of the config.
+        class_name (str | None): The class name override of the config.
+        table_name (str | None): The table name override of the config.
+        route_name (str | None): The route name override of the config.
+        plural_class_name (str | None): The plural class name override of the config.
+
+    Returns:
+        ObjectNames: The names of the object.
+    """
+    plural = plural or get_plural(name)
+    return ObjectNames(
+        name=name,
+        class_name=class_name or get_class_name(name),
+        table_name=table_name or plural,
+        route_name=route_name or plural.replace('_', '-'),
+        plural_class_name=plural_class_name or get_class_name(plural),
+    )
+
+
+class RelationshipIndex:
+    """
+    Identity index of the relationships of an AppObject.
+
+    Relationships are looked up by id, so membership checks never compare the object graph. The index is a cache,
+    it is rebuilt when the relationship lists were replaced or resized outside of add_relationship and it never
+    affects the equality of objects.
+
+    Attributes:
+        relationships (dict[int, Relationship | BackpopulatesRelationship]): The relationships of the object.
+        back_populates_relationships (dict[int, BackpopulatesRelationship]): The backpopulates relationships.
+        version (int): Counts the changes to the relationships of all objects, results derived from the graph
+            are valid while it stays the same.
+    """
+
+    version = 0
+
+    def __init__(self) -> None:
+        self.relationships: dict[int, Relationship | BackpopulatesRelationship] = {}
+        self.back_populates_relationships: dict[int, BackpopulatesRelationship] = {}
+        self._sources: tuple[list[Relationship | BackpopulatesRelationship], list[BackpopulatesRelationship]] = ([], [])
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RelationshipIndex)
+
+    def __reduce__(self) -> tuple[type[RelationshipIndex], tuple[()]]:
+        # ids don't survive pickling and deep copies, their index is rebuilt on first use
+        return RelationshipIndex, ()
+
+    def update(
+        self,
+        relationships: list[Relationship | BackpopulatesRelationship],
+        back_populates_relationships: list[BackpopulatesRelationship],
+    ) -> None:
+        """
+        Rebuilds the index if it doesn't match the relationship lists of the object.
+
+        Args:
+            relationships (list[Relationship | BackpopulatesRelationship]): The relationships of the object.
+            back_populates_relationships (list[BackpopulatesRelationship]): The backpopulates relationships.
+        """
+        own, back = self._sources
+        if (
+            own is relationships
+            and back is back_populates_relationships
+            and len(self.relationships) == len(relationships)
+            and len(self.back_populates_relationships) == len(back_populates_relationships)
+        ):
+            return
+        self.relationships = {id(rel): rel for rel in relationships}
+        self.back_populates_relationships = {id(rel): rel for rel in back_populates_relationships}
+        self._sources = (relationships, back_populates_relationships)
+        RelationshipIndex.version += 1
+
+    def has_relationship(self, rel: Relationship | BackpopulatesRelationship) -> bool:
+        return self.relationships.get(id(rel)) is rel
+
+    def has_back_populates_relationship(self, rel: Relationship | BackpopulatesRelationship) -> bool:
+        return self.back_populates_relationships.get(id(rel)) is rel
+
+
+class CompositeIndex(BaseModel):
+    """
+    A class representing an index over several columns of an AppObject table.
+
+    Attributes:
+        columns (list[str]): Names of the indexed attributes or foreign keys, in index order.
+        unique (bool): Whether the combination of the columns is unique.
+        index_type (IndexType | None): Index method used on PostgreSQL.
+    """
+
+    columns: list[str]
+    unique: bool = False
+    index_type: IndexType | None = None
 
 
 class AppObject(TemplateModel):
@@ -56,6 +236,7 @@ class AppObject(TemplateModel):
         relationships (list[Relationship | BackpopulatesRelationship]): The relationships of the object.
         back_populates_relationships (list[BackpopulatesRelationship]): The backpopulates relationships of the object.
         config (AppConfig): The configuration of the object.
+        indexes (list[CompositeIndex]): Indexes over several columns of the object table.
     """
 
     attributes: list[Attribute]
@@ -63,6 +244,8 @@ class AppObject(TemplateModel):
     back_populates_relationships: list[BackpopulatesRelationship] = []
     config: AppConfig = AppConfig()
     secure: bool = False
+    indexes: list[CompositeIndex] = []
+    _rel_index: RelationshipIndex = PrivateAttr(default_factory=RelationshipIndex)
 
     def __init__(
         self,
@@ -81,6 +264,28 @@ class AppObject(TemplateModel):
         """
         super().__init__(name=name, attributes=args, config=config, secure=secure)
 
+    def __eq__(self, other: object) -> bool:
+        # objects are nodes of the project graph identified by their name, comparing fields would walk the graph
+        if self is other:
+            return True
+        if not isinstance(other, AppObject):
+            return NotImplemented
+        return type(self) is type(other) and self.name == other.name
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__, self.name))
+
+    @field_serializer('back_populates_relationships')
+    def _serialize_back_populates(self, rels: list[BackpopulatesRelationship]) -> list[str]:
+        # they are dumped with the object that defines them, here they are referenced as object.relationship
+        return [get_relationship_reference(rel) for rel in rels]
+
+    def __repr_args__(self) -> Iterator[tuple[str | None, Any]]:
+        for key, value in super().__repr_args__():
+            if key == 'back_populates_relationships':
+                value = [get_relationship_reference(rel) for rel in value]
+            yield key, value
+
     def add_relationship(
         self,
         obj: AppObject,
@@ -88,6 +293,7 @@ class AppObject(TemplateModel):
         name: str,
         back_populates_name: str | None = None,
         optional: bool = False,
+        lazy: LoadStrategy | None = None,
     ) -> None:
         """
         Adds a relationship to the object.
@@ -97,11 +303,16 @@ class AppObject(TemplateModel):
             name (str): The name of the relationship.
             back_populates_name (str | None): The name of the backpopulates relationship on the related object.
             optional (bool): Whether the relationship is optional.
+            lazy (LoadStrategy | None): How the relationship and its back populated side are loaded, overrides
+                AppConfig.lazy on both sides.
         """
         # TODO: add validation to not have duplicated names in relationships and attributes
-        rel = create_relationship(name, obj, type, self, back_populates_name, optional)
+        rel = create_relationship(name, obj, type, self, back_populates_name, optional, lazy)
+        RelationshipIndex.version += 1
+        self._get_rel_index().relationships[id(rel)] = rel
         self.relationships.append(rel)
         if isinstance(rel, BackpopulatesRelationship):
+            rel.related_object._get_rel_index().back_populates_relationships[id(rel)] = rel
             rel.related_object.back_populates_relationships.append(rel)
 
     def add_one_to_one_rel(
@@ -110,6 +321,7 @@ class AppObject(TemplateModel):
         name: str,
         back_populates_name: str | None = None,
         optional: bool = False,
+        lazy: LoadStrategy | None = None,
     ) -> None:
         """
         Adds a one to one relationship to the object.
@@ -118,8 +330,10 @@ class AppObject(TemplateModel):
             name (str): The name of the relationship.
             back_populates_name (str | None): The name of the backpopulates relationship on the related object.
             optional (bool): Whether the relationship is optional.
+            lazy (LoadStrategy | None): How the relationship and its back populated side are loaded, overrides
+                AppConfig.lazy on both sides.
         """
-        self.add_relationship(obj, one_to_one, name, back_populates_name, optional)
+        self.add_relationship(obj, one_to_one, name, back_populates_name, optional, lazy)
 
     def add_one_to_many_rel(
         self,
@@ -127,6 +341,7 @@ class AppObject(TemplateModel):
         name: str,
         back_populates_name: str | None = None,
         optional: bool = False,
+        lazy: LoadStrategy | None = None,
     ) -> None:
         """
         Adds a one to many relationship to the object.
@@ -135,8 +350,10 @@ class AppObject(TemplateModel):
             name (str): The name of the relationship.
             back_populates_name (str | None): The name of the backpopulates relationship on the related object.
             optional (bool): Whether the relationship is optional.
+            lazy (LoadStrategy | None): How the relationship and its back populated side are loaded, overrides
+                AppConfig.lazy on both sides.
         """
-        self.add_relationship(obj, one_to_many, name, back_populates_name, optional)
+        self.add_relationship(obj, one_to_many, name, back_populates_name, optional, lazy)
 
     def add_many_to_one_rel(
         self,
@@ -144,6 +361,7 @@ class AppObject(TemplateModel):
         name: str,
         back_populates_name: str | None = None,
         optional: bool = False,
+        lazy: LoadStrategy | None = None,
     ) -> None:
         """
         Adds a many to one relationship to the object.
@@ -152,8 +370,10 @@ class AppObject(TemplateModel):
             name (str): The name of the relationship.
             back_populates_name (str | None): The name of the backpopulates relationship on the related object.
             optional (bool): Whether the relationship is optional.
+            lazy (LoadStrategy | None): How the relationship and its back populated side are loaded, overrides
+                AppConfig.lazy on both sides.
         """
-        self.add_relationship(obj, many_to_one, name, back_populates_name, optional)
+        self.add_relationship(obj, many_to_one, name, back_populates_name, optional, lazy)
 
     def add_many_to_many_rel(
         self,
@@ -161,6 +381,7 @@ class AppObject(TemplateModel):
         name: str,
         back_populates_name: str | None = None,
         optional: bool = False,
+        lazy: LoadStrategy | None = None,
     ) -> None:
         """
         Adds a many to many relationship to the object.
@@ -169,8 +390,10 @@ class AppObject(TemplateModel):
             name (str): The name of the relationship.
             back_populates_name (str | None): The name of the backpopulates relationship on the related object.
             optional (bool): Whether the relationship is optional.
+            lazy (LoadStrategy | None): How the relationship and its back populated side are loaded, overrides
+                AppConfig.lazy on both sides.
         """
-        self.add_relationship(obj, many_to_many, name, back_populates_name, optional)
+        self.add_relationship(obj, many_to_many, name, back_populates_name, optional, lazy)
 
     def add_attributes(self, *args: Attribute) -> None:
         """
@@ -181,6 +404,29 @@ class AppObject(TemplateModel):
         """
         self.attributes += args
 
+    def add_index(self, *columns: str, unique: bool = False, index_type: IndexType | None = None) -> None:
+        """
+        Adds an index over several columns of the object table.
+
+        Args:
+            *columns: Names of the attributes or foreign keys (relationship name with _id suffix) to index.
+            unique (bool): Whether the combination of the columns is unique.
+            index_type (IndexType | None): Index method used on PostgreSQL.
+
+        Raises:
+            AttributeError: If a column is not an attribute or foreign key of the object.
+            ValueError: If a unique index uses an index method other than btree.
+        """
+        check_unique_index(unique, index_type)
+        available = [att.name for att in self.attributes]
+        for rel in self.all_relationships:
+            if not self.is_relationship_many(rel):
+                available.append(f'{self.get_rel_name(rel)}_id')
+        for column in columns:
+            if column not in available:
+                raise AttributeError(f'Column {column} not found in object {self.name}!')
+        self.indexes.append(CompositeIndex(columns=list(columns), unique=unique, index_type=index_type))
+
     def is_relationship_self(self, rel: Relationship | BackpopulatesRelationship) -> bool:
         """
         Checks if the relationship is a self-relationship.
@@ -220,8 +466,7 @@ class AppObject(TemplateModel):
         Returns:
             bool: Whether the relationship is multiple.
         """
-        self._check_rel(relationship)
-        if relationship in self.relationships:
+        if self._check_rel(relationship).has_relationship(relationship):
             return relationship.relationship_type in (one_to_many, many_to_many)
         return relationship.relationship_type in (many_to_one, many_to_many)
 
@@ -234,8 +479,7 @@ class AppObject(TemplateModel):
         Returns:
             bool: Whether the relationship is multiple.
         """
-        self._check_rel(relationship)
-        return relationship in self.back_populates_relationships
+        return self._check_rel(relationship).has_back_populates_relationship(relationship)
 
     def get_rel_name(self, rel: Relationship | BackpopulatesRelationship) -> str:
         """
@@ -279,18 +523,47 @@ class AppObject(TemplateModel):
             return rel.back_populates_object
         return rel.related_object
 
-    def _check_rel(self, rel: Relationship | BackpopulatesRelationship) -> None:
+    def get_rel_lazy(self, rel: Relationship | BackpopulatesRelationship) -> LoadStrategy | None:
+        """
+        Gets the loading strategy of the relationship, falling back to the object configuration.
+
+        Args:
+            rel (Relationship | BackpopulatesRelationship): The relationship to get the strategy of.
+
+        Returns:
+            LoadStrategy | None: Loading strategy of the relationship.
+        """
+        return rel.lazy or self.config.lazy
+
+    def _check_rel(self, rel: Relationship | BackpopulatesRelationship) -> RelationshipIndex:
         """
         Checks if the relationship is associated with the object.
 
         Args:
             rel (Relationship | BackpopulatesRelationship): The relationship to check.
 
+        Returns:
+            RelationshipIndex: The relationship index of the object.
+
         Raises:
             AttributeError: If the relationship is not associated with the object.
         """
-        if rel not in (self.relationships + self.back_populates_relationships):
+        index = self._get_rel_index()
+        if not index.has_relationship(rel) and not index.has_back_populates_relationship(rel):
             raise AttributeError('Relationship not associated with object!')
+        return index
+
+    def _get_rel_index(self) -> RelationshipIndex:
+        """
+        Gets the relationship index, rebuilding it when the relationship lists changed outside of add_relationship.
+
+        Returns:
+            RelationshipIndex: The up to date index of the relationships.
+        """
+        # pydantic resolves private attributes in __getattr__, which is slow for a lookup made this often
+        index: RelationshipIndex = self.__pydantic_private__['_rel_index']  # type: ignore[index]
+        index.update(self.relationships, self.back_populates_relationships)
+        return index
 
     @property
     def all_relationships(self) -> list[Relationship | BackpopulatesRelationship]:
@@ -315,26 +588,18 @@ class AppObject(TemplateModel):
         Returns:
             str: The class name.
         """
-        splite_names = name.split('_')
-        name = ''.join([split_name.capitalize() for split_name in splite_names])
-        return name
+        return get_class_name(name)
 
     @property
-    def _plural(self) -> str:
+    def names(self) -> ObjectNames:
         """
-        Gets the plural name of the object.
+        Gets the names of the object, they are computed once and looked up on later calls.
 
         Returns:
-            str: The plural name of the object.
+            ObjectNames: The names of the object.
         """
-        if self.config.plural:
-            return self.config.plural
-        word = self.name
-        if re.search('[sxz]$', word) or re.search('[^aeioudgkprt]h$', word):
-            return re.sub('$', 'es', word)
-        if re.search('[^aeiou]y$', word):
-            return re.sub('y$', 'ies', word)
-        return word + 's'
+        c = self.config
+        return get_object_names(self.name, c.plural, c.class_name, c.table_name, c.route_name, c.plural_class_name)
 
     @property
     def plural_class_name(self) -> str:
@@ -344,10 +609,7 @@ class AppObject(TemplateModel):
         Returns:
             str: The plural class name of the object.
         """
-        if self.config.plural_class_name:
-            return self.config.plural_class_name
-        plural = self._plural
-        return self._class_name(plural)
+        return self.names.plural_class_name
 
     @property
     def class_name(self) -> str:
@@ -357,9 +619,7 @@ class AppObject(TemplateModel):
         Returns:
             str: The class name of the object.
         """
-        if self.config.class_name:
-            return self.config.class_name
-        return self._class_name(self.name)
+        return self.names.class_name
 
     @property
     def table_name(self) -> str:
@@ -369,11 +629,7 @@ class AppObject(TemplateModel):
         Returns:
             str: The table name of the object.
         """
-        if self.config.table_name:
-            return self.config.table_name
-        if self.config.plural:
-            return self.config.plural
-        return self._plural
+        return self.names.table_name
 
     @property
     def route_name(self) -> str:
@@ -383,11 +639,20 @@ class AppObject(TemplateModel):
         Returns:
             str: The route name of the object.
         """
-        if self.config.route_name:
-            return self.config.route_name
-        if self.config.plural:
-            return self.config.plural.replace('_', '-')
-        return self._plural.replace('_', '-')
+        return self.names.route_name
+
+
+def get_relationship_reference(rel: BackpopulatesRelationship) -> str:
+    """
+    Gets the reference of a backpopulates relationship used in dumps of its related object.
+
+    Args:
+        rel (BackpopulatesRelationship): The relationship.
+
+    Returns:
+        str: The name of the object that defines the relationship and the name of the relationship.
+    """
+    return f'{rel.back_populates_object.name}.{rel.name}'
 
 
 class AuthObject(AppObject):
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+from typing import Any
+
+from pydantic import field_serializer
+
 from .app_object import AppObject, AuthObject
 from .base import TemplateModel
 
@@ -35,3 +40,14 @@ class AppProject(TemplateModel):
                     raise Exception("App Object can't be secure without Authenication Object")
 
         super().__init__(name=name, app_objects=args, auth_object=auth_object)
+
+    @field_serializer('auth_object')
+    def _serialize_auth_object(self, auth_object: AuthObject | None) -> str | None:
+        # the auth object is one of the app objects, dumps reference it by name
+        return auth_object.name if auth_object else None
+
+    def __repr_args__(self) -> Iterator[tuple[str | None, Any]]:
+        for key, value in super().__repr_args__():
+            if key == 'auth_object' and value is not None:
+                value = value.name
+            yield key, value
@@ -3,7 +3,7 @@ from __future__ import annotations
 from collections.abc import Callable
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import EmailStr, validate_call
 
@@ -22,6 +22,8 @@ from .data_types import (
     timedelta_type,
 )
 
+IndexType = Literal['btree', 'hash', 'gin', 'gist', 'brin']
+
 
 class Attribute(TemplateModel):
     """
@@ -34,6 +36,8 @@ class Attribute(TemplateModel):
         unique: bool: Whether or not the attribute is unique. Defaults to False.
         optional: bool: Whether or not the attribute is optional. Defaults to False.
         validation: list[Callable[[Any],Any]]: Not implemented.
+        indexed: bool: Whether or not the attribute column is indexed. Defaults to False.
+        index_type: IndexType|None: Index method used on PostgreSQL, implies indexed. Defaults to None.
     """
 
     type: DataType
@@ -41,6 +45,8 @@ class Attribute(TemplateModel):
     unique: bool = False
     optional: bool = False
     validation: list[Callable[[Any], Any]] = []
+    indexed: bool = False
+    index_type: IndexType | None = None
 
     # TODO: add validation for type and default value
     def __init__(
@@ -51,6 +57,8 @@ class Attribute(TemplateModel):
         unique: bool = False,
         optional: bool = False,
         validation_rules: list[Callable[[Any], Any]] = [],
+        indexed: bool = False,
+        index_type: IndexType | None = None,
     ) -> None:
         """
         Initializes the attribute with the given arguments.
@@ -62,7 +70,13 @@ class Attribute(TemplateModel):
             unique: bool: Whether or not the attribute is unique. Defaults to False.
             optional: bool: Whether or not the attribute is optional. Defaults to False.
             validation_rules: list[Callable[[Any],Any]]: Not implemented.
+            indexed: bool: Whether or not the attribute column is indexed. Defaults to False.
+            index_type: IndexType|None: Index method used on PostgreSQL, implies indexed. Defaults to None.
+
+        Raises:
+            ValueError: If a unique attribute uses an index method other than btree.
         """
+        check_unique_index(unique, index_type)
         super().__init__(
             name=name,
             type=type,
@@ -70,81 +84,107 @@ class Attribute(TemplateModel):
             unique=unique,
             optional=optional,
             validation_rules=validation_rules,
+            indexed=indexed or index_type is not None,
+            index_type=index_type,
         )
 
 
+def check_unique_index(unique: bool, index_type: IndexType | None) -> None:
+    # PostgreSQL only builds unique indexes with the btree method
+    if unique and index_type not in (None, 'btree'):
+        raise ValueError(f'Unique indexes must use the btree index method, not {index_type}!')
+
+
 @validate_call
-def StringAttribute(name: str, default: str | None = None, unique: bool = False, optional: bool = False) -> Attribute:
+def StringAttribute(
+    name: str, default: str | None = None, unique: bool = False, optional: bool = False, indexed: bool = False
+) -> Attribute:
     """Creates string type attribute with DataType string_type"""
-    return Attribute(name, string_type, default, unique, optional)
+    return Attribute(name, string_type, default, unique, optional, indexed=indexed)
 
 
 @validate_call
-def IntAttribute(name: str, default: int | None = None, unique: bool = False, optional: bool = False) -> Attribute:
+def IntAttribute(
+    name: str, default: int | None = None, unique: bool = False, optional: bool = False, indexed: bool = False
+) -> Attribute:
     """Creates int type attribute with DataType int_type"""
-    return Attribute(name, int_type, default, unique, optional)
+    return Attribute(name, int_type, default, unique, optional, indexed=indexed)
 
 
 @validate_call
-def FloatAttribute(name: str, default: float | None = None, unique: bool = False, optional: bool = False) -> Attribute:
+def FloatAttribute(
+    name: str, default: float | None = None, unique: bool = False, optional: bool = False, indexed: bool = False
+) -> Attribute:
     """Creates float type attribute with DataType float_type"""
-    return Attribute(name, float_type, default, unique, optional)
+    return Attribute(name, float_type, default, unique, optional, indexed=indexed)
 
 
 @validate_call
 def DecimalAttribute(
-    name: str, default: Decimal | None = None, unique: bool = False, optional: bool = False
+    name: str, default: Decimal | None = None, unique: bool = False, optional: bool = False, indexed: bool = False
 ) -> Attribute:
     """Creates Decimal type attribute with DataType decimal_type"""
-    return Attribute(name, decimal_type, default, unique, optional)
+    return Attribute(name, decimal_type, default, unique, optional, indexed=indexed)
 
 
 @validate_call
-def BoolAttribute(name: str, default: bool | None = None, unique: bool = False, optional: bool = False) -> Attribute:
+def BoolAttribute(
+    name: str, default: bool | None = None, unique: bool = False, optional: bool = False, indexed: bool = False
+) -> Attribute:
     """Creates bool type attribute with DataType bool_type"""
-    return Attribute(name, bool_type, default, unique, optional)
+    return Attribute(name, bool_type, default, unique, optional, indexed=indexed)
 
 
 @validate_call
-def DateAttribute(name: str, default: date | None = None, unique: bool = False, optional: bool = False) -> Attribute:
+def DateAttribute(
+    name: str, default: date | None = None, unique: bool = False, optional: bool = False, indexed: bool = False
+) -> Attribute:
     """Creates date type attribute with DataType date_only_type"""
-    return Attribute(name, date_only_type, default, unique, optional)
+    return Attribute(name, date_only_type, default, unique, optional, indexed=indexed)
 
 
 @validate_call
 def DateTimeAttribute(
-    name: str, default: datetime | None = None, unique: bool = False, optional: bool = False
+    name: str, default: datetime | None = None, unique: bool = False, optional: bool = False, indexed: bool = False
 ) -> Attribute:
     """Creates datetime type attribute with DataType date_time_type"""
-    return Attribute(name, date_time_type, default, unique, optional)
+    return Attribute(name, date_time_type, default, unique, optional, indexed=indexed)
 
 
 @validate_call
-def TimeAttribute(name: str, default: time | None = None, unique: bool = False, optional: bool = False) -> Attribute:
+def TimeAttribute(
+    name: str, default: time | None = None, unique: bool = False, optional: bool = False, indexed: bool = False
+) -> Attribute:
     """Creates time type attribute with DataType time_type"""
-    return Attribute(name, time_type, default, unique, optional)
+    return Attribute(name, time_type, default, unique, optional, indexed=indexed)
 
 
 @validate_call
 def TimeDeltaAttribute(
-    name: str, default: timedelta | None = None, unique: bool = False, optional: bool = False
+    name: str, default: timedelta | None = None, unique: bool = False, optional: bool = False, indexed: bool = False
 ) -> Attribute:
     """Creates timedelata type attribute with DataType timedelta_type"""
-    return Attribute(name, timedelta_type, default, unique, optional)
+    return Attribute(name, timedelta_type, default, unique, optional, indexed=indexed)
 
 
 @validate_call
 def EmailAttribute(
-    name: str = 'email', default: EmailStr | None = None, unique: bool = True, optional: bool = False
+    name: str = 'email',
+    default: EmailStr | None = None,
+    unique: bool = True,
+    optional: bool = False,
+    indexed: bool = False,
 ) -> Attribute:
     """Creates email type attribute with DataType email_type. Default attribute name is email and it is set as unique"""
-    return Attribute(name, email_type, default, unique, optional)
+    return Attribute(name, email_type, default, unique, optional, indexed=indexed)
 
 
 @validate_call
-def NameAttribute(default: str | None = None, unique: bool = False, optional: bool = False) -> Attribute:
+def NameAttribute(
+    default: str | None = None, unique: bool = False, optional: bool = False, indexed: bool = False
+) -> Attribute:
     """Creates string type attribute with DataType string_type. Default attribute name is name"""
-    return Attribute('name', string_type, default, unique, optional)
+    return Attribute('name', string_type, default, unique, optional, indexed=indexed)
 
 
 def UsernameAttribute() -> Attribute:
@@ -154,6 +194,8 @@ def UsernameAttribute() -> Attribute:
 
 
 @validate_call
-def DescriptionAttribute(default: str | None = None, unique: bool = False, optional: bool = False) -> Attribute:
+def DescriptionAttribute(
+    default: str | None = None, unique: bool = False, optional: bool = False, indexed: bool = False
+) -> Attribute:
     """Creates string type attribute with DataType string_type. Default attribute name is description."""
-    return Attribute('description', string_type, default, unique, optional)
+    return Attribute('description', string_type, default, unique, optional, indexed=indexed)
@@ -0,0 +1,117 @@
+"""
+Command line interface of warp_fastapi.
+
+The CLI runs in pre-commit hooks and CI on every change, so this module only imports argparse and the standard
+library. Project files, the pydantic models and the code generators are imported by the commands that need them.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .create_project import ProjectCreator
+    from .output import OutputSink
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'bench':
+        return run_bench(parser, args.args)
+    if args.command == 'diff':
+        return run_diff(args)
+    return run_generate(args)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='warp-fastapi', description='Generate FastAPI projects in warp speed.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    new = commands.add_parser('new', help='generate a project from a project file')
+    update = commands.add_parser('update', help='regenerate the changed files of a generated project')
+    diff = commands.add_parser('diff', help='show the changes update would make to a generated project')
+    for command in (new, update, diff):
+        command.add_argument('project_file', type=Path, help='YAML or JSON project file')
+        command.add_argument('-o', '--output', type=Path, default=Path('.'), help='folder of the generated project')
+        command.add_argument('--async', dest='async_mode', action='store_true', help='generate an async project')
+        command.add_argument('--orjson', action='store_true', help='serialize responses with orjson and pydantic')
+        command.add_argument('--structure', choices=['default', 'clean'], default='default')
+        command.add_argument('--deployment', choices=['local', 'Docker', 'production'], default='local')
+        command.add_argument('--workers', type=int, default=1, help='processes that render the modules')
+        command.add_argument('--no-cache', action='store_true', help="don't cache the loaded project file")
+    for command in (new, update):
+        command.add_argument('--no-fsync', action='store_true', help="don't sync the written files to the disk")
+    bench = commands.add_parser('bench', help='run the generator benchmarks of a source checkout')
+    bench.add_argument('args', nargs=argparse.REMAINDER, help='arguments of benchmarks.generation')
+    return parser
+
+
+def get_creator(args: argparse.Namespace, output: Path, sink: OutputSink | None = None) -> ProjectCreator:
+    from .config import StructureConfig, clean_arch_config
+    from .create_project import ProjectCreator
+    from .project_file import load_project
+
+    project = load_project(args.project_file, use_cache=not args.no_cache)
+    config = copy.copy(clean_arch_config) if args.structure == 'clean' else StructureConfig()
+    config.update_config(async_mode=args.async_mode, orjson_mode=args.orjson)
+    return ProjectCreator(
+        project, str(output), config=config, deployment=args.deployment, workers=args.workers, sink=sink
+    )
+
+
+def run_generate(args: argparse.Namespace) -> int:
+    from .output import StagedDiskSink
+
+    creator = get_creator(args, args.output)
+    # the files are moved into the project once all of them are generated, a failed run changes nothing
+    creator.sink = StagedDiskSink(creator.project_dir, fsync=not args.no_fsync)
+    if args.command == 'new':
+        creator.create_project()
+    else:
+        creator.update_project()
+    print(f'Project generated in {creator.project_dir}')
+    return 0
+
+
+def run_diff(args: argparse.Namespace) -> int:
+    import difflib
+
+    from .create_project import MANIFEST_FILENAME
+    from .output import MemorySink
+
+    # the project is generated in memory and compared with the files of the generated project
+    sink = MemorySink()
+    creator = get_creator(args, args.output, sink)
+    creator.create_project()
+    changed = 0
+    for name, text in sorted(sink.files.items()):
+        if name == MANIFEST_FILENAME:
+            continue
+        old_file = creator.project_dir / name
+        new_lines = text.splitlines(keepends=True)
+        if not old_file.is_file():
+            print(f'--- /dev/null\n+++ b/{name}')
+            sys.stdout.writelines(f'+{line}' for line in new_lines)
+        else:
+            old_lines = old_file.read_text().splitlines(keepends=True)
+            if old_lines == new_lines:
+                continue
+            sys.stdout.writelines(difflib.unified_diff(old_lines, new_lines, f'a/{name}', f'b/{name}'))
+        changed += 1
+    return 1 if changed else 0
+
+
+def run_bench(parser: argparse.ArgumentParser, argv: list[str]) -> int:
+    try:
+        from benchmarks.generation import main as bench_main
+    except ModuleNotFoundError:
+        parser.error('bench runs from the root of a warp_fastapi source checkout')
+    return bench_main(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
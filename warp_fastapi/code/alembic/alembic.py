@@ -152,11 +152,16 @@ def get_alembic_readme() -> str:
 
 def get_alembic_env_code(config: StructureConfig) -> str:
     base_module = config.get_module_for_alembic(config.get_base_path())
+    engine_import = 'from sqlalchemy import engine_from_config'
+    online_code = _get_online_migrations_code()
+    if config.async_mode:
+        engine_import = 'import asyncio\nfrom sqlalchemy.ext.asyncio import async_engine_from_config'
+        online_code = _get_async_online_migrations_code()
     return f"""import os
 from logging.config import fileConfig
 from dotenv import load_dotenv
 
-from sqlalchemy import engine_from_config
+{engine_import}
 from sqlalchemy import pool
 
 from alembic import context
@@ -214,7 +219,17 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
-def run_migrations_online() -> None:
+{online_code}
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
+"""
+
+
+def _get_online_migrations_code() -> str:
+    return """def run_migrations_online() -> None:
     '''Run migrations in 'online' mode.
 
     In this scenario we need to create an Engine
@@ -222,7 +237,7 @@ def run_migrations_online() -> None:
 
     '''
     connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {{}}),
+        config.get_section(config.config_ini_section, {}),
         prefix='sqlalchemy.',
         poolclass=pool.NullPool,
     )
@@ -234,10 +249,35 @@ def run_migrations_online() -> None:
 
         with context.begin_transaction():
             context.run_migrations()
+"""
 
 
-if context.is_offline_mode():
-    run_migrations_offline()
-else:
-    run_migrations_online()
+def _get_async_online_migrations_code() -> str:
+    return """def do_run_migrations(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    '''In this scenario we need to create an async Engine
+    and associate a connection with the context.
+
+    '''
+    connectable = async_engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix='sqlalchemy.',
+        poolclass=pool.NullPool,
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    '''Run migrations in 'online' mode.'''
+    asyncio.run(run_async_migrations())
 """
@@ -1,9 +1,49 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from io import StringIO
+from typing import Any, TextIO
 
 from ... import AppObject
 from ...config import StructureConfig
-from ..utils import ident_text
+
+
+class CodeWriter:
+    """
+    Writes code line by line to a text stream, keeping the indentation level as state.
+
+    Empty lines are only written at module level, indented blocks never contain them.
+    """
+
+    indentation = '    '
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream if stream is not None else StringIO()
+        self.level = 0
+
+    def line(self, text: str = '') -> None:
+        if text:
+            self.stream.write(self.indentation * self.level + text + '\n')
+        elif self.level == 0:
+            self.stream.write('\n')
+
+    def lines(self, text: str) -> None:
+        for line in text.split('\n'):
+            self.line(line)
+
+    @contextmanager
+    def indent(self) -> Iterator[None]:
+        self.level += 1
+        try:
+            yield
+        finally:
+            self.level -= 1
+
+
+def render_to_string(render: Callable[[CodeWriter], None]) -> str:
+    stream = StringIO()
+    render(CodeWriter(stream))
+    return stream.getvalue()
 
 
 class AbstractVariableCode(ABC):
@@ -26,6 +66,9 @@ class AbstractVariableCode(ABC):
     def __repr__(self) -> str:
         return self.__str__()  # pragma: no cover
 
+    def render(self, writer: CodeWriter) -> None:
+        writer.lines(str(self))
+
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, AbstractVariableCode):
             return str(AbstractVariableCode) == str(AbstractVariableCode)
@@ -82,28 +125,24 @@ class AbstractFunctionCode(ABC):
     parametars: list[AbstractVariableCode] = []
     return_value: str | None = None
     decorators: list[AbstractDecoratorCode] = []
+    is_async: bool = False
 
     @abstractmethod
     def __init__(self, **kwargs: dict[str, Any]):
         pass  # pragma: no cover
 
     def __str__(self) -> str:
-        func_name = self.name
-        params = ''
-        return_val = ''
-        decorators = ''
-        if self.parametars:
-            params = ', '.join([str(param) for param in self.parametars])
-        if self.return_value:
-            return_val = f' -> {self.return_value}'
-        if self.decorators:
-            decorators = '\n'.join([str(decorator) for decorator in self.decorators])
-        return f"""{decorators}
-def {func_name}({params}){return_val}:
-{ident_text(self.content, 1)}
-""".strip(
-            '\n'
-        )
+        return render_to_string(self.render).strip('\n')
+
+    def render(self, writer: CodeWriter) -> None:
+        func_def = 'async def' if self.is_async else 'def'
+        params = ', '.join([str(param) for param in self.parametars])
+        return_val = f' -> {self.return_value}' if self.return_value else ''
+        for decorator in self.decorators:
+            writer.lines(str(decorator))
+        writer.line(f'{func_def} {self.name}({params}){return_val}:')
+        with writer.indent():
+            writer.lines(self.content)
 
 
 class SimpleFunctionCode(AbstractFunctionCode):
@@ -114,12 +153,14 @@ class SimpleFunctionCode(AbstractFunctionCode):
         parametars: list[AbstractVariableCode] = [],
         return_value: str | None = None,
         decorators: list[AbstractDecoratorCode] = [],
+        is_async: bool = False,
     ):
         self.name = name
         self.content = content
         self.parametars = parametars
         self.return_value = return_value
         self.decorators = decorators
+        self.is_async = is_async
 
 
 class AbstractClassCode(ABC):
@@ -133,19 +174,29 @@ class AbstractClassCode(ABC):
         pass  # pragma: no cover
 
     def __str__(self) -> str:
+        return render_to_string(self.render).strip('\n')
+
+    def render(self, writer: CodeWriter) -> None:
         class_def = f'class {self.class_name}'
         if self.super_class_name:
             class_def += f'({self.super_class_name})'
-        attributes = '\n'.join([str(att) for att in self.attributes])
-        methods = '\n'.join([str(meth) for meth in self.methods])
-
-        return f"""{class_def}:
-{ident_text("pass",1) if not self.attributes and not self.methods else ""}
-{ident_text(attributes,1)}
-{ident_text(methods,1)}
-""".strip(
-            '\n'
-        )
+        writer.line(f'{class_def}:')
+        if not self.attributes and not self.methods:
+            with writer.indent():
+                writer.line('pass')
+            return
+        writer.line()
+        if self.attributes:
+            with writer.indent():
+                for att in self.attributes:
+                    att.render(writer)
+        else:
+            writer.line()
+        if self.methods:
+            writer.line()
+            with writer.indent():
+                for meth in self.methods:
+                    meth.render(writer)
 
 
 class SimpleClassCode(AbstractClassCode):
@@ -176,46 +227,75 @@ class AbstractModuleCode(ABC):
     def __init__(self, **kwargs: dict[str, Any]):
         pass  # pragma: no cover
 
-    @abstractmethod
     def __str__(self) -> str:
+        return render_to_string(self.render)
+
+    @abstractmethod
+    def render(self, writer: CodeWriter) -> None:
         pass  # pragma: no cover
 
-    @property
-    def imports_code(self) -> str:
-        res: list[str] = []
+    # every part is written as its own block of lines, an empty part leaves a single empty line
+
+    def render_imports(self, writer: CodeWriter) -> None:
         for module, classes in self.imports.items():
             if classes:
-                res.append(f"from {module} import {', '.join(sorted(classes))}")
+                writer.line(f"from {module} import {', '.join(sorted(classes))}")
             else:
-                res.append(f'import {module}')
-        return '\n'.join(res)
+                writer.line(f'import {module}')
+        if not self.imports:
+            writer.line()
+
+    def render_variables(self, writer: CodeWriter) -> None:
+        self._render_parts(writer, self.variables)
+
+    def render_classes(self, writer: CodeWriter) -> None:
+        self._render_parts(writer, self.classes)
+
+    def render_functions(self, writer: CodeWriter) -> None:
+        self._render_parts(writer, self.functions)
+
+    def render_type_checking_imports(self, writer: CodeWriter) -> None:
+        writer.line()
+        if not self.type_checking_imports:
+            return  # pragma: no cover
+        writer.line('if TYPE_CHECKING:')
+        with writer.indent():
+            for module, classes in self.type_checking_imports.items():
+                writer.line(f"from {module} import {', '.join(sorted(classes))}")
+        writer.line()
+        writer.line()
+
+    def _render_parts(
+        self,
+        writer: CodeWriter,
+        parts: list[AbstractVariableCode] | list[AbstractClassCode] | list[AbstractFunctionCode],
+    ) -> None:
+        for part in parts:
+            part.render(writer)
+        if not parts:
+            writer.line()
+
+    @property
+    def imports_code(self) -> str:
+        return render_to_string(self.render_imports)[:-1]
 
     @property
     def variables_code(self) -> str:
-        return '\n'.join([str(var) for var in self.variables])
+        return render_to_string(self.render_variables)[:-1]
 
     @property
     def classes_code(self) -> str:
-        return '\n'.join([str(_class) for _class in self.classes])
+        return render_to_string(self.render_classes)[:-1]
 
     @property
     def functions_code(self) -> str:
-        return '\n'.join([str(func) for func in self.functions])
+        return render_to_string(self.render_functions)[:-1]
 
     @property
     def type_checking_imports_code(self) -> str:
         if not self.type_checking_imports:
             return ''  # pragma: no cover
-        imports = '\n'.join(
-            [
-                f"from {module} import {', '.join(sorted(classes))}"
-                for module, classes in self.type_checking_imports.items()
-            ]
-        )
-        return f"""
-if TYPE_CHECKING:
-{ident_text(imports,1)}
-"""
+        return render_to_string(self.render_type_checking_imports)[:-1]
 
 
 class SimpleModuleCode(AbstractModuleCode):
@@ -226,3 +306,7 @@ class SimpleModuleCode(AbstractModuleCode):
     @abstractmethod
     def __str__(self) -> str:
         pass  # pragma: no cover
+
+    def render(self, writer: CodeWriter) -> None:
+        # simple modules are small templates, they are written as a whole
+        writer.lines(str(self))
@@ -0,0 +1,231 @@
+from ... import AppObject, AuthObject
+from ...app_object import RelationshipIndex
+from ...config import StructureConfig
+from ...relationships import many_to_many, one_to_one
+from .base import SimpleModuleCode
+from .model import RelationshipCode
+
+
+class CacheModuleCode(SimpleModuleCode):
+    def __init__(self, config: StructureConfig):
+        self.folder = config.get_cache_folder()
+        self.filename = config.get_cache_filename()
+        self.settings_module = config.get_module_for_cache(config.get_settings_path())
+        self.redis_module = 'redis.asyncio' if config.async_mode else 'redis'
+        self.async_def = 'async def' if config.async_mode else 'def'
+        self.await_ = 'await ' if config.async_mode else ''
+
+    def __str__(self) -> str:
+        a, w = self.async_def, self.await_
+        return f"""
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Protocol, Sequence, cast
+from uuid import uuid4
+from pydantic import TypeAdapter
+from {self.settings_module} import settings
+
+
+class CacheBackend(Protocol):
+    {a} get(self, name: str) -> Any: ...
+
+    {a} set(self, name: str, value: Any, ex: int | None = None) -> Any: ...
+
+    {a} delete(self, *names: str) -> Any: ...
+
+
+class MemoryCache:
+    # in-process LRU with TTL, implements the part of the Redis client API used by ResponseCache
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._data: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        # sync handlers run in the threadpool, reordering and evicting entries must not interleave
+        self._lock = Lock()
+
+    {a} get(self, name: str) -> Any:
+        with self._lock:
+            item = self._data.get(name)
+            if item is None:
+                return None
+            expires, value = item
+            if expires is not None and expires <= monotonic():
+                del self._data[name]
+                return None
+            self._data.move_to_end(name)
+            return value
+
+    {a} set(self, name: str, value: Any, ex: int | None = None) -> bool:
+        with self._lock:
+            self._data[name] = (monotonic() + ex if ex else None, value)
+            self._data.move_to_end(name)
+            if len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+            return True
+
+    {a} delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: int, related: Sequence[str] = ()):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.related = related
+
+    {a} get(self, kind: str, key: Any, adapter: TypeAdapter[Any]) -> Any:
+        name = {w}self._key(kind, key)
+        raw = {w}self.backend.get(name)
+        if raw is None:
+            return None
+        return adapter.validate_json(raw)
+
+    {a} set(self, kind: str, key: Any, value: Any, adapter: TypeAdapter[Any]) -> Any:
+        value = adapter.validate_python(value, from_attributes=True)
+        name = {w}self._key(kind, key)
+        {w}self.backend.set(name, adapter.dump_json(value), ex=self.ttl)
+        return value
+
+    {a} invalidate(self, *ids: int) -> None:
+        # any list of this object and anything cached for related objects can contain the changed rows
+        names = [f"{{self.namespace}}:lists"]
+        for id in ids:
+            names.append({w}self._key("items", id))
+        for namespace in self.related:
+            names += [f"{{namespace}}:items", f"{{namespace}}:lists"]
+        {w}self.backend.delete(*names)
+
+    {a} _key(self, kind: str, key: Any) -> str:
+        # keys embed the generation of their kind, so deleting the generation drops all of them at once
+        generation_key = f"{{self.namespace}}:{{kind}}"
+        generation = {w}self.backend.get(generation_key)
+        if generation is None:
+            generation = uuid4().hex
+            {w}self.backend.set(generation_key, generation)
+        if isinstance(generation, bytes):
+            generation = generation.decode()
+        return f"{{generation_key}}:{{generation}}:{{key}}"
+
+
+def create_backend() -> CacheBackend:
+    if settings.CACHE_URL:
+        # redis is only needed when a cache server is configured
+        from {self.redis_module} import Redis  # type: ignore
+
+        return cast(CacheBackend, Redis.from_url(settings.CACHE_URL))
+    return MemoryCache(settings.CACHE_MAX_SIZE)
+
+
+backend = create_backend()
+
+
+def get_cache() -> CacheBackend:
+    return backend
+"""
+
+
+def is_cached(app_obj: AppObject) -> bool:
+    # authentication reads the password hash from the model, so auth objects are never served from the cache
+    return app_obj.config.cache is not None and not isinstance(app_obj, AuthObject)
+
+
+class GraphMemo:
+    """
+    Values the services derive from the relationship graph, every service method of an object asks for them.
+
+    Entries are keyed by object identity and hold their object, so its id isn't reused while the entry exists. They
+    are dropped together whenever a relationship of any object changes.
+    """
+
+    def __init__(self) -> None:
+        self.version = -1
+        self.namespaces: dict[int, tuple[AppObject, list[str]]] = {}
+        self.edges: dict[int, tuple[AppObject, list[tuple[AppObject, bool]]]] = {}
+
+    def get_namespaces(self, app_obj: AppObject) -> list[str] | None:
+        if self.version != RelationshipIndex.version:
+            self.namespaces.clear()
+            self.edges.clear()
+            self.version = RelationshipIndex.version
+        entry = self.namespaces.get(id(app_obj))
+        return entry[1] if entry and entry[0] is app_obj else None
+
+    def get_edges(self, app_obj: AppObject) -> list[tuple[AppObject, bool]]:
+        entry = self.edges.get(id(app_obj))
+        if entry and entry[0] is app_obj:
+            return entry[1]
+        edges: list[tuple[AppObject, bool]] = []
+        for rel in app_obj.all_relationships:
+            cascades = RelationshipCode.needs_cascade(rel, app_obj)
+            if rel.relationship_type == many_to_many and app_obj.is_rel_backref(rel):
+                cascades = False
+            edges.append((app_obj.get_rel_obj(rel), cascades))
+        self.edges[id(app_obj)] = (app_obj, edges)
+        return edges
+
+    def set_namespaces(self, app_obj: AppObject, namespaces: list[str]) -> list[str]:
+        self.namespaces[id(app_obj)] = (app_obj, namespaces)
+        return namespaces
+
+
+graph_memo = GraphMemo()
+
+
+def get_related_namespaces(app_obj: AppObject) -> list[str]:
+    namespaces = graph_memo.get_namespaces(app_obj)
+    if namespaces is not None:
+        return namespaces
+    connected = get_connected_objects(app_obj)
+    if not any(is_cached(obj) for obj in connected):
+        # nothing the object can reach is cached, which is the same for every object it reaches
+        for obj in connected:
+            graph_memo.set_namespaces(obj, [])
+        return []
+    return graph_memo.set_namespaces(app_obj, find_related_namespaces(app_obj))
+
+
+def get_connected_objects(app_obj: AppObject) -> list[AppObject]:
+    objects = [app_obj]
+    seen = {id(app_obj)}
+    for obj in objects:
+        related = [rel.related_object for rel in obj.relationships]
+        related += [rel.back_populates_object for rel in obj.back_populates_relationships]
+        for rel_obj in related:
+            if id(rel_obj) not in seen:
+                seen.add(id(rel_obj))
+                objects.append(rel_obj)
+    return objects
+
+
+def find_related_namespaces(app_obj: AppObject) -> list[str]:
+    # writes change the relationship ids of neighbours, deletes also remove the rows they cascade to
+    deleted = [app_obj]
+    deleted_names = {app_obj.name}
+    namespaces: list[str] = []
+    for obj in deleted:
+        for rel_obj, cascades in graph_memo.get_edges(obj):
+            back_to_origin = rel_obj.name == app_obj.name and obj is not app_obj
+            if is_cached(rel_obj) and rel_obj.name not in namespaces and not back_to_origin:
+                namespaces.append(rel_obj.name)
+            if cascades and rel_obj.name not in deleted_names:
+                deleted_names.add(rel_obj.name)
+                deleted.append(rel_obj)
+    if is_cached(app_obj) and app_obj.name not in namespaces and takes_over_rows(app_obj):
+        # the cached item of the previous owner still lists the rows a write moved away from it
+        namespaces.append(app_obj.name)
+    return namespaces
+
+
+def takes_over_rows(app_obj: AppObject) -> bool:
+    # the related rows reference a single owner, assigning them to this object removes them from another one
+    return any(
+        rel.relationship_type == one_to_one
+        or (rel.relationship_type != many_to_many and app_obj.is_relationship_many(rel))
+        for rel in app_obj.all_relationships
+    )
+
+
+def uses_cache(app_obj: AppObject) -> bool:
+    return is_cached(app_obj) or bool(get_related_namespaces(app_obj))
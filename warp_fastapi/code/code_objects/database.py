@@ -8,21 +8,117 @@ class DatabaseModuleCode(SimpleModuleCode):
         self.folder = config.get_database_folder()
         self.filename = config.get_database_filename()
         self.settings_module = config.get_module_for_database(config.get_settings_path())
+        self.async_mode = config.async_mode
 
     def __str__(self) -> str:
-        return f"""from sqlalchemy import create_engine
+        if self.async_mode:
+            return self._async_code()
+        return f"""from typing import Any
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, mapped_column, Mapped
+from sqlalchemy.pool import QueuePool, StaticPool
 from {self.settings_module} import settings
 
 SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_engine_options(database_url: str) -> dict[str, Any]:
+    url = make_url(database_url)
+    connect_args: dict[str, Any] = {{}}
+    options: dict[str, Any] = {{"connect_args": connect_args}}
+    if url.get_backend_name() == "sqlite":
+        # sqlite connections are shared between request threads, in-memory databases need a single connection
+        connect_args["check_same_thread"] = False
+        if url.database in (None, "", ":memory:"):
+            options["poolclass"] = StaticPool
+        return options
+{self._pool_options_code()}
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        connect_args["options"] = f"-c statement_timeout={{settings.DB_STATEMENT_TIMEOUT_MS}}"
+    return options
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **get_engine_options(SQLALCHEMY_DATABASE_URL))
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+{self._pool_metrics_code('engine')}
+
+class Base(DeclarativeBase):
+    id: Mapped[int] = mapped_column(primary_key=True)
+"""
+
+    def _async_code(self) -> str:
+        return f"""from typing import Any
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, mapped_column, Mapped
+from sqlalchemy.pool import QueuePool, StaticPool
+from {self.settings_module} import settings
+
+SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URL
+
+
+def get_engine_options(database_url: str) -> dict[str, Any]:
+    url = make_url(database_url)
+    connect_args: dict[str, Any] = {{}}
+    options: dict[str, Any] = {{"connect_args": connect_args}}
+    if url.get_backend_name() == "sqlite":
+        # in-memory databases need a single connection
+        if url.database in (None, "", ":memory:"):
+            options["poolclass"] = StaticPool
+        return options
+{self._pool_options_code()}
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        connect_args["server_settings"] = {{"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+    return options
+
+
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, **get_engine_options(SQLALCHEMY_DATABASE_URL))
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+{self._pool_metrics_code('engine.sync_engine')}
 
 class Base(DeclarativeBase):
     id: Mapped[int] = mapped_column(primary_key=True)
 """
 
+    def _pool_options_code(self) -> str:
+        return """    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )"""
+
+    def _pool_metrics_code(self, sync_engine: str) -> str:
+        return f"""pool_events = {{"checkouts": 0, "invalidations": 0}}
+
+
+@event.listens_for({sync_engine}, "checkout")
+def count_checkout(*args: Any) -> None:
+    pool_events["checkouts"] += 1
+
+
+@event.listens_for({sync_engine}, "invalidate")
+def count_invalidation(*args: Any) -> None:
+    pool_events["invalidations"] += 1
+
+
+def get_pool_metrics() -> dict[str, int]:
+    metrics = dict(pool_events)
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        # overflow is negative while the pool has not opened all of its connections yet
+        metrics.update(
+            pool_size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    return metrics
+"""
+
 
 class BaseModuleCode(SimpleModuleCode):
     def __init__(self, objects: list[AppObject], config: StructureConfig):
@@ -8,7 +8,8 @@ class DependanciesModuleCode(SimpleModuleCode):
         self.folder = config.get_dependency_folder()
         self.filename = config.get_dependency_filename()
         self.db_module = config.get_module_for_dependency(config.get_database_path())
-        self.auth_code = self._get_auth_code(auth_obj)
+        self.async_mode = config.async_mode
+        self.auth_code = self._get_auth_code(auth_obj, config)
         self.security_import_string = self._get_sec_import_string(auth_obj, config)
 
     def __str__(self) -> str:
@@ -17,22 +18,36 @@ from typing import Any
 from {self.db_module} import SessionLocal
 {self.security_import_string}
 
+{self.get_db_code}
 
+{self.auth_code}
+"""
+
+    @property
+    def get_db_code(self) -> str:
+        if self.async_mode:
+            return """
+async def get_db():
+    async with SessionLocal() as db:
+        yield db
+"""
+        return """
 def get_db():
     try:
         db = SessionLocal()
         yield db
     finally:
         db.close()
-
-{self.auth_code}
 """
 
     @staticmethod
-    def _get_auth_code(auth_obj: AuthObject | None) -> str:
+    def _get_auth_code(auth_obj: AuthObject | None, config: StructureConfig) -> str:
         if not auth_obj:
             return ''
         serv_func = f'get_{auth_obj.name}_service'
+        async_def = 'async def' if config.async_mode else 'def'
+        await_ = 'await ' if config.async_mode else ''
+        session_class = config.get_session_classname()
         return f"""
 oauth2 = OAuth2PasswordBearer(tokenUrl="/api/v1/login")
 
@@ -45,12 +60,12 @@ def get_token_data(token: str = Depends(oauth2)):
         raise HTTPException(status_code=403, detail="Could not validate credentials")
     return token_data
 
-def get_current_user(
+{async_def} get_current_user(
     token: TokenPayload = Depends(get_token_data),
-    db: Session = Depends(get_db),
+    db: {session_class} = Depends(get_db),
 ):
     {auth_obj.name}_service = {serv_func}(db)
-    {auth_obj.name} = {auth_obj.name}_service.get_{auth_obj.name}(id=token.{auth_obj.name}_id)
+    {auth_obj.name} = {await_}{auth_obj.name}_service.get_{auth_obj.name}(id=token.{auth_obj.name}_id)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -66,13 +81,15 @@ def get_current_user(
         service_module = config.get_module_for_dependency(config.get_service_path(auth_obj))
         schema_module = config.get_module_for_dependency(config.get_common_schema_path())
         service_func = f'get_{auth_obj.name}_service'
+        session_module = config.get_session_module()
+        session_class = config.get_session_classname()
         return f"""
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException
 from jose import jwt
 from jose.exceptions import JWTError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from {session_module} import {session_class}
 from {settings_module} import settings
 from {schema_module} import TokenPayload
 
@@ -11,14 +11,21 @@ class MainModuleCode(SimpleModuleCode):
         self.filename = 'main'
         self.settings_module = config.get_module_for_main(config.get_settings_path())
         self.main_route_module = config.get_module_for_main(config.get_main_route_path())
+        self.database_module = config.get_module_for_main(config.get_database_path())
+        self.response_import = ''
+        self.response_class = ''
+        if config.orjson_mode:
+            self.response_import = '\nfrom fastapi.responses import ORJSONResponse'
+            self.response_class = ', default_response_class=ORJSONResponse'
 
     def __str__(self) -> str:
-        return f"""from fastapi import FastAPI
+        return f"""from fastapi import FastAPI{self.response_import}
 from starlette.middleware.cors import CORSMiddleware
 from {self.main_route_module} import router
+from {self.database_module} import get_pool_metrics
 from {self.settings_module} import settings
 
-app = FastAPI(title=settings.PROJECT_NAME)
+app = FastAPI(title=settings.PROJECT_NAME{self.response_class})
 
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -30,4 +37,14 @@ if settings.BACKEND_CORS_ORIGINS:
     )
 
 app.include_router(router, prefix=settings.API_V1_STRING)
+
+
+@app.get("/health", tags=["metrics"])
+def health() -> dict[str, str]:
+    return {{"status": "ok"}}
+
+
+@app.get("/metrics/db-pool", tags=["metrics"])
+def db_pool_metrics() -> dict[str, int]:
+    return get_pool_metrics()
 """
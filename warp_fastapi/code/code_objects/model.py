@@ -1,11 +1,12 @@
 from ... import AppObject, Attribute
 from ...config import StructureConfig
-from ...relationships import BackpopulatesRelationship, Relationship, many_to_many, one_to_one
+from ...relationships import BackpopulatesRelationship, LoadStrategy, Relationship, many_to_many, one_to_one
 from .base import (
     AbstractClassCode,
     AbstractFunctionCode,
     AbstractModuleCode,
     AbstractVariableCode,
+    CodeWriter,
     SimpleDecoratorCode,
     SimpleVariable,
 )
@@ -21,15 +22,19 @@ class AttributeCode(AbstractVariableCode):
         self.value = (
             f"mapped_column({att.type.db_type}"
             f"{', default=' + str(def_val) if def_val is not None else ''}"
-            f"{', unique=True' if att.unique else ''}"
-            f"{', nullable=True' if att.optional else ''})"
+            f"{', unique=True' if att.unique and not att.index_type else ''}"
+            f"{', nullable=True' if att.optional else ''}"
+            f"{', index=True' if att.indexed and not att.unique and not att.index_type else ''})"
         )
 
 
 class RelationshipCode(AbstractVariableCode):
-    def __init__(self, rel: Relationship | BackpopulatesRelationship, app_obj: AppObject) -> None:
+    def __init__(
+        self, rel: Relationship | BackpopulatesRelationship, app_obj: AppObject, lazy: str | None = None
+    ) -> None:
         self.name = app_obj.get_rel_name(rel)
         self.rel_obj = app_obj.get_rel_obj(rel)
+        self.lazy = lazy
 
         self.type = f'Mapped[{self.rel_obj.class_name}]'
         if app_obj.is_relationship_many(rel):
@@ -52,6 +57,8 @@ class RelationshipCode(AbstractVariableCode):
             params.append(f'foreign_keys=[{self.name}_id]')
         if app_obj.is_relationship_self(rel) and not app_obj.is_rel_backref(rel):
             params.append('remote_side=[id]')
+        if self.lazy:
+            params.append(f"lazy='{self.lazy}'")
         return ', '.join(params)
 
     @staticmethod
@@ -76,6 +83,8 @@ class ForeignKeyCode(AbstractVariableCode):
             params.append('nullable = True')
         if rel.relationship_type == one_to_one:
             params.append('unique=True')
+        else:
+            params.append('index=True')
         self.value = f"mapped_column({', '.join(params)})"
 
 
@@ -85,38 +94,63 @@ class AssociationTableCode(AbstractVariableCode):
         self.value = (
             f"Table('{rel.related_object.name}_{rel.back_populates_object.name}',"
             f"Base.metadata,"
-            f"Column('{rel.related_object.name}_id', Integer, ForeignKey('{rel.related_object.table_name}.id')),"
+            f"Column('{rel.related_object.name}_id', Integer, ForeignKey('{rel.related_object.table_name}.id'), "
+            f"index=True),"
             f"Column('{rel.back_populates_object.name}_id', Integer, "
-            f"ForeignKey('{rel.back_populates_object.table_name}.id'))"
+            f"ForeignKey('{rel.back_populates_object.table_name}.id'), index=True)"
             f")"
         )
 
 
+class TableArgsCode(AbstractVariableCode):
+    def __init__(self, app_obj: AppObject) -> None:
+        self.name = '__table_args__'
+        indexes: list[str] = []
+        for att in app_obj.attributes:
+            if att.index_type:
+                # the index method needs an explicit index, which then enforces the uniqueness as well
+                indexes.append(get_index_code(app_obj, [att.name], att.unique, att.index_type))
+        for index in app_obj.indexes:
+            indexes.append(get_index_code(app_obj, index.columns, index.unique, index.index_type))
+        self.value = f"({''.join(index + ', ' for index in indexes)})" if indexes else None
+
+
 class HybridPropertyFunc(AbstractFunctionCode):
-    def __init__(self, name: str):
+    def __init__(self, name: str, preloaded_ids: bool = False):
         self.name = name + '_id'
         self.decorators = [SimpleDecoratorCode('hybrid_property')]
         self.parametars = [SimpleVariable('self')]
         self.content = f'return [{name}.id for {name} in self.{name}]'
+        if preloaded_ids:
+            # ids are filled by the repository with one query for the whole page
+            self.content = f"""ids = self.__dict__.get('_{name}_ids')
+if ids is not None:
+    return ids
+{self.content}"""
 
 
 class ModelClassCode(AbstractClassCode):
-    def __init__(self, app_obj: AppObject):
+    def __init__(self, app_obj: AppObject, config: StructureConfig = StructureConfig()):
         self.class_name = app_obj.class_name
         self.attributes = []
         self.methods = []
         self.super_class_name = 'Base'
         self.attributes.append(SimpleVariable('__tablename__', '', f"'{app_obj.table_name}'"))
+        table_args = TableArgsCode(app_obj)
+        if table_args.value:
+            self.attributes.append(table_args)
         self.attributes.append(SimpleVariable('id', 'Mapped[int]', 'mapped_column(primary_key=True)'))
         for att in app_obj.attributes:
             self.attributes.append(AttributeCode(att))
         for rel in app_obj.all_relationships:
+            strategy = get_load_strategy(rel, app_obj, config)
+            lazy = strategy if strategy != 'ids' else None
             if app_obj.is_relationship_many(rel):
-                self.attributes.append(RelationshipCode(rel, app_obj))
-                self.methods.append(HybridPropertyFunc(app_obj.get_rel_name(rel)))
+                self.attributes.append(RelationshipCode(rel, app_obj, lazy))
+                self.methods.append(HybridPropertyFunc(app_obj.get_rel_name(rel), strategy == 'ids'))
             else:
                 self.attributes.append(ForeignKeyCode(rel, app_obj))
-                self.attributes.append(RelationshipCode(rel, app_obj))
+                self.attributes.append(RelationshipCode(rel, app_obj, lazy))
 
 
 class ModelModuleCode(AbstractModuleCode):
@@ -134,13 +168,15 @@ class ModelModuleCode(AbstractModuleCode):
         }
         self.type_checking_imports = {}
         self.fill_imports(app_obj)
-        self.classes = [ModelClassCode(app_obj)]
+        self.classes = [ModelClassCode(app_obj, config)]
         self.variables = []
         for rel in app_obj.relationships:
             if isinstance(rel, BackpopulatesRelationship) and rel.relationship_type == many_to_many:
                 self.variables.append(AssociationTableCode(rel))
 
     def fill_imports(self, app_obj: AppObject) -> None:
+        if TableArgsCode(app_obj).value:
+            self.imports['sqlalchemy'].add('Index')
         for att in app_obj.attributes:
             self.imports['sqlalchemy'].add(att.type.db_type)
             if att.type.python_module != 'builtins':
@@ -167,16 +203,32 @@ class ModelModuleCode(AbstractModuleCode):
                 else:
                     self.imports[module] = {table_name}
 
-    def __str__(self) -> str:
-        return f"""
-{self.imports_code}
-{self.type_checking_imports_code}
-{self.variables_code}
-{self.classes_code}
-""".strip(
-            '\n'
-        )
+    def render(self, writer: CodeWriter) -> None:
+        self.render_imports(writer)
+        self.render_type_checking_imports(writer)
+        self.render_variables(writer)
+        self.render_classes(writer)
 
 
 def get_association_table_name(rel: BackpopulatesRelationship) -> str:
     return f'{rel.related_object.name}_{rel.back_populates_object.name}_association'
+
+
+def get_index_code(app_obj: AppObject, columns: list[str], unique: bool, index_type: str | None) -> str:
+    params = [f"'ix_{app_obj.table_name}_{'_'.join(columns)}'"]
+    params.extend(f"'{column}'" for column in columns)
+    if unique:
+        params.append('unique=True')
+    if index_type:
+        params.append(f"postgresql_using='{index_type}'")
+    return f"Index({', '.join(params)})"
+
+
+def get_load_strategy(
+    rel: Relationship | BackpopulatesRelationship, app_obj: AppObject, config: StructureConfig
+) -> LoadStrategy | None:
+    strategy = app_obj.get_rel_lazy(rel)
+    if strategy is None and config.async_mode:
+        # async sessions can't lazy load on attribute access, the repository loads what the responses need
+        return 'raise'
+    return strategy
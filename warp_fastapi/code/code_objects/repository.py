@@ -2,11 +2,13 @@ from ... import AppObject
 from ...config import StructureConfig
 from .base import (
     AbstractModuleCode,
+    CodeWriter,
     SimpleClassCode,
     SimpleFunctionCode,
     SimpleModuleCode,
     SimpleVariable,
 )
+from .model import get_load_strategy
 
 
 class RepoModuleCode(AbstractModuleCode):
@@ -20,26 +22,43 @@ class RepoModuleCode(AbstractModuleCode):
         self.filename = config.get_repository_filename(app_obj)
         main_repo_module = config.get_module_for_repository(app_obj, config.get_repository_main_path())
         model_module = config.get_module_for_repository(app_obj, config.get_model_path(app_obj))
+        session_class = config.get_session_classname()
         self.imports = {
-            'sqlalchemy.orm': {'Session'},
+            config.get_session_module(): {session_class},
             main_repo_module: {config.repository_main_class_name},
             model_module: {app_obj.class_name},
         }
         class_name = config.get_repo_classname(app_obj)
+        init_params = [app_obj.class_name, *self.get_loading_params(app_obj, config)]
         init_function = SimpleFunctionCode(
             '__init__',
-            f'super().__init__(db, {app_obj.class_name})',
-            parametars=[SimpleVariable('self'), SimpleVariable('db', 'Session')],
+            f"super().__init__(db, {', '.join(init_params)})",
+            parametars=[SimpleVariable('self'), SimpleVariable('db', session_class)],
         )
         self.classes.append(SimpleClassCode(class_name, config.repository_main_class_name, methods=[init_function]))
 
-    def __str__(self) -> str:
-        return f"""
-{self.imports_code}
-{self.classes_code}
-""".strip(
-            '\n'
-        )
+    def get_loading_params(self, app_obj: AppObject, config: StructureConfig) -> list[str]:
+        load_options: list[str] = []
+        id_relationships: list[str] = []
+        for rel in app_obj.all_relationships:
+            name = app_obj.get_rel_name(rel)
+            strategy = get_load_strategy(rel, app_obj, config)
+            if strategy == 'raise' and app_obj.is_relationship_many(rel):
+                # only collections feed the response, to-one relationships are read through their foreign key
+                load_options.append(f'selectinload({app_obj.class_name}.{name})')
+            elif strategy == 'ids' and app_obj.is_relationship_many(rel):
+                id_relationships.append(f"'{name}'")
+        params: list[str] = []
+        if load_options:
+            self.imports.setdefault('sqlalchemy.orm', set()).add('selectinload')
+            params.append(f"load_options=[{', '.join(load_options)}]")
+        if id_relationships:
+            params.append(f"id_relationships=[{', '.join(id_relationships)}]")
+        return params
+
+    def render(self, writer: CodeWriter) -> None:
+        self.render_imports(writer)
+        self.render_classes(writer)
 
 
 class RepoBaseModule(SimpleModuleCode):
@@ -47,60 +66,316 @@ class RepoBaseModule(SimpleModuleCode):
         self.folder = config.get_repository_main_folder()
         self.filename = config.get_repository_main_filename()
         self.database_module = config.get_module_for_repository_main(config.get_database_path())
+        self.settings_module = config.get_module_for_repository_main(config.get_settings_path())
+        self.class_name = config.repository_main_class_name
+        self.session_module = config.get_session_module()
+        self.session_class = config.get_session_classname()
+        self.async_def = 'async def' if config.async_mode else 'def'
+        self.await_ = 'await ' if config.async_mode else ''
+
+    def _scalars(self, statement: str) -> str:
+        if self.await_:
+            return f'(await self.db.scalars({statement})).unique()'
+        return f'self.db.scalars({statement}).unique()'
 
     def __str__(self) -> str:
+        a, w = self.async_def, self.await_
         return f"""
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from {self.session_module} import {self.session_class}
+from sqlalchemy import CursorResult, Select, Table, bindparam, delete, func, insert, inspect, select, text, update
+from sqlalchemy.orm import MANYTOONE, Mapper, aliased, lazyload, load_only, selectinload
 from {self.database_module} import Base
-from typing import Type, Dict, Any, Optional, TypeVar
+from {self.settings_module} import settings
+from typing import Type, Dict, Any, Container, Optional, Sequence, TypeVar, cast
 from fastapi import HTTPException
 
-class Repository:
-    def __init__(self, db: Session, model_type: type[Base]):
+class {self.class_name}:
+    def __init__(
+        self,
+        db: {self.session_class},
+        model_type: type[Base],
+        load_options: Sequence[Any] = (),
+        id_relationships: Sequence[str] = (),
+    ):
         self.db = db
         self.model_type = model_type
+        self.load_options = list(load_options)
+        self.id_relationships = list(id_relationships)
+        # RETURNING rows cannot be joined, so joined relationships are loaded with a second select instead
+        joined = [rel.key for rel in inspect(model_type).relationships if rel.lazy == 'joined']
+        self.returning_options = self.load_options + [selectinload(getattr(model_type, name)) for name in joined]
 
-    def get_by_id(self, id: int):
-        db_obj = self.db.get(self.model_type, id)
-        if not db_obj:
-            raise HTTPException(status_code=404, detail=f"{{self.model_type.__name__}} with ID {{id}} not found!")
+    {a} get_by_id(self, id: int, fields: Sequence[str] | None = None):
+        db_obj = {w}self._get(id, self._read_options(fields))
+        {w}self._load_ids([db_obj], fields)
         return db_obj
 
-    def get_all(self, skip: int, limit: int):
-        return self.db.scalars(select(self.model_type).offset(skip).limit(limit)).all()
+    {a} get_all(self, skip: int, limit: int):
+        results = {self._scalars('self._select().offset(skip).limit(limit)')}.all()
+        return {w}self._load_ids(results)
 
-    def get_by_ids(self, ids:list[int]):
-        results = self.db.query(self.model_type).filter(self.model_type.id.in_(ids)).all()
+    {a} get_by_ids(self, ids:list[int]):
+        results = {self._scalars('select(self.model_type).where(self.model_type.id.in_(ids))')}.all()
         if len(results) != len(ids):
             raise HTTPException(status_code=400,
             detail=(f'{{len(ids)-len(results)}} ids not '
                     f'found for {{self.model_type.__name__}}!'))
         return results
 
-    def create(self, data: dict[str, Any]):
+    {a} create(self, data: dict[str, Any]):
         instance = self.model_type(**data)
         self.db.add(instance)
-        self.db.commit()
-        self.db.refresh(instance)
+        {w}self.db.commit()
+        {w}self._load_ids([instance])
         return instance
 
-    def update(self, id: int, data: dict[str, Any]):
-        instance = self.get_by_id(id)
-        if not instance:
-            raise HTTPException(status_code=404, detail=f"{{self.model_type.__name__}} with ID {{id}} not found!")
+    {a} update(self, id: int, data: dict[str, Any]):
+        values = self._column_values(data)
+        if values:
+            return {w}self._update_returning(id, values)
+        instance = {w}self._get(id, self.load_options + self._collection_options(inspect(self.model_type), data))
         for key, value in data.items():
             setattr(instance, key, value)
 
-        self.db.commit()
-        self.db.refresh(instance)
+        {w}self.db.commit()
+        {w}self._load_ids([instance])
+        return instance
+
+    {a} edit(self, id: int, data: dict[str, Any]):
+        values = self._column_values({{key: value for key, value in data.items() if value}})
+        if values:
+            return {w}self._update_returning(id, values)
+        instance = {w}self._get(id, self.load_options + self._collection_options(inspect(self.model_type), data))
+        self._apply_edit(instance, data)
+
+        {w}self.db.commit()
+        {w}self._load_ids([instance])
         return instance
 
-    def edit(self, id: int, data: dict[str, Any]):
-        instance = self.get_by_id(id)
+    {a} delete(self, id: int):
+        if self._plain_delete():
+            statement = delete(self.model_type).where(self.model_type.id == id)
+            result = cast(CursorResult[Any], {w}self.db.execute(statement))
+            if not result.rowcount:
+                raise HTTPException(status_code=404, detail=f"{{self.model_type.__name__}} with ID {{id}} not found!")
+        else:
+            instance = {w}self._get(id, self._collection_options(inspect(self.model_type)))
+            {w}self.db.delete(instance)
+        {w}self.db.commit()
+        return True
+
+    {a} bulk_create(self, rows: list[dict[str, Any]]):
+        if not rows:
+            return []
+        if not self.db.get_bind().dialect.insert_executemany_returning:
+            instances = [self.model_type(**row) for row in rows]
+            self.db.add_all(instances)
+            {w}self.db.flush()
+            ids = [instance.id for instance in instances]
+        else:
+            keys = inspect(self.model_type).relationships.keys()
+            links = [{{key: row.pop(key) for key in keys if key in row}} for row in rows]
+            # ids are matched to their links by position, which only needs ordered RETURNING when links exist
+            statement = insert(self.model_type).returning(self.model_type.id, sort_by_parameter_order=any(links))
+            ids = list({w}self.db.scalars(statement, rows))
+            {w}self._link(ids, links)
+        {w}self.db.commit()
+        return {w}self._get_many(ids)
+
+    {a} bulk_update(self, rows: list[dict[str, Any]]):
+        ids = [row['id'] for row in rows]
+        if self._has_relationships(rows):
+            instances = {w}self._get_many_for_write(ids, {{key for row in rows for key in row}})
+            for row in rows:
+                self._apply_edit(instances[row['id']], row)
+        else:
+            {w}self._check_ids(ids)
+            rows = [{{key: value for key, value in row.items() if value or key == 'id'}} for row in rows]
+            rows = [row for row in rows if len(row) > 1]
+            if rows:
+                {w}self.db.execute(update(self.model_type), rows)
+        {w}self.db.commit()
+        return {w}self._get_many(ids)
+
+    {a} bulk_delete(self, ids: list[int]):
+        if self._plain_delete():
+            {w}self._check_ids(ids)
+            {w}self.db.execute(delete(self.model_type).where(self.model_type.id.in_(ids)))
+        else:
+            # the unit of work applies relationship cascades and batches the deletes per table
+            instances = {w}self._get_many_for_write(ids)
+            for instance in instances.values():
+                {w}self.db.delete(instance)
+        {w}self.db.commit()
+        return len(set(ids))
+
+    {a} search(
+        self,
+        attribute: str | None,
+        value: str | None,
+        sort: str | None,
+        skip: int,
+        limit: int,
+        fields: Sequence[str] | None = None,
+    ):
+        statement = self._filter(self._select(fields), attribute, value)
+        if sort in self.model_type.__table__.columns.keys():
+            statement = statement.order_by(sort)
+        results = {self._scalars('statement.offset(skip).limit(limit)')}.all()
+        return {w}self._load_ids(results, fields)
+
+    {a} get_page(
+        self,
+        cursor: int | None,
+        limit: int,
+        attribute: str | None = None,
+        value: str | None = None,
+        fields: Sequence[str] | None = None,
+    ):
+        statement = self._filter(self._select(fields), attribute, value)
+        if cursor is not None:
+            statement = statement.where(self.model_type.id > cursor)
+        statement = statement.order_by(self.model_type.id).limit(limit + 1)
+        results = {self._scalars('statement')}.all()
+        next_cursor = results[limit - 1].id if len(results) > limit else None
+        return {w}self._load_ids(results[:limit], fields), next_cursor
+
+    {a} count(self, attribute: str | None = None, value: str | None = None) -> int:
+        statement = self._filter(select(func.count()).select_from(self.model_type), attribute, value)
+        return {w}self.db.scalar(statement)
+
+    {a} estimate_count(self, attribute: str | None = None, value: str | None = None) -> int:
+        # table statistics spare large tables a full scan, filtered and small tables are counted exactly
+        if not (attribute and value):
+            estimate = {w}self._table_estimate()
+            if estimate is not None and estimate >= settings.COUNT_ESTIMATE_MIN_ROWS:
+                return estimate
+        return {w}self.count(attribute, value)
+
+    {a} _get(self, id: int, options: list[Any]):
+        # unlike Session.get a select also runs the options for an instance that is already in the session, it
+        # fills the unloaded attributes without overwriting the loaded ones
+        statement = select(self.model_type).where(self.model_type.id == id).options(*options)
+        db_obj = {self._scalars('statement')}.one_or_none()
+        if not db_obj:
+            raise HTTPException(status_code=404, detail=f"{{self.model_type.__name__}} with ID {{id}} not found!")
+        return db_obj
+
+    {a} _table_estimate(self) -> int | None:
+        # the statistics are refreshed by ANALYZE, and on PostgreSQL by autovacuum
+        dialect = self.db.get_bind().dialect.name
+        if dialect == 'postgresql':
+            statement = text('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)')
+        elif dialect == 'sqlite':
+            if not {w}self.db.scalar(text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")):
+                return None
+            statement = text('SELECT stat FROM sqlite_stat1 WHERE tbl = :table LIMIT 1')
+        else:
+            return None
+        stat = {w}self.db.scalar(statement, {{'table': inspect(self.model_type).tables[0].name}})
+        if stat is None:
+            return None
+        # the sqlite stat starts with the number of rows, PostgreSQL reports -1 for tables never analyzed
+        rows = int(str(stat).split()[0])
+        return rows if rows >= 0 else None
+
+    {a} _update_returning(self, id: int, values: dict[str, Any]):
+        statement = (
+            update(self.model_type)
+            .where(self.model_type.id == id)
+            .values(values)
+            .returning(self.model_type)
+            .options(*self.returning_options)
+        )
+        instance = {self._scalars('statement')}.one_or_none()
         if not instance:
             raise HTTPException(status_code=404, detail=f"{{self.model_type.__name__}} with ID {{id}} not found!")
+        {w}self.db.commit()
+        {w}self._load_ids([instance])
+        return instance
+
+    def _column_values(self, data: dict[str, Any]) -> dict[str, Any] | None:
+        # to-one relationships become foreign key values, collections need the unit of work
+        if not self.db.get_bind().dialect.update_returning:
+            return None
+        relationships = inspect(self.model_type).relationships
+        values: dict[str, Any] = {{}}
+        for key, value in data.items():
+            if key not in relationships:
+                values[key] = value
+            elif relationships[key].direction is MANYTOONE:
+                column = next(iter(relationships[key].local_columns))
+                values[str(column.key)] = value.id if value is not None else None
+            else:
+                return None
+        return values
+
+    def _plain_delete(self) -> bool:
+        # without cascades a row can be deleted without loading it and its relationships first
+        relationships = inspect(self.model_type).relationships
+        return all(rel.direction is MANYTOONE and not rel.cascade.delete for rel in relationships)
+
+    {a} _get_many(self, ids: list[int]):
+        statement = self._select().where(self.model_type.id.in_(ids)).execution_options(populate_existing=True)
+        instances = {{instance.id: instance for instance in {self._scalars('statement')}.all()}}
+        return {w}self._load_ids([instances[id] for id in dict.fromkeys(ids)])
 
+    {a} _get_many_for_write(self, ids: list[int], keys: Container[str] | None = None) -> dict[int, Any]:
+        options = self._collection_options(inspect(self.model_type), keys)
+        statement = select(self.model_type).where(self.model_type.id.in_(ids)).options(*options)
+        instances = {{instance.id: instance for instance in {self._scalars('statement')}.all()}}
+        self._check_found(ids, instances)
+        return instances
+
+    {a} _check_ids(self, ids: list[int]):
+        found = set({w}self.db.scalars(select(self.model_type.id).where(self.model_type.id.in_(ids))))
+        self._check_found(ids, found)
+
+    def _check_found(self, ids: list[int], found: Container[int]) -> None:
+        missing = [id for id in dict.fromkeys(ids) if id not in found]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"{{self.model_type.__name__}} with IDs {{missing}} not found!")
+
+    {a} _link(self, ids: list[int], links: list[dict[str, list[Any]]]) -> None:
+        for key, prop in inspect(self.model_type).relationships.items():
+            pairs = [(id, related.id) for id, link in zip(ids, links) for related in link.get(key) or []]
+            if not pairs:
+                continue
+            if prop.secondary is not None:
+                parent_key = str(prop.synchronize_pairs[0][1].key)
+                related_key = str((prop.secondary_synchronize_pairs or [])[0][1].key)
+                values = [{{parent_key: id, related_key: related_id}} for id, related_id in pairs]
+                {w}self.db.execute(insert(cast(Table, prop.secondary)), values)
+            else:
+                table = prop.target
+                statement = (
+                    update(table)
+                    .where(table.c.id == bindparam('_related_id'))
+                    .values({{str(prop.synchronize_pairs[0][1].key): bindparam('_parent_id')}})
+                )
+                values = [{{'_parent_id': id, '_related_id': related_id}} for id, related_id in pairs]
+                {w}self.db.execute(statement, values)
+
+    def _collection_options(
+        self, mapper: Mapper[Any], keys: Container[str] | None = None, parent: Any = None, path: tuple[Any, ...] = ()
+    ) -> list[Any]:
+        # writes replace, append to or cascade over collections, which are loaded up front instead of on access
+        options: list[Any] = []
+        for rel in mapper.relationships:
+            if rel.direction is MANYTOONE or (keys is not None and rel.key not in keys):
+                continue
+            option = parent.selectinload(rel.class_attribute) if parent else selectinload(rel.class_attribute)
+            options.append(option)
+            if rel.cascade.delete and rel.mapper not in path:
+                # deleted children unlink their own collections, so these are loaded as well
+                options += self._collection_options(rel.mapper, None, option, (*path, mapper))
+        return options
+
+    def _has_relationships(self, rows: list[dict[str, Any]]) -> bool:
+        keys = inspect(self.model_type).relationships.keys()
+        return any(row.get(key) for row in rows for key in keys)
+
+    def _apply_edit(self, instance: Any, data: dict[str, Any]) -> None:
         for key, value in data.items():
             if value:
                 if isinstance(getattr(instance, key), list) and isinstance(value, list):
@@ -109,29 +384,50 @@ class Repository:
                 else:
                     setattr(instance, key, value)
 
-        self.db.commit()
-        self.db.refresh(instance)
-        return instance
+    def _select(self, fields: Sequence[str] | None = None) -> Select[Any]:
+        return select(self.model_type).options(*self._read_options(fields))
 
-    def delete(self, id: int):
-        instance = self.get_by_id(id)
-        if not instance:
-            raise HTTPException(status_code=404, detail=f"{{self.model_type.__name__}} with ID {{id}} not found!")
+    def _read_options(self, fields: Sequence[str] | None) -> list[Any]:
+        if fields is None:
+            return self.load_options
+        # only the requested columns and relationships are loaded, the other relationships stay unloaded
+        mapper = inspect(self.model_type)
+        columns = mapper.column_attrs.keys()
+        options = [load_only(*(getattr(self.model_type, key) for key in columns if key in fields or key == 'id'))]
+        options.append(lazyload('*'))
+        for key in mapper.relationships.keys():
+            if f'{{key}}_id' in fields and f'{{key}}_id' not in columns and key not in self.id_relationships:
+                options.append(selectinload(getattr(self.model_type, key)))
+        return options
 
-        self.db.delete(instance)
-        self.db.commit()
-        return True
+    {a} _load_ids(self, instances: Sequence[Any], fields: Sequence[str] | None = None) -> Sequence[Any]:
+        if not instances:
+            return instances
+        ids = [instance.id for instance in instances]
+        for name in self.id_relationships:
+            if fields is not None and f'{{name}}_id' not in fields:
+                continue
+            relationship = getattr(self.model_type, name)
+            related = aliased(relationship.property.mapper.class_)
+            statement = (
+                select(self.model_type.id, related.id)
+                .join(relationship.of_type(related))
+                .where(self.model_type.id.in_(ids))
+                .order_by(related.id)
+            )
+            related_ids: dict[int, list[int]] = {{id: [] for id in ids}}
+            for parent_id, related_id in {w}self.db.execute(statement):
+                related_ids[parent_id].append(related_id)
+            for instance in instances:
+                instance.__dict__[f'_{{name}}_ids'] = related_ids[instance.id]
+        return instances
 
-    def search(self, attribute: str | None, value: str | None, sort: str | None, skip: int, limit: int):
-        columns = self.model_type.__table__.columns.keys()
-        statement = select(self.model_type)
+    def _filter(self, statement: Select[Any], attribute: str | None, value: str | None) -> Select[Any]:
         if attribute and value:
-            if attribute not in columns:
+            if attribute not in self.model_type.__table__.columns.keys():
                 raise HTTPException(status_code=406,
                 detail=(f"Attribute {{attribute}} in "
                     f"{{self.model_type.__name__}} not found!"))
             statement = statement.filter_by(**{{attribute: value}})
-        if sort in columns:
-            statement = statement.order_by(sort)
-        return self.db.scalars(statement.offset(skip).limit(limit)).all()
+        return statement
 """
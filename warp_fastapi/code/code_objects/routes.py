@@ -3,6 +3,7 @@ from ...config import StructureConfig
 from .base import (
     SimpleModuleCode,
 )
+from .cache import uses_cache
 
 
 class RoutesModuleCode(SimpleModuleCode):
@@ -12,8 +13,10 @@ class RoutesModuleCode(SimpleModuleCode):
         self.name = app_obj.name
         self.class_name = app_obj.class_name
         self.response_schema = config.get_read_cls_schema(app_obj)
+        self.page_schema = config.get_pagination_cls_schema(app_obj)
         self.create_schema = config.get_create_cls_schema(app_obj)
         self.edit_schema = config.get_edit_cls_schema(app_obj)
+        self.bulk_edit_schema = config.get_bulk_edit_cls_schema(app_obj)
         self.service = config.get_service_classname(app_obj)
         self.route_name = app_obj.route_name
         self.dependency_module = config.get_module_for_route(app_obj, config.get_dependency_path())
@@ -22,77 +25,144 @@ class RoutesModuleCode(SimpleModuleCode):
         self.repo_class = config.get_repo_classname(app_obj)
         self.service_modul = config.get_module_for_route(app_obj, config.get_service_path(app_obj))
         self.common_schema_module = config.get_module_for_route(app_obj, config.get_common_schema_path())
+        self.settings_module = config.get_module_for_route(app_obj, config.get_settings_path())
+        self.session_module = config.get_session_module()
+        self.session_class = config.get_session_classname()
+        self.async_def = 'async def' if config.async_mode else 'def'
+        self.await_ = 'await ' if config.async_mode else ''
+        self.cache_depen = ''
+        self.cache_import = ''
+        self.service_params = 'db'
+        self.response_arg = ''
+        self.page_arg = ''
+        if config.orjson_mode:
+            # read endpoints return the validated schema serialized with model_dump_json
+            self.response_arg = f', {self.response_schema}'
+            self.page_arg = f', {self.page_schema}'
+        self.list_total = ''
+        self.search_total = ''
+        if app_obj.config.total != 'skip':
+            self.list_total = f', {self.await_}service.count_{self.name}()'
+            self.search_total = f', {self.await_}service.count_{self.name}(q.attribute, q.value)'
+        if uses_cache(app_obj):
+            cache_module = config.get_module_for_route(app_obj, config.get_cache_path())
+            self.cache_depen = ', cache: Annotated[CacheBackend, Depends(get_cache)]'
+            self.cache_import = f'from {cache_module} import CacheBackend, get_cache'
+            self.service_params = 'db, cache'
         self.secure_depen = ''
         self.secure_import = ''
         self.hash_password = ''
+        self.bulk_hash_password = ''
         if app_obj.secure:
             self.secure_depen = ', dependencies=[Depends(get_current_user)]'
         if isinstance(app_obj, AuthObject):
             security_module = config.get_module_for_route(app_obj, config.get_security_path())
             self.secure_import += f'from {security_module} import get_password_hash'
             self.hash_password = f'{self.name}.password = get_password_hash({self.name}.password)'
+            self.bulk_hash_password = 'for item in items:\n        item.password = get_password_hash(item.password)'
 
     def __str__(self) -> str:
-        return f"""from fastapi import APIRouter, HTTPException, Depends, Query
+        a, w = self.async_def, self.await_
+        return f"""from fastapi import APIRouter, Body, HTTPException, Depends, Query, Request
 from fastapi.responses import JSONResponse
 from typing import Annotated
-from sqlalchemy.orm import Session
+from {self.session_module} import {self.session_class}
 from {self.dependency_module} import get_db, get_current_user
-from {self.schema_modul} import {self.response_schema}, {self.create_schema}, {self.edit_schema}
+from {self.schema_modul} import (
+    {self.response_schema}, {self.create_schema}, {self.edit_schema}, {self.bulk_edit_schema}, {self.page_schema}
+)
 from {self.repo_modul} import {self.repo_class}
 from {self.service_modul} import {self.service}, get_{self.name}_service
-from {self.common_schema_module} import QuerySchema
+from {self.common_schema_module} import (
+    QuerySchema, check_batch_size, decode_cursor, field_selector, keyset_page, offset_page, render_response
+)
+from {self.settings_module} import settings
+{self.cache_import}
 {self.secure_import}
 
 router = APIRouter(prefix="/{self.route_name}", tags=['{self.name}'])
+select_fields = field_selector({self.response_schema})
 
 @router.post("/", response_model={self.response_schema}, status_code=201{self.secure_depen})
-def create_{self.name}({self.name}: {self.create_schema},
-                  db: Annotated[Session, Depends(get_db)]):
-    service = get_{self.name}_service(db)
+{a} create_{self.name}({self.name}: {self.create_schema},
+                  db: Annotated[{self.session_class}, Depends(get_db)]{self.cache_depen}):
+    service = get_{self.name}_service({self.service_params})
     {self.hash_password}
-    return service.create_{self.name}({self.name})
+    return {w}service.create_{self.name}({self.name})
+
+@router.post("/bulk", response_model=list[{self.response_schema}], status_code=201{self.secure_depen})
+{a} bulk_create_{self.name}(items: list[{self.create_schema}],
+                  db: Annotated[{self.session_class}, Depends(get_db)]{self.cache_depen}):
+    check_batch_size(items, settings.BULK_MAX_BATCH_SIZE)
+    service = get_{self.name}_service({self.service_params})
+    {self.bulk_hash_password}
+    return {w}service.bulk_create_{self.name}(items)
+
+@router.patch("/bulk", response_model=list[{self.response_schema}], status_code=200{self.secure_depen})
+{a} bulk_edit_{self.name}(items: list[{self.bulk_edit_schema}],
+                  db: Annotated[{self.session_class}, Depends(get_db)]{self.cache_depen}):
+    check_batch_size(items, settings.BULK_MAX_BATCH_SIZE)
+    service = get_{self.name}_service({self.service_params})
+    return {w}service.bulk_edit_{self.name}(items)
+
+@router.delete("/bulk", status_code=200{self.secure_depen})
+{a} bulk_delete_{self.name}(ids: Annotated[list[int], Body()],
+                  db: Annotated[{self.session_class}, Depends(get_db)]{self.cache_depen}):
+    check_batch_size(ids, settings.BULK_MAX_BATCH_SIZE)
+    service = get_{self.name}_service({self.service_params})
+    deleted = {w}service.bulk_delete_{self.name}(ids)
+    return JSONResponse(content={{"message":"Resources successfully deleted.", "deleted": deleted}})
 
 @router.get("/{{id}}", response_model={self.response_schema}, status_code=200{self.secure_depen})
-def read_{self.name}(id: int,
-                db: Annotated[Session, Depends(get_db)]):
-    service = get_{self.name}_service(db)
-    return service.get_{self.name}(id)
-
-@router.get("/", response_model=list[{self.response_schema}], status_code=200{self.secure_depen})
-def get_all_{self.name}(
-    db: Annotated[Session, Depends(get_db)],
-    skip: int = 0, limit: int = 100,):
-    service = get_{self.name}_service(db)
-    return service.search_{self.name}(None, None, None, skip, limit)
-
-@router.get("/search/", response_model=list[{self.response_schema}], status_code=200{self.secure_depen})
-def search_{self.name}(
+{a} read_{self.name}(id: int,
+                db: Annotated[{self.session_class}, Depends(get_db)]{self.cache_depen},
+                fields: Annotated[list[str] | None, Depends(select_fields)]):
+    service = get_{self.name}_service({self.service_params})
+    return render_response({w}service.get_{self.name}(id, fields), fields{self.response_arg})
+
+@router.get("/", response_model={self.page_schema}, status_code=200{self.secure_depen})
+{a} get_all_{self.name}(
+    request: Request,
+    db: Annotated[{self.session_class}, Depends(get_db)]{self.cache_depen},
+    fields: Annotated[list[str] | None, Depends(select_fields)],
+    cursor: str | None = None, limit: Annotated[int, Query(gt=0, le=1000)] = 100,):
+    service = get_{self.name}_service({self.service_params})
+    results, next_id = {w}service.page_{self.name}(decode_cursor(cursor), limit, fields=fields)
+    return render_response(keyset_page(request, results, next_id, limit{self.list_total}), fields{self.page_arg})
+
+@router.get("/search/", response_model={self.page_schema}, status_code=200{self.secure_depen})
+{a} search_{self.name}(
+    request: Request,
     q: Annotated[QuerySchema, Depends(QuerySchema)],
-    db: Annotated[Session, Depends(get_db)]):
-    service = get_{self.name}_service(db)
-    return service.search_{self.name}(**q.model_dump())
+    db: Annotated[{self.session_class}, Depends(get_db)]{self.cache_depen},
+    fields: Annotated[list[str] | None, Depends(select_fields)]):
+    service = get_{self.name}_service({self.service_params})
+    if q.sort:
+        results = {w}service.search_{self.name}(q.attribute, q.value, q.sort, q.skip, q.limit, fields)
+        return render_response(offset_page(request, results, q.skip, q.limit{self.search_total}), fields{self.page_arg})
+    results, next_id = {w}service.page_{self.name}(decode_cursor(q.cursor), q.limit, q.attribute, q.value, fields)
+    return render_response(keyset_page(request, results, next_id, q.limit{self.search_total}), fields{self.page_arg})
 
 @router.put("/{{id}}", response_model={self.response_schema}, status_code=200{self.secure_depen})
-def update_{self.name}(
+{a} update_{self.name}(
     id: int, {self.name}: {self.create_schema},
-    db: Annotated[Session, Depends(get_db)]):
-    service = get_{self.name}_service(db)
-    return service.update_{self.name}(id, {self.name})
+    db: Annotated[{self.session_class}, Depends(get_db)]{self.cache_depen}):
+    service = get_{self.name}_service({self.service_params})
+    return {w}service.update_{self.name}(id, {self.name})
 
 @router.patch("/{{id}}", response_model={self.response_schema}, status_code=200{self.secure_depen})
-def edit_{self.name}(
+{a} edit_{self.name}(
     id: int, {self.name}: {self.edit_schema},
-    db: Annotated[Session, Depends(get_db)]):
-    service = get_{self.name}_service(db)
-    return service.edit_{self.name}(id, {self.name})
+    db: Annotated[{self.session_class}, Depends(get_db)]{self.cache_depen}):
+    service = get_{self.name}_service({self.service_params})
+    return {w}service.edit_{self.name}(id, {self.name})
 
 @router.delete("/{{id}}", status_code=200{self.secure_depen})
-def delete_{self.name}(
+{a} delete_{self.name}(
     id: int,
-    db: Annotated[Session, Depends(get_db)]):
-    service = get_{self.name}_service(db)
-    service.delete_{self.name}(id)
+    db: Annotated[{self.session_class}, Depends(get_db)]{self.cache_depen}):
+    service = get_{self.name}_service({self.service_params})
+    {w}service.delete_{self.name}(id)
     return JSONResponse(content={{"message":"Resource successfully deleted."}})
 """
 
@@ -138,12 +208,15 @@ class LoginRouteModule(SimpleModuleCode):
         self.dependency_module = config.get_module_for_login_route(config.get_dependency_path())
         self.security_module = config.get_module_for_login_route(config.get_security_path())
         self.schema_module = config.get_module_for_login_route(config.get_common_schema_path())
+        self.session_module = config.get_session_module()
+        self.session_class = config.get_session_classname()
+        self.await_ = 'await ' if config.async_mode else ''
 
     def __str__(self) -> str:
         return f"""from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from {self.session_module} import {self.session_class}
 from {self.dependency_module} import get_db
 from {self.security_module} import authenticate, create_access_token
 from {self.schema_module} import Token
@@ -152,10 +225,10 @@ router = APIRouter(tags=["login"])
 
 @router.post("/login/", response_model=Token)
 async def login(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[{self.session_class}, Depends(get_db)],
     data: OAuth2PasswordRequestForm = Depends(),
 ):
-    user = authenticate(db, username=data.username, password=data.password)
+    user = {self.await_}authenticate(db, username=data.username, password=data.password)
     if user is None:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     return {{"access_token": create_access_token(user), "token_type": "bearer"}}
@@ -6,6 +6,7 @@ from ...relationships import BackpopulatesRelationship, Relationship
 from .base import (
     AbstractModuleCode,
     AbstractVariableCode,
+    CodeWriter,
     SimpleClassCode,
     SimpleModuleCode,
     SimpleVariable,
@@ -70,13 +71,9 @@ class SchemaModuleCode(AbstractModuleCode):
         self.fill_imports(app_obj)
         self.get_schema_classes(app_obj, config)
 
-    def __str__(self) -> str:
-        return f"""
-{self.imports_code}
-{self.classes_code}
-""".strip(
-            '\n'
-        )
+    def render(self, writer: CodeWriter) -> None:
+        self.render_imports(writer)
+        self.render_classes(writer)
 
     def fill_imports(self, app_obj: AppObject) -> None:
         for att in app_obj.attributes:
@@ -111,13 +108,6 @@ class SchemaModuleCode(AbstractModuleCode):
         base_att: OrderedSet[AbstractVariableCode] = find_base_att(read_att, create_att, edit_att)
         base_class_name = config.get_base_cls_schema(app_obj)
         self.classes.append(SimpleClassCode(base_class_name, 'BaseModel', list(base_att)))
-        self.classes.append(
-            SimpleClassCode(
-                config.get_pagination_cls_schema(app_obj),
-                'Pagination',
-                [SimpleVariable('data', f'list[{config.get_read_cls_schema(app_obj)}]')],
-            )
-        )
         schemas: dict[str, OrderedSet[AbstractVariableCode]] = {
             config.get_read_cls_schema(app_obj): read_att,
             config.get_create_cls_schema(app_obj): create_att,
@@ -126,34 +116,37 @@ class SchemaModuleCode(AbstractModuleCode):
         for schema_cls_name, att_list in schemas.items():
             super_class = 'BaseModel'
             passed_att = att_list
-            x1 = list(att_list - base_att) + list(base_att)
-            x2 = list(att_list)
-            if x1 == x2:
+            if base_att.issubset(att_list):
                 super_class = base_class_name
                 passed_att = OrderedSet(att_list - base_att)
             self.classes.append(SimpleClassCode(schema_cls_name, super_class, list(passed_att)))
+        self.classes.append(
+            SimpleClassCode(
+                config.get_bulk_edit_cls_schema(app_obj),
+                config.get_edit_cls_schema(app_obj),
+                [SimpleVariable('id', 'int')],
+            )
+        )
+        self.classes.append(
+            SimpleClassCode(
+                config.get_pagination_cls_schema(app_obj),
+                'Pagination',
+                [SimpleVariable('data', f'list[{config.get_read_cls_schema(app_obj)}]')],
+            )
+        )
 
 
 def find_base_att(*sets: OrderedSet[AbstractVariableCode]) -> OrderedSet[AbstractVariableCode]:
-    union_sets = sets[0]
-    for i in range(len(sets) - 1):
-        union_sets = union_sets.union(sets[i + 1])
-    unknow_set: OrderedSet[AbstractVariableCode] = OrderedSet([])
-    current_len = sum([len(s) for s in sets])
-    for x in union_sets:
-        unknow_set.add(x)
-        new_sets: list[OrderedSet[AbstractVariableCode]] = []
-        for s in sets:
-            new_set = OrderedSet(s - unknow_set)
-            if not list(new_set) + list(unknow_set) == list(s):
-                new_set = s
-            new_sets.append(new_set)
-        new_len = sum([len(s) for s in new_sets]) + len(unknow_set)
-        if new_len < current_len:
-            current_len = new_len
-        else:
-            unknow_set.remove(x)
-    return unknow_set
+    # an attribute joins the base when that shrinks the total number of declared attributes, the schemas that
+    # contain the whole base inherit it and declare only the rest
+    base: OrderedSet[AbstractVariableCode] = OrderedSet([])
+    inheriting = list(sets)
+    for x in sets[0].union(*sets[1:]):
+        with_x = [s for s in inheriting if x in s]
+        if (len(base) + 1) * (len(with_x) - 1) > len(base) * (len(inheriting) - 1):
+            base.add(x)
+            inheriting = with_x
+    return base
 
 
 class CommonSchemaModule(SimpleModuleCode):
@@ -163,18 +156,27 @@ class CommonSchemaModule(SimpleModuleCode):
         self.token = ''
         if secure:
             self.token = self._get_token_code()
+        self.response_import = 'from fastapi.responses import JSONResponse'
+        self.render_response = self._get_render_response_code()
+        if config.orjson_mode:
+            self.response_import = 'from fastapi.responses import ORJSONResponse, Response'
+            self.render_response = self._get_orjson_response_code()
 
     def __str__(self) -> str:
         return f"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from pydantic import AnyUrl, BaseModel, Field
-from typing import Annotated, Literal
-from fastapi import Query
+from typing import Annotated, Any, Callable, Literal
+from fastapi import HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+{self.response_import}
 
 class Pagination(BaseModel):
-    total: int
-    current_page: int
+    total: int | None = None
+    current_page: int | None = None
     next_page: AnyUrl | None = None
     prev_page: AnyUrl | None = None
+    next_cursor: str | None = None
     limit: int | None = None
     offset: int | None = None
 
@@ -182,12 +184,97 @@ class QuerySchema(BaseModel):
     attribute: Annotated[str | None, Query()] = Field(max_length=100)
     value: Annotated[str | None, Query()] = Field(max_length=1000)
     sort: Annotated[str | None, Query()] = Field(max_length=100, default=None)
+    cursor: Annotated[str | None, Query()] = Field(max_length=100, default=None)
     skip: int = Field(ge=0, default=0)
-    limit: int = Field(le=1000, default=100)
+    limit: int = Field(gt=0, le=1000, default=100)
 
+{self._get_pagination_code()}
 {self.token}
 """
 
+    def _get_pagination_code(self) -> str:
+        return (
+            """
+def encode_cursor(id: int) -> str:
+    return urlsafe_b64encode(str(id).encode()).decode()
+
+def decode_cursor(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    try:
+        return int(urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor!")
+
+def keyset_page(
+    request: Request, data: list[Any], next_id: int | None, limit: int, total: int | None = None
+) -> dict[str, Any]:
+    page: dict[str, Any] = {"data": data, "limit": limit, "total": total}
+    if next_id is not None:
+        page["next_cursor"] = encode_cursor(next_id)
+        page["next_page"] = str(request.url.include_query_params(cursor=page["next_cursor"]))
+    return page
+
+def offset_page(
+    request: Request, data: list[Any], skip: int, limit: int, total: int | None = None
+) -> dict[str, Any]:
+    page: dict[str, Any] = {
+        "data": data, "limit": limit, "offset": skip, "current_page": skip // limit + 1, "total": total
+    }
+    if len(data) == limit:
+        page["next_page"] = str(request.url.include_query_params(skip=skip + limit))
+    if skip > 0:
+        page["prev_page"] = str(request.url.include_query_params(skip=max(skip - limit, 0)))
+    return page
+
+def field_selector(schema: type[BaseModel]) -> Callable[..., list[str] | None]:
+    def select_fields(fields: Annotated[str | None, Query(max_length=1000)] = None) -> list[str] | None:
+        if not fields:
+            return None
+        selected = list(dict.fromkeys(["id", *(field.strip() for field in fields.split(",") if field.strip())]))
+        unknown = [field for field in selected if field not in schema.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields {unknown}!")
+        return selected
+    return select_fields
+"""
+            + self.render_response
+            + """
+def check_batch_size(items: list[Any], max_size: int) -> None:
+    if len(items) > max_size:
+        raise HTTPException(status_code=413, detail=f"Batch of {len(items)} items exceeds the limit of {max_size}!")
+"""
+        )
+
+    @staticmethod
+    def _get_render_response_code() -> str:
+        return """
+def render_response(content: Any, fields: list[str] | None) -> Any:
+    # sparse responses skip the response model, so only the requested attributes are read and serialized
+    if fields is None:
+        return content
+    if isinstance(content, dict):
+        content = {**content, "data": [{field: getattr(item, field) for field in fields} for item in content["data"]]}
+    else:
+        content = {field: getattr(content, field) for field in fields}
+    return JSONResponse(jsonable_encoder(content))
+"""
+
+    @staticmethod
+    def _get_orjson_response_code() -> str:
+        return """
+def render_response(content: Any, fields: list[str] | None, schema: type[BaseModel]) -> Any:
+    # full responses are validated once and serialized by pydantic, FastAPI doesn't validate returned responses again
+    if fields is None:
+        return Response(schema.model_validate(content).model_dump_json(), media_type="application/json")
+    # sparse responses skip the response model, so only the requested attributes are read and serialized
+    if isinstance(content, dict):
+        content = {**content, "data": [{field: getattr(item, field) for field in fields} for item in content["data"]]}
+    else:
+        content = {field: getattr(content, field) for field in fields}
+    return ORJSONResponse(jsonable_encoder(content))
+"""
+
     @staticmethod
     def _get_token_code() -> str:
         return """
@@ -13,13 +13,17 @@ class SecurityModuleCode(SimpleModuleCode):
         self.service_module = config.get_module_for_security(config.get_service_path(auth_obj))
         self.service_func = f'get_{auth_obj.name}_service'
         self.auth_name = auth_obj.name
+        self.session_module = config.get_session_module()
+        self.session_class = config.get_session_classname()
+        self.async_def = 'async def' if config.async_mode else 'def'
+        self.await_ = 'await ' if config.async_mode else ''
 
     def __str__(self) -> str:
         return f"""
 from datetime import datetime, timedelta
 from jose import jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from {self.session_module} import {self.session_class}
 from pydantic import EmailStr
 from {self.settings_module} import settings
 from {self.model_module} import {self.auth_class}
@@ -44,10 +48,10 @@ def is_valid_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def authenticate(
-    db: Session, username: str, password: str) -> {self.auth_class} | None:
+{self.async_def} authenticate(
+    db: {self.session_class}, username: str, password: str) -> {self.auth_class} | None:
     {self.auth_name}_service = {self.service_func}(db)
-    {self.auth_name} = {self.auth_name}_service.search_{self.auth_name}(attribute='username',
+    {self.auth_name} = {self.await_}{self.auth_name}_service.search_{self.auth_name}(attribute='username',
     value=username, sort=None, skip=0, limit=1)
     if {self.auth_name}:
         if is_valid_password(password, {self.auth_name}[0].password):
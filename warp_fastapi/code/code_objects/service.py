@@ -7,9 +7,11 @@ from .base import (
     AbstractFunctionCode,
     AbstractModuleCode,
     AbstractVariableCode,
+    CodeWriter,
     SimpleFunctionCode,
     SimpleVariable,
 )
+from .cache import get_related_namespaces, is_cached, uses_cache
 
 
 class ServiceInitFunction(AbstractFunctionCode):
@@ -34,6 +36,9 @@ class ServiceInitFunction(AbstractFunctionCode):
                     f'self.{config.get_repository_filename(obj)}', value=f'{config.get_repository_filename(obj)}'
                 )
             )
+        if uses_cache(app_obj):
+            self.parametars.append(SimpleVariable('cache', 'ResponseCache'))
+            content.append(SimpleVariable('self.cache', value='cache'))
         self.content = '\n'.join([str(c) for c in content])
 
 
@@ -46,9 +51,11 @@ class ServiceIdSearchFunc(AbstractFunctionCode):
                 app_obj.name, f'{config.get_create_cls_schema(app_obj)}|{config.get_edit_cls_schema(app_obj)}'
             ),
         ]
+        self.is_async = config.async_mode
         self.content = self.get_content(app_obj, config)
 
     def get_content(self, app_obj: AppObject, config: StructureConfig) -> str:
+        await_ = 'await ' if config.async_mode else ''
         init_vars: list[str] = []
         search_vars: list[str] = []
         return_vars: list[str] = []
@@ -61,9 +68,10 @@ class ServiceIdSearchFunc(AbstractFunctionCode):
             if app_obj.is_relationship_many(rel):
                 v1 = str(SimpleVariable(name, f'list[{config.get_read_cls_schema(obj)}]', '[]'))
                 search_fun = 'get_by_ids'
+            repo_name = config.get_repository_filename(obj)
             search_vars.append(
                 f'if {app_obj.name}.{name}_id:\n'
-                f'    {name} = self.{config.get_repository_filename(obj)}.{search_fun}({app_obj.name}.{name}_id)'
+                f'    {name} = {await_}self.{repo_name}.{search_fun}({app_obj.name}.{name}_id)'
             )
             init_vars.append(v1)
         r1 = '\n'.join(init_vars)
@@ -84,9 +92,11 @@ class ServicePrapareDBFucn(AbstractFunctionCode):
                 app_obj.name, f'{config.get_create_cls_schema(app_obj)}|{config.get_edit_cls_schema(app_obj)}'
             ),
         ]
+        self.is_async = config.async_mode
         self.content = self.get_content(app_obj, config)
 
     def get_content(self, app_obj: AppObject, config: StructureConfig) -> str:
+        await_ = 'await ' if config.async_mode else ''
         var_params: list[str] = []
         dict_params: list[str] = []
         id_params: list[str] = []
@@ -96,7 +106,7 @@ class ServicePrapareDBFucn(AbstractFunctionCode):
             dict_params.append(f"'{name}':{name}")
             id_params.append(f'"{name}_id"')
         return f"""
-{', '.join(var_params)} = self._get_id_data({app_obj.name})
+{', '.join(var_params)} = {await_}self._get_id_data({app_obj.name})
 id_data = {{{', '.join(dict_params)}}}
 data = {app_obj.name}.model_dump(exclude_unset=True,exclude={{{', '.join(id_params)}}})
 data.update(id_data)
@@ -104,11 +114,75 @@ return data
 """
 
 
+class ServicePrepareBulkFunc(AbstractFunctionCode):
+    def __init__(self, app_obj: AppObject, config: StructureConfig):
+        self.name = '_prepare_bulk_data'
+        create_schema = config.get_create_cls_schema(app_obj)
+        self.parametars = [
+            SimpleVariable('self'),
+            SimpleVariable('items', f'list[{create_schema}]|list[{config.get_bulk_edit_cls_schema(app_obj)}]'),
+            SimpleVariable('exclude_unset', 'bool', 'False'),
+        ]
+        self.is_async = config.async_mode
+        self.content = self.get_content(app_obj, config)
+
+    def get_content(self, app_obj: AppObject, config: StructureConfig) -> str:
+        await_ = 'await ' if config.async_mode else ''
+        # related ids of the whole batch are checked with one query per relationship
+        fetch_lines: list[str] = []
+        row_lines: list[str] = []
+        for rel in app_obj.all_relationships:
+            name = app_obj.get_rel_name(rel)
+            repo_name = config.get_repository_filename(app_obj.get_rel_obj(rel))
+            if app_obj.is_relationship_many(rel):
+                fetch_lines.append(
+                    f"{name}_ids = list({{id for row in rows for id in row.get('{name}_id') or []}})\n"
+                    f'{name} = {{obj.id: obj for obj in {await_}self.{repo_name}.get_by_ids({name}_ids)}} '
+                    f'if {name}_ids else {{}}'
+                )
+                row_lines.append(
+                    f"    {name}_id = row.pop('{name}_id', None)\n"
+                    f'    if {name}_id:\n'
+                    f"        row['{name}'] = [{name}[id] for id in {name}_id]"
+                )
+            else:
+                fetch_lines.append(
+                    f"{name}_ids = list({{row['{name}_id'] for row in rows if row.get('{name}_id')}})\n"
+                    f'if {name}_ids:\n'
+                    f'    {await_}self.{repo_name}.get_by_ids({name}_ids)'
+                )
+        rows_loop = ''
+        if row_lines:
+            rows_loop = 'for row in rows:\n' + '\n'.join(row_lines)
+        return f"""rows = [item.model_dump(exclude_unset=exclude_unset) for item in items]
+{chr(10).join(fetch_lines)}
+{rows_loop}
+return rows
+"""
+
+
 class ServiceGetCode(AbstractFunctionCode):
-    def __init__(self, app_obj: AppObject):
+    def __init__(self, app_obj: AppObject, config: StructureConfig = StructureConfig()):
         self.name = f'get_{app_obj.name}'
-        self.parametars = [SimpleVariable('self'), SimpleVariable('id', 'int')]
-        self.content = 'return self.repository.get_by_id(id)'
+        self.parametars = [
+            SimpleVariable('self'),
+            SimpleVariable('id', 'int'),
+            SimpleVariable('fields', 'list[str]|None', 'None'),
+        ]
+        self.is_async = config.async_mode
+        await_ = 'await ' if self.is_async else ''
+        self.content = f'return {await_}self.repository.get_by_id(id, fields)'
+        if is_cached(app_obj):
+            # cached responses hold every field, sparse objects are returned without caching them
+            self.content = f"""
+cached = {await_}self.cache.get('items', id, item_adapter)
+if cached is not None:
+    return cached
+db_{app_obj.name} = {await_}self.repository.get_by_id(id, fields)
+if fields is not None:
+    return db_{app_obj.name}
+return {await_}self.cache.set('items', id, db_{app_obj.name}, item_adapter)
+"""
 
 
 class ServiceActionCode(AbstractFunctionCode):
@@ -125,25 +199,83 @@ class ServiceActionCode(AbstractFunctionCode):
             action_params = ['id', f'{app_obj.name}_data']
             self.parametars.append(SimpleVariable('id', 'int'))
         self.parametars.append(SimpleVariable(app_obj.name, obj_type))
+        self.is_async = config.async_mode
+        await_ = 'await ' if config.async_mode else ''
         prepare_data = f'{app_obj.name}_data = {app_obj.name}.model_dump()'
         if app_obj.all_relationships:
-            prepare_data = f'{app_obj.name}_data = self._prepare_db_data({app_obj.name})'
+            prepare_data = f'{app_obj.name}_data = {await_}self._prepare_db_data({app_obj.name})'
+        invalidate = get_invalidate_code(app_obj, config, '' if action == 'create' else 'id')
         self.content = f"""
 {prepare_data}
-db_{app_obj.name} = self.repository.{action}({', '.join(action_params)})
+db_{app_obj.name} = {await_}self.repository.{action}({', '.join(action_params)})
+{invalidate}
 return db_{app_obj.name}
 """
 
 
 class ServiceDeleteCode(AbstractFunctionCode):
-    def __init__(self, app_obj: AppObject):
+    def __init__(self, app_obj: AppObject, config: StructureConfig = StructureConfig()):
         self.name = f'delete_{app_obj.name}'
         self.parametars = [SimpleVariable('self'), SimpleVariable('id', 'int')]
-        self.content = 'return self.repository.delete(id)'
+        self.is_async = config.async_mode
+        self.content = f"return {'await ' if self.is_async else ''}self.repository.delete(id)"
+        if uses_cache(app_obj):
+            self.content = f"""
+deleted = {'await ' if self.is_async else ''}self.repository.delete(id)
+{get_invalidate_code(app_obj, config, 'id')}
+return deleted
+"""
+
+
+class ServiceBulkActionCode(AbstractFunctionCode):
+    def __init__(self, app_obj: AppObject, action: Literal['create', 'edit'], config: StructureConfig):
+        self.name = f'bulk_{action}_{app_obj.name}'
+        item_type = config.get_create_cls_schema(app_obj)
+        exclude_unset = ''
+        prepare_params = 'items'
+        if action == 'edit':
+            item_type = config.get_bulk_edit_cls_schema(app_obj)
+            exclude_unset = 'exclude_unset=True'
+            prepare_params = 'items, exclude_unset=True'
+        self.parametars = [SimpleVariable('self'), SimpleVariable('items', f'list[{item_type}]')]
+        self.is_async = config.async_mode
+        await_ = 'await ' if config.async_mode else ''
+        prepare_data = f'rows = [item.model_dump({exclude_unset}) for item in items]'
+        if app_obj.all_relationships:
+            prepare_data = f'rows = {await_}self._prepare_bulk_data({prepare_params})'
+        repo_action = 'bulk_create' if action == 'create' else 'bulk_update'
+        self.content = f"""
+{prepare_data}
+return {await_}self.repository.{repo_action}(rows)
+"""
+        if uses_cache(app_obj):
+            invalidate = get_invalidate_code(
+                app_obj, config, '' if action == 'create' else '*[item.id for item in items]'
+            )
+            self.content = f"""
+{prepare_data}
+db_results = {await_}self.repository.{repo_action}(rows)
+{invalidate}
+return db_results
+"""
+
+
+class ServiceBulkDeleteCode(AbstractFunctionCode):
+    def __init__(self, app_obj: AppObject, config: StructureConfig = StructureConfig()):
+        self.name = f'bulk_delete_{app_obj.name}'
+        self.parametars = [SimpleVariable('self'), SimpleVariable('ids', 'list[int]')]
+        self.is_async = config.async_mode
+        self.content = f"return {'await ' if self.is_async else ''}self.repository.bulk_delete(ids)"
+        if uses_cache(app_obj):
+            self.content = f"""
+deleted = {'await ' if self.is_async else ''}self.repository.bulk_delete(ids)
+{get_invalidate_code(app_obj, config, '*ids')}
+return deleted
+"""
 
 
 class ServiceSearchCode(AbstractFunctionCode):
-    def __init__(self, app_obj: AppObject):
+    def __init__(self, app_obj: AppObject, config: StructureConfig = StructureConfig()):
         self.name = f'search_{app_obj.name}'
         self.parametars = [
             SimpleVariable('self'),
@@ -152,10 +284,74 @@ class ServiceSearchCode(AbstractFunctionCode):
             SimpleVariable('sort', 'str|None'),
             SimpleVariable('skip', 'int'),
             SimpleVariable('limit', 'int'),
+            SimpleVariable('fields', 'list[str]|None', 'None'),
         ]
-        self.content = """
-db_results = self.repository.search(attribute, value, sort, skip, limit)
+        self.is_async = config.async_mode
+        await_ = 'await ' if self.is_async else ''
+        self.content = f"""
+db_results = {await_}self.repository.search(attribute, value, sort, skip, limit, fields)
 return db_results
+"""
+        if is_cached(app_obj):
+            self.content = f"""
+key = ('search', attribute, value, sort, skip, limit)
+cached = {await_}self.cache.get('lists', key, list_adapter)
+if cached is not None:
+    return cached
+db_results = {await_}self.repository.search(attribute, value, sort, skip, limit, fields)
+if fields is not None:
+    return db_results
+return {await_}self.cache.set('lists', key, db_results, list_adapter)
+"""
+
+
+class ServicePageCode(AbstractFunctionCode):
+    def __init__(self, app_obj: AppObject, config: StructureConfig = StructureConfig()):
+        self.name = f'page_{app_obj.name}'
+        self.parametars = [
+            SimpleVariable('self'),
+            SimpleVariable('cursor', 'int|None'),
+            SimpleVariable('limit', 'int'),
+            SimpleVariable('attribute', 'str|None', 'None'),
+            SimpleVariable('value', 'str|None', 'None'),
+            SimpleVariable('fields', 'list[str]|None', 'None'),
+        ]
+        self.is_async = config.async_mode
+        await_ = 'await ' if self.is_async else ''
+        self.content = f'return {await_}self.repository.get_page(cursor, limit, attribute, value, fields)'
+        if is_cached(app_obj):
+            self.content = f"""
+key = ('page', cursor, limit, attribute, value)
+cached = {await_}self.cache.get('lists', key, page_adapter)
+if cached is not None:
+    return cached
+db_page = {await_}self.repository.get_page(cursor, limit, attribute, value, fields)
+if fields is not None:
+    return db_page
+return {await_}self.cache.set('lists', key, db_page, page_adapter)
+"""
+
+
+class ServiceCountCode(AbstractFunctionCode):
+    def __init__(self, app_obj: AppObject, config: StructureConfig = StructureConfig()):
+        self.name = f'count_{app_obj.name}'
+        self.parametars = [
+            SimpleVariable('self'),
+            SimpleVariable('attribute', 'str|None', 'None'),
+            SimpleVariable('value', 'str|None', 'None'),
+        ]
+        self.is_async = config.async_mode
+        await_ = 'await ' if self.is_async else ''
+        count = 'estimate_count' if app_obj.config.total == 'estimate' else 'count'
+        self.content = f'return {await_}self.repository.{count}(attribute, value)'
+        if is_cached(app_obj):
+            self.content = f"""
+key = ('count', attribute, value)
+cached = {await_}self.cache.get('lists', key, count_adapter)
+if cached is not None:
+    return cached
+total = {await_}self.repository.{count}(attribute, value)
+return {await_}self.cache.set('lists', key, total, count_adapter)
 """
 
 
@@ -168,25 +364,37 @@ class ServiceClassCode(AbstractClassCode):
             self.methods += [
                 ServiceIdSearchFunc(app_obj, config),
                 ServicePrapareDBFucn(app_obj, config),
+                ServicePrepareBulkFunc(app_obj, config),
             ]
         self.methods += [
-            ServiceGetCode(app_obj),
+            ServiceGetCode(app_obj, config),
             ServiceActionCode(app_obj, action='create', config=config),
             ServiceActionCode(app_obj, action='update', config=config),
             ServiceActionCode(app_obj, action='edit', config=config),
-            ServiceDeleteCode(app_obj),
-            ServiceSearchCode(app_obj),
+            ServiceDeleteCode(app_obj, config),
+            ServiceBulkActionCode(app_obj, action='create', config=config),
+            ServiceBulkActionCode(app_obj, action='edit', config=config),
+            ServiceBulkDeleteCode(app_obj, config),
+            ServiceSearchCode(app_obj, config),
+            ServicePageCode(app_obj, config),
         ]
+        if app_obj.config.total != 'skip':
+            self.methods.append(ServiceCountCode(app_obj, config))
 
 
 class GetServiceFunc(SimpleFunctionCode):
     def __init__(self, app_obj: AppObject, config: StructureConfig):
         self.name = f'get_{app_obj.name}_service'
-        self.parametars = [SimpleVariable('db', 'Session')]
+        self.parametars = [SimpleVariable('db', config.get_session_classname())]
         return_params = [f'{config.get_repo_classname(app_obj)}(db)']
         for rel in app_obj.all_relationships:
             obj = app_obj.get_rel_obj(rel)
             return_params.append(f'{config.get_repository_filename(obj)}={config.get_repo_classname(obj)}(db)')
+        if uses_cache(app_obj):
+            self.parametars.append(SimpleVariable('cache', 'CacheBackend|None', 'None'))
+            ttl = app_obj.config.cache.ttl if app_obj.config.cache else 0
+            related = ''.join(f"'{name}', " for name in get_related_namespaces(app_obj))
+            return_params.append(f"cache=ResponseCache(cache or get_cache(), '{app_obj.name}', {ttl}, ({related}))")
         self.content = f"return {config.get_service_classname(app_obj)}({', '.join(return_params)})"
 
 
@@ -204,22 +412,34 @@ class ServiceModuleCode(AbstractModuleCode):
         edit_schema = config.get_edit_cls_schema(app_obj)
         response_schema = config.get_read_cls_schema(app_obj)
         db_schema = config.get_db_cls_schema(app_obj)
+        bulk_edit_schema = config.get_bulk_edit_cls_schema(app_obj)
         repo_modul = config.get_module_for_service(app_obj, config.get_repository_path(app_obj))
         repo_name = config.get_repo_classname(app_obj)
         self.imports = {
-            f'{schema_module}': {create_schema, edit_schema, response_schema, db_schema},
+            f'{schema_module}': {create_schema, edit_schema, bulk_edit_schema, response_schema, db_schema},
             f'{repo_modul}': {repo_name},
-            'sqlalchemy.orm': {'Session'},
+            config.get_session_module(): {config.get_session_classname()},
         }
         self.fill_imports(app_obj, config)
+        if uses_cache(app_obj):
+            cache_module = config.get_module_for_service(app_obj, config.get_cache_path())
+            self.imports[cache_module] = {'CacheBackend', 'ResponseCache', 'get_cache'}
+        if is_cached(app_obj):
+            self.imports['pydantic'] = {'TypeAdapter'}
+            self.variables = [
+                SimpleVariable('item_adapter', value=f'TypeAdapter({response_schema})'),
+                SimpleVariable('list_adapter', value=f'TypeAdapter(list[{response_schema}])'),
+                SimpleVariable('page_adapter', value=f'TypeAdapter(tuple[list[{response_schema}], int | None])'),
+            ]
+            if app_obj.config.total != 'skip':
+                self.variables.append(SimpleVariable('count_adapter', value='TypeAdapter(int)'))
         self.classes = [ServiceClassCode(app_obj, config)]
 
-    def __str__(self) -> str:
-        return f"""
-{self.imports_code}
-{self.classes_code}
-{self.functions_code}
-"""
+    def render(self, writer: CodeWriter) -> None:
+        self.render_imports(writer)
+        self.render_variables(writer)
+        self.render_classes(writer)
+        self.render_functions(writer)
 
     def fill_imports(self, app_obj: AppObject, config: StructureConfig) -> None:
         for rel in app_obj.all_relationships:
@@ -240,3 +460,9 @@ class ServiceModuleCode(AbstractModuleCode):
                 )  # pragma: no cover -> response schema should be in specific file
             else:
                 self.imports[schema_module] = {response_class}
+
+
+def get_invalidate_code(app_obj: AppObject, config: StructureConfig, ids: str) -> str:
+    if not uses_cache(app_obj):
+        return ''
+    return f"{'await ' if config.async_mode else ''}self.cache.invalidate({ids})"
@@ -24,6 +24,16 @@ class Settings(BaseSettings):
     PROJECT_NAME:str = '{self.project_name}'
     BACKEND_CORS_ORIGINS: list[AnyHttpUrl] = []
     ALGORITHM:str = "HS256"
+    BULK_MAX_BATCH_SIZE: int = 1000
+    COUNT_ESTIMATE_MIN_ROWS: int = 10000
+    CACHE_URL: str | None = None
+    CACHE_MAX_SIZE: int = 1024
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int | None = None
 
 
 
@@ -5,10 +5,14 @@ from ...config import StructureConfig
 from ...relationships import many_to_many
 from .base import (
     AbstractModuleCode,
+    AbstractVariableCode,
+    CodeWriter,
     SimpleDecoratorCode,
     SimpleFunctionCode,
     SimpleVariable,
 )
+from .cache import is_cached, uses_cache
+from .model import get_load_strategy
 
 pytest_dec = SimpleDecoratorCode(
     name='pytest.fixture',
@@ -19,15 +23,17 @@ class ConfTestModuleCode(AbstractModuleCode):
     def __init__(self, app_objs: list[AppObject], config: StructureConfig, secure: bool = False):
         self.type_checking_imports = {}
         self.classes = []
-        self.functions = list(self.get_client_functions(secure))
         self.variables = []
         self.config = config
+        self.cached = any(uses_cache(obj) for obj in app_objs)
+        self.functions = list(self.get_client_functions(secure))
         self.folder = ''
         self.filename = 'conftest'
         self.imports = {
             'pytest': set(),
-            'sqlalchemy': {'create_engine'},
+            'sqlalchemy': {'create_engine', 'event'},
             'sqlalchemy.orm': {'sessionmaker'},
+            'sqlalchemy.engine': {'Engine'},
             'sqlalchemy.pool': {'StaticPool'},
             'fastapi': {'FastAPI'},
             'fastapi.testclient': {'TestClient'},
@@ -35,15 +41,18 @@ class ConfTestModuleCode(AbstractModuleCode):
             config.get_module_for_tests(config.get_dependency_path()): {'get_db', 'get_current_user'},
             f'{config.app_foldername}.main': {'app'},
         }
+        if config.async_mode:
+            self.imports['sqlalchemy'] = {'event'}
+            del self.imports['sqlalchemy.orm']
+            self.imports['asyncio'] = set()
+            self.imports['sqlalchemy.ext.asyncio'] = {'create_async_engine', 'async_sessionmaker'}
+        if self.cached:
+            self.imports[config.get_module_for_tests(config.get_cache_path())] = {'MemoryCache', 'get_cache'}
         self.create_fixtures(app_objs)
 
-    def __str__(self) -> str:
-        return f"""
-{self.imports_code}
-{self.functions_code}
-""".strip(
-            '\n'
-        )
+    def render(self, writer: CodeWriter) -> None:
+        self.render_imports(writer)
+        self.render_functions(writer)
 
     def get_client_functions(self, secure: bool) -> list[SimpleFunctionCode]:
         base_content = """
@@ -53,7 +62,7 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
 Base.metadata.create_all(bind=engine)
 
 def override_get_db():
@@ -66,6 +75,13 @@ def override_get_db():
 app.dependency_overrides[get_db] = override_get_db
 return app
 """
+        if self.config.async_mode:
+            base_content = self._async_base_content()
+        if self.cached:
+            # every test app gets an empty cache, like it gets an empty database
+            base_content = base_content.replace(
+                'return app', 'cache = MemoryCache()\napp.dependency_overrides[get_cache] = lambda: cache\nreturn app'
+            )
         base_f = SimpleFunctionCode(
             name='base_client',
             content=base_content,
@@ -80,7 +96,21 @@ with TestClient(base_client) as c:
             parametars=[SimpleVariable('base_client', 'FastAPI')],
             decorators=[pytest_dec],
         )
-        res = [base_f, client_f]
+        statements_content = """
+executed: list[str] = []
+
+def count(conn, cursor, statement, parameters, context, executemany):
+    executed.append(statement)
+
+event.listen(Engine, "before_cursor_execute", count)
+yield executed
+event.remove(Engine, "before_cursor_execute", count)"""
+        statements_f = SimpleFunctionCode(
+            name='statements',
+            content=statements_content,
+            decorators=[pytest_dec],
+        )
+        res = [base_f, client_f, statements_f]
         if secure:
             secure_content = """
 def get_current_user_overide():
@@ -98,6 +128,27 @@ with TestClient(base_client) as c:
             res.append(secure_f)
         return res
 
+    @staticmethod
+    def _async_base_content() -> str:
+        return """
+TEST_DB = "sqlite+aiosqlite://"
+engine = create_async_engine(TEST_DB, poolclass=StaticPool)
+TestingSessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+async def init_models():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+asyncio.run(init_models())
+
+async def override_get_db():
+    async with TestingSessionLocal() as db:
+        yield db
+
+app.dependency_overrides[get_db] = override_get_db
+return app
+"""
+
     def create_fixtures(self, app_objs: list[AppObject]) -> None:
         for app_obj in app_objs:
             content = self.get_test_data(app_obj)
@@ -133,13 +184,9 @@ class TestModuleCode(AbstractModuleCode):
         self.imports = {'pytest': set(), 'fastapi.testclient': {'TestClient'}, secure_module: {'is_valid_password'}}
         self.create_tests(app_objs)
 
-    def __str__(self) -> str:
-        return f"""
-{self.imports_code}
-{self.functions_code}
-""".strip(
-            '\n'
-        )
+    def render(self, writer: CodeWriter) -> None:
+        self.render_imports(writer)
+        self.render_functions(writer)
 
     def create_tests(self, app_objs: list[AppObject]) -> None:
         for app_obj in app_objs:
@@ -150,6 +197,10 @@ class TestModuleCode(AbstractModuleCode):
                 content=cont,
             )
             self.functions.append(f)
+            self.functions.append(self.get_page_test(app_obj))
+            owner_test = self.get_owner_test(app_obj)
+            if owner_test:
+                self.functions.append(owner_test)
 
     def get_test_data(self, app_obj: AppObject) -> tuple[list[SimpleVariable], str]:
         client = 'client'
@@ -158,10 +209,13 @@ class TestModuleCode(AbstractModuleCode):
         params = [
             SimpleVariable(client, 'TestClient'),
             SimpleVariable(f'get_{app_obj.name}', 'dict[str,str|int]'),
+            SimpleVariable('statements', 'list[str]'),
         ]
         init_creation: dict[str, str] = {}
         assert_att: list[str] = []
         order: dict[str, int] = {}
+        replaced: dict[str, str] = {}
+        children: dict[str, AppObject] = {}
         skip_param = app_obj.name
         for att in app_obj.attributes:
             res = get_att_data(att)
@@ -178,6 +232,15 @@ class TestModuleCode(AbstractModuleCode):
                 # assert_att.append(f"assert data['{rel_name}_id'] == [1]")
                 if rel.relationship_type == many_to_many:
                     check_creation(rel_obj, init_creation, order, 1, params, skip_param)
+                    replaced[f'{rel_name}_id'] = '[1]'
+                else:
+                    # a child references the object under test, so it is created once that object exists
+                    children[f'new_{rel_name}'] = rel_obj
+                    replaced[f'{rel_name}_id'] = f"[new_{rel_name}['id']]"
+                    add_param(params, rel_obj)
+                    for child_rel in rel_obj.all_relationships:
+                        if not rel_obj.is_relationship_many(child_rel):
+                            check_creation(rel_obj.get_rel_obj(child_rel), init_creation, order, 1, params, skip_param)
             else:
                 check_creation(rel_obj, init_creation, order, 1, params, skip_param)
                 assert_att.append(f"assert data['{rel_name}_id'] == 1")
@@ -188,6 +251,7 @@ class TestModuleCode(AbstractModuleCode):
             creation_code_list.append(init_creation[key])
 
         init_creation_code = '\n'.join(creation_code_list)
+        replace_code = self.get_replace_code(app_obj, client, replaced, children)
         content = f"""
 {init_creation_code}
 
@@ -204,6 +268,13 @@ data = response.json()
 assert data["id"] == id
 {assert_att_code}
 
+statements.clear()
+response = {client}.patch(f"/api/v1/{app_obj.route_name}/{{id}}",json=get_{app_obj.name})
+assert response.status_code == 200, response.text
+data = response.json()
+{assert_att_code}
+{self.get_patch_check(app_obj)}
+{replace_code}
 response = {client}.delete(f"/api/v1/{app_obj.route_name}/{{id}}")
 assert response.status_code == 200, response.text
 data = response.json()
@@ -213,9 +284,272 @@ response = {client}.get(f"/api/v1/{app_obj.route_name}/{{id}}")
 assert response.status_code == 404, response.text
 data = response.json()
 assert data["detail"] == f"{app_obj.class_name} with ID {{id}} not found!"
+
+response = {client}.post('/api/v1/{app_obj.route_name}/bulk',json=[get_{app_obj.name}])
+assert response.status_code == 201, response.text
+data = response.json()[0]
+{assert_att_code}
+
+response = {client}.request("DELETE", '/api/v1/{app_obj.route_name}/bulk', json=[data["id"]])
+assert response.status_code == 200, response.text
+assert response.json()["deleted"] == 1
 """
         return params, content
 
+    def get_patch_check(self, app_obj: AppObject) -> str:
+        if not app_obj.attributes and all(app_obj.is_relationship_many(rel) for rel in app_obj.all_relationships):
+            return 'assert all(statement.startswith("SELECT") for statement in statements), statements'
+        eager = ('joined', 'selectin')
+        # the response reads its collections and the eagerly loaded to-one relationships after the UPDATE
+        loads = 0
+        nested = False
+        for rel in app_obj.all_relationships:
+            if app_obj.is_relationship_many(rel) or get_load_strategy(rel, app_obj, self.config) in eager:
+                loads += 1
+                rel_obj = app_obj.get_rel_obj(rel)
+                nested = nested or any(
+                    get_load_strategy(related, rel_obj, self.config) in eager for related in rel_obj.all_relationships
+                )
+        table = app_obj.table_name
+        check = f"""writes = [index for index, statement in enumerate(statements) if not statement.startswith("SELECT")]
+assert len(writes) == 1, statements
+update = statements[writes[0]:]
+assert update[0].startswith("UPDATE {table} SET") and " RETURNING " in update[0], update
+# the row comes back with the UPDATE, only its relationships are selected afterwards
+"""
+        if nested:
+            # the related objects load their own relationships too, how many depends on the data
+            refresh = f'FROM {table} WHERE {table}.id = ?'
+            return check + f'assert not [statement for statement in update if "{refresh}" in statement], update'
+        expected = ', '.join(['"UPDATE"'] + ['"SELECT"'] * loads)
+        return check + f'assert [statement.split()[0] for statement in update] == [{expected}], update'
+
+    @staticmethod
+    def get_page_test(app_obj: AppObject) -> SimpleFunctionCode:
+        client = 'secure_client' if app_obj.secure else 'client'
+        params = [SimpleVariable(client, 'TestClient'), SimpleVariable(f'get_{app_obj.name}', 'dict[str,str|int]')]
+        init_creation: dict[str, str] = {}
+        order: dict[str, int] = {}
+        for rel in app_obj.all_relationships:
+            if not app_obj.is_relationship_many(rel):
+                check_creation(app_obj.get_rel_obj(rel), init_creation, order, 1, params, app_obj.name)
+        sorted_order = dict(sorted(order.items(), key=lambda x: x[1], reverse=True))
+        init_creation_code = '\n'.join(init_creation[key] for key in sorted_order.keys())
+        content = f"""
+{init_creation_code}
+ids: list[int] = []
+for index in range(5):
+    response = {client}.post('/api/v1/{app_obj.route_name}',json={get_row(app_obj)})
+    assert response.status_code == 201, response.text
+    ids.append(response.json()["id"])
+
+seen: list[int] = []
+pages = 0
+params: dict[str, str | int] = {{"limit": 2}}
+while True:
+    response = {client}.get('/api/v1/{app_obj.route_name}/', params=params)
+    assert response.status_code == 200, response.text
+    page = response.json()
+    seen += [row["id"] for row in page["data"]]
+    pages += 1
+    if page["next_cursor"] is None:
+        break
+    params["cursor"] = page["next_cursor"]
+# the cursor walks every row once and in order
+assert pages == 3
+assert seen == sorted(ids)
+
+response = {client}.get('/api/v1/{app_obj.route_name}/', params={{"cursor": "not a cursor"}})
+assert response.status_code == 400, response.text
+assert response.json()["detail"] == "Invalid cursor!"
+"""
+        return SimpleFunctionCode(name=f'test_{app_obj.name}_pages', parametars=list(params), content=content)
+
+    @staticmethod
+    def get_owner_test(app_obj: AppObject) -> SimpleFunctionCode | None:
+        if not is_cached(app_obj):
+            return None
+        children = [
+            rel
+            for rel in app_obj.all_relationships
+            if rel.relationship_type != many_to_many
+            and app_obj.is_relationship_many(rel)
+            and not app_obj.is_relationship_self(rel)
+        ]
+        if not children:
+            return None
+        rel = children[0]
+        rel_name = app_obj.get_rel_name(rel)
+        child = app_obj.get_rel_obj(rel)
+        client = 'secure_client' if app_obj.secure else 'client'
+        params = [SimpleVariable(client, 'TestClient'), SimpleVariable(f'get_{app_obj.name}', 'dict[str,str|int]')]
+        add_param(params, child)
+        init_creation: dict[str, str] = {}
+        order: dict[str, int] = {}
+        for obj in (app_obj, child):
+            for obj_rel in obj.all_relationships:
+                if not obj.is_relationship_many(obj_rel):
+                    check_creation(obj.get_rel_obj(obj_rel), init_creation, order, 1, params, app_obj.name)
+        sorted_order = dict(sorted(order.items(), key=lambda x: x[1], reverse=True))
+        init_creation_code = '\n'.join(init_creation[key] for key in sorted_order.keys())
+        route = f'/api/v1/{app_obj.route_name}'
+        content = f"""
+{init_creation_code}
+rows = [{get_row(app_obj)} for index in range(2)]
+owners: list[int] = []
+for row in rows:
+    response = {client}.post('{route}',json=row)
+    assert response.status_code == 201, response.text
+    owners.append(response.json()["id"])
+child = {client}.post('/api/v1/{child.route_name}',json=get_{child.name}).json()
+response = {client}.put(f"{route}/{{owners[0]}}",json={{**rows[0], '{rel_name}_id': [child['id']]}})
+assert response.status_code == 200, response.text
+# the first owner is cached with the child before the child moves to the second one
+response = {client}.get(f"{route}/{{owners[0]}}")
+assert response.json()['{rel_name}_id'] == [child['id']]
+response = {client}.put(f"{route}/{{owners[1]}}",json={{**rows[1], '{rel_name}_id': [child['id']]}})
+assert response.status_code == 200, response.text
+response = {client}.get(f"{route}/{{owners[0]}}")
+assert response.status_code == 200, response.text
+assert response.json()['{rel_name}_id'] == []
+"""
+        return SimpleFunctionCode(name=f'test_{app_obj.name}_previous_owner', parametars=list(params), content=content)
+
+    @staticmethod
+    def get_replace_code(
+        app_obj: AppObject, client: str, replaced: dict[str, str], children: dict[str, AppObject]
+    ) -> str:
+        if not replaced:
+            return ''
+        code = ''.join(
+            f"\n{name} = {client}.post('/api/v1/{obj.route_name}',json=get_{obj.name}).json()"
+            for name, obj in children.items()
+        )
+        # a put replaces the collections, a second one empties them again before the delete cascades
+        for values in (replaced, {name: '[]' for name in replaced}):
+            assignments = ', '.join(f"'{name}': {value}" for name, value in values.items())
+            asserts = '\n'.join(f"assert data['{name}'] == {value}" for name, value in values.items())
+            code += f"""
+response = {client}.put(f"/api/v1/{app_obj.route_name}/{{id}}",json={{**get_{app_obj.name}, {assignments}}})
+assert response.status_code == 200, response.text
+data = response.json()
+{asserts}
+"""
+        return code
+
+
+class ListBenchModuleCode(AbstractModuleCode):
+    """
+    Benchmark of the list endpoints, pytest only runs it when the file is passed explicitly.
+
+    Every list endpoint is timed end to end and compared with the response renderers of FastAPI on the same page.
+    """
+
+    def __init__(self, app_objs: list[AppObject], config: StructureConfig):
+        self.type_checking_imports = {}
+        self.classes = []
+        self.config = config
+        self.folder = ''
+        self.filename = 'bench_list'
+        self.imports = {
+            'time': set(),
+            'collections.abc': {'Callable'},
+            'fastapi.responses': {'JSONResponse', 'ORJSONResponse', 'Response'},
+            'fastapi.testclient': {'TestClient'},
+            'pydantic': {'BaseModel'},
+        }
+        self.variables = [SimpleVariable('ROWS', 'int', '500'), SimpleVariable('ROUNDS', 'int', '50')]
+        self.functions = [self.get_bench_function(), self.get_report_function()]
+        # auth objects are skipped, hashing the passwords of the rows would take most of the run
+        for app_obj in app_objs:
+            if not isinstance(app_obj, AuthObject):
+                self.functions.append(self.get_list_bench(app_obj))
+
+    def render(self, writer: CodeWriter) -> None:
+        self.render_imports(writer)
+        self.render_variables(writer)
+        self.render_functions(writer)
+
+    @staticmethod
+    def get_bench_function() -> SimpleFunctionCode:
+        content = """
+start = time.perf_counter()
+for _ in range(ROUNDS):
+    func()
+return ROUNDS / (time.perf_counter() - start)
+"""
+        params: list[AbstractVariableCode] = [SimpleVariable('func', 'Callable[[], object]')]
+        return SimpleFunctionCode(name='bench', parametars=params, return_value='float', content=content)
+
+    @staticmethod
+    def get_report_function() -> SimpleFunctionCode:
+        content = """
+page = client.get(url).json()
+# the renderers validate the same page and only differ in how it is serialized
+results = {
+    "endpoint": bench(lambda: client.get(url)),
+    "json": bench(lambda: JSONResponse(schema.model_validate(page).model_dump(mode="json"))),
+    "orjson": bench(lambda: ORJSONResponse(schema.model_validate(page).model_dump(mode="json"))),
+    "model_dump_json": bench(
+        lambda: Response(schema.model_validate(page).model_dump_json(), media_type="application/json")
+    ),
+}
+print(f"\\n{url}, {len(page['data'])} items")
+for name, per_second in results.items():
+    print(f"  {name:<16} {per_second:10.0f}/s")
+"""
+        params: list[AbstractVariableCode] = [
+            SimpleVariable('client', 'TestClient'),
+            SimpleVariable('url', 'str'),
+            SimpleVariable('schema', 'type[BaseModel]'),
+        ]
+        return SimpleFunctionCode(name='report', parametars=params, return_value='None', content=content)
+
+    def get_list_bench(self, app_obj: AppObject) -> SimpleFunctionCode:
+        client = 'secure_client' if app_obj.secure else 'client'
+        params = [SimpleVariable(client, 'TestClient'), SimpleVariable(f'get_{app_obj.name}', 'dict[str,str|int]')]
+        init_creation: dict[str, str] = {}
+        order: dict[str, int] = {}
+        for rel in app_obj.all_relationships:
+            if rel.relationship_type == many_to_many or not app_obj.is_relationship_many(rel):
+                check_creation(app_obj.get_rel_obj(rel), init_creation, order, 1, params, app_obj.name, client)
+        sorted_order = sorted(order, key=lambda name: order[name], reverse=True)
+        init_creation_code = '\n'.join(init_creation[name] for name in sorted_order)
+        # string attributes get a suffix so unique columns and indexes accept the rows
+        row_values = [
+            f'"{att.name}": f"{get_att_data(att)}{{i}}"' for att in app_obj.attributes if att.type.python_type == 'str'
+        ]
+        row_values += [f'"{att.name}": i' for att in app_obj.attributes if att.unique and att.type.python_type == 'int']
+        page_schema = self.config.get_pagination_cls_schema(app_obj)
+        schema_module = self.config.get_module_for_tests(self.config.get_schema_path(app_obj))
+        self.imports.setdefault(schema_module, set()).add(page_schema)
+        content = f"""
+{init_creation_code}
+rows = [{{**get_{app_obj.name}, {', '.join(row_values)}}} for i in range(ROWS)]
+response = {client}.post("/api/v1/{app_obj.route_name}/bulk", json=rows)
+assert response.status_code == 201, response.text
+report({client}, "/api/v1/{app_obj.route_name}/?limit=100", {page_schema})
+"""
+        return SimpleFunctionCode(
+            name=f'test_list_{app_obj.name}', parametars=list(params), return_value='None', content=content
+        )
+
+
+def get_row(app_obj: AppObject) -> str:
+    # unique attributes get a different value for every row
+    overrides: list[str] = []
+    for att in app_obj.attributes:
+        if att.unique and att.type.python_type == 'str':
+            overrides.append(f"'{att.name}': f'{{index}}{get_att_data(att)}'")
+        elif att.unique and att.type.python_type == 'int':
+            overrides.append(f"'{att.name}': index")
+    return f"{{**get_{app_obj.name}, {', '.join(overrides)}}}" if overrides else f'get_{app_obj.name}'
+
+
+def add_param(params: list[SimpleVariable], obj: AppObject) -> None:
+    if all(param.name != f'get_{obj.name}' for param in params):
+        params.append(SimpleVariable(f'get_{obj.name}', 'dict[str,str|int]'))
+
 
 def check_creation(
     obj: AppObject,
@@ -224,18 +558,19 @@ def check_creation(
     order_num: int,
     params: list[SimpleVariable],
     skip_param: str,
+    client: str = 'client',
 ) -> None:
     name = obj.name
     if not init_creation.get(name) and name != skip_param:
-        init_creation[name] = f"client.post('/api/v1/{obj.route_name}',json=get_{name})"
-        params.append(SimpleVariable(f'get_{name}', 'dict[str,str|int]'))
+        init_creation[name] = f"{client}.post('/api/v1/{obj.route_name}',json=get_{name})"
+        add_param(params, obj)
         order[name] = order_num
         order_num += 1
         for rel in obj.all_relationships:
             to_create: bool = rel.relationship_type == many_to_many or not obj.is_relationship_many(rel)
             if to_create:
                 new_obj = obj.get_rel_obj(rel)
-                check_creation(new_obj, init_creation, order, order_num, params, skip_param)
+                check_creation(new_obj, init_creation, order, order_num, params, skip_param, client)
 
 
 # TODO: this should be change to get data from faker library
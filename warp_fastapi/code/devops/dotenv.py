@@ -1,6 +1,7 @@
-def get_sqlite_env() -> str:
-    return """
-SQLALCHEMY_DATABASE_URL = "sqlite:///./database.db"
+def get_sqlite_env(async_mode: bool = False) -> str:
+    driver = 'sqlite+aiosqlite' if async_mode else 'sqlite'
+    return f"""
+SQLALCHEMY_DATABASE_URL = "{driver}:///./database.db"
 """
 
 
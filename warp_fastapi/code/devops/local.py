@@ -1,5 +1,10 @@
-def get_startup_script() -> str:
-    return """#!/bin/bash
+from ...config import StructureConfig
+
+
+def get_startup_script(config: StructureConfig, production: bool = False) -> str:
+    app = f'{config.app_foldername}.main:app'
+    server = f'gunicorn {app} -c gunicorn.conf.py' if production else f'uvicorn {app} --reload'
+    return f"""#!/bin/bash
 echo "Creating virtual enviroment .venv"
 python -m venv .venv
 source ./.venv/Scripts/activate
@@ -14,4 +19,4 @@ mypy .
 echo "tests"
 pytest --cov
 echo "starting app"
-uvicorn app.main:app --reload"""
+{server}"""
@@ -0,0 +1,75 @@
+import ast
+
+import black
+
+BLACK_MODE = black.Mode()
+
+
+def format_code(code: str) -> str:
+    if not code.strip():
+        return code
+    return black.format_str(remove_unused_imports(code), mode=BLACK_MODE)
+
+
+def remove_unused_imports(code: str) -> str:
+    # templates import everything a module might need, drop what the rendered module doesn't use
+    tree = ast.parse(code)
+    used_names = get_used_names(tree)
+    lines = code.split('\n')
+    replacements: list[tuple[int, int, list[str]]] = []
+    for body, nested in get_import_bodies(tree):
+        body_replacements: list[tuple[int, int, list[str]]] = []
+        for node in body:
+            if not isinstance(node, ast.Import | ast.ImportFrom) or is_kept_import(node, lines):
+                continue
+            aliases = [alias for alias in node.names if get_bound_name(alias) in used_names]
+            if len(aliases) == len(node.names):
+                continue
+            new_lines: list[str] = []
+            if aliases:
+                node.names = aliases
+                new_lines.append(' ' * node.col_offset + ast.unparse(node))
+            body_replacements.append((node.lineno, node.end_lineno or node.lineno, new_lines))
+        removed_all = sum(not new_lines for _, _, new_lines in body_replacements) == len(body)
+        if nested and removed_all:
+            start, end, _ = body_replacements[0]
+            body_replacements[0] = (start, end, [' ' * body[0].col_offset + 'pass'])
+        replacements += body_replacements
+    for start, end, new_lines in sorted(replacements, reverse=True):
+        lines[start - 1 : end] = new_lines
+    return '\n'.join(lines)
+
+
+def get_used_names(tree: ast.Module) -> set[str]:
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            # string annotations like Mapped["Planet"] and __all__ entries
+            try:
+                expression = ast.parse(node.value.strip(), mode='eval')
+            except SyntaxError:
+                continue
+            names.update(name.id for name in ast.walk(expression) if isinstance(name, ast.Name))
+    return names
+
+
+def get_import_bodies(tree: ast.Module) -> list[tuple[list[ast.stmt], bool]]:
+    bodies: list[tuple[list[ast.stmt], bool]] = [(tree.body, False)]
+    for node in tree.body:
+        if isinstance(node, ast.If | ast.Try):
+            bodies += [(body, True) for body in (node.body, node.orelse) if body]
+    return bodies
+
+
+def is_kept_import(node: ast.Import | ast.ImportFrom, lines: list[str]) -> bool:
+    if isinstance(node, ast.ImportFrom) and node.module == '__future__':
+        return True
+    if any(alias.name == '*' for alias in node.names):
+        return True
+    return any('# noqa' in line for line in lines[node.lineno - 1 : node.end_lineno or node.lineno])
+
+
+def get_bound_name(alias: ast.alias) -> str:
+    return alias.asname or alias.name.split('.')[0]
@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import NotRequired, TypedDict, Unpack
 
 from . import AppObject
+from .app_object import ObjectNames
 from .code.utils import get_module_str
 
 
@@ -11,6 +12,7 @@ class TypedNameConfig(TypedDict):
     dependency_file: NotRequired[str]
     security_file: NotRequired[str]
     settings_file: NotRequired[str]
+    cache_file: NotRequired[str]
     model_file: NotRequired[str]
     route_file: NotRequired[str]
     main_route_file: NotRequired[str]
@@ -21,6 +23,7 @@ class TypedNameConfig(TypedDict):
     read_schema_tmpl: NotRequired[str]
     read_full_schema_tmpl: NotRequired[str]
     edit_schema_tmpl: NotRequired[str]
+    bulk_edit_schema_tmpl: NotRequired[str]
     db_schema_tmpl: NotRequired[str]
     pagination_schema_tmpl: NotRequired[str]
     common_schema_file: NotRequired[str]
@@ -32,6 +35,8 @@ class TypedNameConfig(TypedDict):
     service_class_tmpl: NotRequired[str]
     alembic_folder: NotRequired[str]
     app_foldername: NotRequired[str]
+    async_mode: NotRequired[bool]
+    orjson_mode: NotRequired[bool]
 
 
 class StructureConfig:
@@ -40,6 +45,7 @@ class StructureConfig:
     dependency_file: str = 'dependancies'
     security_file: str = 'security'
     settings_file: str = 'settings'
+    cache_file: str = 'cache'
     model_file: str = 'models/{name}_model'
     route_file: str = 'routes/{name}_route'
     main_route_file: str = 'routes/main_routes'
@@ -50,6 +56,7 @@ class StructureConfig:
     read_schema_tmpl: str = '{class_name}Response'
     read_full_schema_tmpl: str = '{class_name}Info'
     edit_schema_tmpl: str = '{class_name}Edit'
+    bulk_edit_schema_tmpl: str = '{class_name}BulkEdit'
     db_schema_tmpl: str = '{class_name}Database'
     pagination_schema_tmpl: str = '{plural_class_name}Response'
     common_schema_file: str = 'schemas/common_schema'
@@ -61,6 +68,8 @@ class StructureConfig:
     service_class_tmpl: str = '{class_name}Service'
     alembic_folder: str = 'alembic'
     app_foldername: str = 'app'
+    async_mode: bool = False
+    orjson_mode: bool = False
 
     def __init__(self, **kwargs: Unpack[TypedNameConfig]) -> None:
         self._custom_init(**kwargs)
@@ -69,6 +78,9 @@ class StructureConfig:
         self._custom_init(**kwargs)
 
     def _custom_init(self, **kwargs: Unpack[TypedNameConfig]) -> None:
+        # every module of a project resolves the same handful of imports and paths, so both are memoized
+        self._module_cache: dict[tuple[str, str], str] = {}
+        self._path_cache: dict[tuple[str, ObjectNames], Path] = {}
         for key, value in kwargs.items():
             if hasattr(self, key):
                 setattr(self, key, value)
@@ -85,7 +97,7 @@ class StructureConfig:
         return str(Path(self.database_file))
 
     def get_module_for_database(self, other_path: str | Path) -> str:
-        return get_module_str(self.database_file, str(other_path))
+        return self._get_module_str(self.database_file, str(other_path))
 
     def get_base_filename(self) -> str:
         return Path(self.base_file).name
@@ -97,7 +109,7 @@ class StructureConfig:
         return str(Path(self.base_file))
 
     def get_module_for_base(self, other_path: str | Path) -> str:
-        return get_module_str(self.base_file, str(other_path))
+        return self._get_module_str(self.base_file, str(other_path))
 
     def get_dependency_filename(self) -> str:
         return Path(self.dependency_file).name
@@ -109,7 +121,7 @@ class StructureConfig:
         return str(Path(self.dependency_file))
 
     def get_module_for_dependency(self, other_path: str | Path) -> str:
-        return get_module_str(self.dependency_file, str(other_path))
+        return self._get_module_str(self.dependency_file, str(other_path))
 
     def get_security_filename(self) -> str:
         return Path(self.security_file).name
@@ -121,7 +133,7 @@ class StructureConfig:
         return str(Path(self.security_file))
 
     def get_module_for_security(self, other_path: str | Path) -> str:
-        return get_module_str(self.security_file, str(other_path))
+        return self._get_module_str(self.security_file, str(other_path))
 
     def get_settings_filename(self) -> str:
         return Path(self.settings_file).name
@@ -133,7 +145,19 @@ class StructureConfig:
         return str(Path(self.settings_file))
 
     def get_module_for_settings(self, other_path: str | Path) -> str:
-        return get_module_str(self.database_file, str(other_path))
+        return self._get_module_str(self.database_file, str(other_path))
+
+    def get_cache_filename(self) -> str:
+        return Path(self.cache_file).name
+
+    def get_cache_folder(self) -> str:
+        return str(Path(self.cache_file).parent)
+
+    def get_cache_path(self) -> str:
+        return str(Path(self.cache_file))
+
+    def get_module_for_cache(self, other_path: str | Path) -> str:
+        return self._get_module_str(self.cache_file, str(other_path))
 
     def get_model_filename(self, obj: AppObject) -> str:
         return self._get_modul_path(self.model_file, obj).name
@@ -145,7 +169,7 @@ class StructureConfig:
         return str(self._get_modul_path(self.model_file, obj))
 
     def get_module_for_model(self, obj: AppObject, other_path: str | Path) -> str:
-        return get_module_str(self.get_model_path(obj), str(other_path))
+        return self._get_module_str(self.get_model_path(obj), str(other_path))
 
     def get_route_filename(self, obj: AppObject) -> str:
         return self._get_modul_path(self.route_file, obj).name
@@ -157,7 +181,7 @@ class StructureConfig:
         return str(self._get_modul_path(self.route_file, obj))
 
     def get_module_for_route(self, obj: AppObject, other_path: str | Path) -> str:
-        return get_module_str(self.get_route_path(obj), str(other_path))
+        return self._get_module_str(self.get_route_path(obj), str(other_path))
 
     def get_main_route_filename(self) -> str:
         return Path(self.main_route_file).name
@@ -169,7 +193,7 @@ class StructureConfig:
         return str(Path(self.main_route_file))
 
     def get_module_for_main_route(self, other_path: str | Path) -> str:
-        return get_module_str(self.main_route_file, str(other_path))
+        return self._get_module_str(self.main_route_file, str(other_path))
 
     def get_login_route_filename(self) -> str:
         return Path(self.login_route_file).name
@@ -181,7 +205,7 @@ class StructureConfig:
         return str(Path(self.login_route_file))
 
     def get_module_for_login_route(self, other_path: str | Path) -> str:
-        return get_module_str(self.login_route_file, str(other_path))
+        return self._get_module_str(self.login_route_file, str(other_path))
 
     def get_schema_filename(self, obj: AppObject) -> str:
         return self._get_modul_path(self.schema_file, obj).name
@@ -193,7 +217,7 @@ class StructureConfig:
         return str(self._get_modul_path(self.schema_file, obj))
 
     def get_module_for_schema(self, obj: AppObject, other_path: str | Path) -> str:
-        return get_module_str(self.get_schema_path(obj), str(other_path))
+        return self._get_module_str(self.get_schema_path(obj), str(other_path))
 
     def get_base_cls_schema(self, obj: AppObject) -> str:
         return self._format(self.base_schema_tmpl, obj)
@@ -210,6 +234,9 @@ class StructureConfig:
     def get_edit_cls_schema(self, obj: AppObject) -> str:
         return self._format(self.edit_schema_tmpl, obj)
 
+    def get_bulk_edit_cls_schema(self, obj: AppObject) -> str:
+        return self._format(self.bulk_edit_schema_tmpl, obj)
+
     def get_db_cls_schema(self, obj: AppObject) -> str:
         return self._format(self.db_schema_tmpl, obj)
 
@@ -223,7 +250,7 @@ class StructureConfig:
         return str(Path(self.common_schema_file))
 
     def get_module_for_common_schema(self, other_path: str | Path) -> str:
-        return get_module_str(self.common_schema_file, str(other_path))
+        return self._get_module_str(self.common_schema_file, str(other_path))
 
     def get_pagination_cls_schema(self, obj: AppObject) -> str:
         return self._format(self.pagination_schema_tmpl, obj)
@@ -238,7 +265,7 @@ class StructureConfig:
         return str(self._get_modul_path(self.repository_file, obj))
 
     def get_module_for_repository(self, obj: AppObject, other_path: str | Path) -> str:
-        return get_module_str(self.get_repository_path(obj), str(other_path))
+        return self._get_module_str(self.get_repository_path(obj), str(other_path))
 
     def get_repo_classname(self, obj: AppObject) -> str:
         return self._format(self.repository_class_tmpl, obj)
@@ -253,7 +280,7 @@ class StructureConfig:
         return str(Path(self.repository_main_file))
 
     def get_module_for_repository_main(self, other_path: str | Path) -> str:
-        return get_module_str(self.repository_main_file, str(other_path))
+        return self._get_module_str(self.repository_main_file, str(other_path))
 
     def get_service_filename(self, obj: AppObject) -> str:
         return self._get_modul_path(self.service_file, obj).name
@@ -265,33 +292,53 @@ class StructureConfig:
         return str(self._get_modul_path(self.service_file, obj))
 
     def get_module_for_service(self, obj: AppObject, other_path: str | Path) -> str:
-        return get_module_str(self.get_service_path(obj), str(other_path))
+        return self._get_module_str(self.get_service_path(obj), str(other_path))
 
     def get_service_classname(self, obj: AppObject) -> str:
         return self._format(self.service_class_tmpl, obj)
 
+    def get_session_module(self) -> str:
+        if self.async_mode:
+            return 'sqlalchemy.ext.asyncio'
+        return 'sqlalchemy.orm'
+
+    def get_session_classname(self) -> str:
+        if self.async_mode:
+            return 'AsyncSession'
+        return 'Session'
+
     def get_module_for_main(self, other_path: str | Path) -> str:
-        return get_module_str('.', str(other_path))
+        return self._get_module_str('.', str(other_path))
 
     def get_module_for_tests(self, other_path: str | Path) -> str:
-        return self.app_foldername + get_module_str('.', str(other_path))
+        return self.app_foldername + self._get_module_str('.', str(other_path))
 
     def get_module_for_alembic(self, other_path: str | Path) -> str:
-        return self.app_foldername + get_module_str('.', str(other_path))
+        return self.app_foldername + self._get_module_str('.', str(other_path))
+
+    def _get_module_str(self, current_module: str, dependency: str) -> str:
+        key = (current_module, dependency)
+        if key not in self._module_cache:
+            self._module_cache[key] = get_module_str(current_module, dependency)
+        return self._module_cache[key]
 
     @staticmethod
     def _format(s: str, app_obj: AppObject) -> str:
+        names = app_obj.names
         return s.format(
             name=app_obj.name,
-            class_name=app_obj.class_name,
-            table_name=app_obj.table_name,
-            route_name=app_obj.route_name,
-            plural_class_name=app_obj.plural_class_name,
+            class_name=names.class_name,
+            table_name=names.table_name,
+            route_name=names.route_name,
+            plural_class_name=names.plural_class_name,
         )
 
     def _get_modul_path(self, string_path: str, app_obj: AppObject) -> Path:
-        path = Path(self._format(string_path, app_obj))
-        return path
+        # keyed on the names of the object, so renaming an object never returns a stale path
+        key = (string_path, app_obj.names)
+        if key not in self._path_cache:
+            self._path_cache[key] = Path(self._format(string_path, app_obj))
+        return self._path_cache[key]
 
 
 clean_arch_config = StructureConfig(
@@ -300,6 +347,7 @@ clean_arch_config = StructureConfig(
     dependency_file='api/deps',
     security_file='core/security',
     settings_file='core/config',
+    cache_file='core/cache',
     model_file='models/{name}_model',
     route_file='api/v1/{name}_route',
     main_route_file='api/v1/routes',
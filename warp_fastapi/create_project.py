@@ -1,6 +1,8 @@
-import subprocess
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal, NamedTuple
 
 from . import AppObject, AppProject
 from .code.alembic.alembic import (
@@ -10,6 +12,7 @@ from .code.alembic.alembic import (
     get_script_py_mako,
 )
 from .code.code_objects.base import AbstractModuleCode
+from .code.code_objects.cache import CacheModuleCode, uses_cache
 from .code.code_objects.database import BaseModuleCode, DatabaseModuleCode
 from .code.code_objects.dependacies import DependanciesModuleCode
 from .code.code_objects.main import MainModuleCode
@@ -20,9 +23,14 @@ from .code.code_objects.schema import CommonSchemaModule, SchemaModuleCode
 from .code.code_objects.security import SecurityModuleCode
 from .code.code_objects.service import ServiceModuleCode
 from .code.code_objects.settings import SettingsModuleCode
-from .code.code_objects.tests import ConfTestModuleCode, TestModuleCode
+from .code.code_objects.tests import ConfTestModuleCode, ListBenchModuleCode, TestModuleCode
 from .code.devops import docker, dotenv, git, local
+from .code.formatting import format_code
 from .config import StructureConfig
+from .output import DiskSink, OutputSink
+
+MANIFEST_FILENAME = '.warp_manifest.json'
+MAX_IO_WORKERS = 8
 
 
 class ProjectCreator:
@@ -32,14 +40,19 @@ class ProjectCreator:
         project_dir: str = '.',
         config: StructureConfig = StructureConfig(),
         requirements: list[str] = [],
-        deployment: Literal['Docker', 'local'] = 'local',
+        deployment: Literal['Docker', 'local', 'production'] = 'local',
+        workers: int = 1,
+        sink: OutputSink | None = None,
     ):
         self.project = project
         self.config = config
         self.deployment = deployment
+        self.workers = workers
         self.project_dir = Path(project_dir, project.name)
         self.app_dir = self.project_dir / config.app_foldername
         self.test_dir = self.project_dir / 'tests'
+        # the files are written to the project folder unless another sink receives them
+        self.sink = sink if sink is not None else DiskSink(self.project_dir)
         self.requirements = [
             'fastapi[all]',
             'sqlalchemy',
@@ -51,7 +64,7 @@ class ProjectCreator:
             'mypy',
         ]
         if requirements:
-            self.requirements = requirements  # pragma: no cover
+            self.requirements = requirements
 
     def create_project(self) -> None:
         self._generate(False)
@@ -60,131 +73,250 @@ class ProjectCreator:
         self._generate(True)
 
     def _generate(self, update: bool) -> None:
-        self.app_dir.mkdir(parents=True, exist_ok=update)
-        self.test_dir.mkdir(parents=True, exist_ok=update)
+        try:
+            self._generate_files(update)
+        except BaseException:
+            self.sink.discard()
+            raise
+        self.sink.commit()
+
+    def _generate_files(self, update: bool) -> None:
+        self.manifest = self._read_manifest() if update else {}
+        self._make_dir(self.app_dir, update)
+        self._make_dir(self.test_dir, update)
         init_file = self.app_dir / '__init__.py'
-        init_file.write_text('')
+        self._write_file(init_file, '')
         test_init_file = self.test_dir / '__init__.py'
-        test_init_file.write_text('')
-        for obj in self.project.app_objects:
-            self._generate_obj_code(obj, update)
-        self._generate_const_file(update)
+        self._write_file(test_init_file, '')
+        if self.workers > 1:
+            self._generate_code_parallel(update)
+        else:
+            for obj in self.project.app_objects:
+                self._generate_obj_code(obj, update)
+            self._generate_const_file(update)
         self._generate_alembic(update)
         self._copy_env_file()
-        if self.deployment == 'Docker':
-            self.requirements.append('psycopg2')
-        if self.project.auth_object:
-            self.requirements += [
-                'python-jose[cryptography]',
-                'passlib',
-                'bcrypt',
-                'types-python-jose',
-                'types-passlib',
-            ]
         self._generate_requirements_txt()
         self._generate_git_files()
         self._generate_startup_script()
-        if self.deployment == 'Docker':
+        if self.deployment in ('Docker', 'production'):
             self._generate_docker_files()
-        print('Cleaning up the code with black and ruff!')
-        self._reformat_code()
+        self._write_manifest()
 
     def _generate_const_file(self, update: bool) -> None:
-        secure = bool(self.project.auth_object)
-        const_modules: list[AbstractModuleCode] = [
-            MainModuleCode(self.project, self.config),
-            DatabaseModuleCode(self.config),
-            DependanciesModuleCode(self.config, self.project.auth_object),
-            SettingsModuleCode(self.config, self.project.name),
-            CommonSchemaModule(self.config, secure),
-            BaseModuleCode(self.project.app_objects, self.config),
-            RepoBaseModule(self.config),
-            MainRouterCode(self.project.app_objects, self.config),
-        ]
-        if self.project.auth_object:
-            const_modules += [
-                LoginRouteModule(self.project.auth_object, self.config),
-                SecurityModuleCode(self.project.auth_object, self.config),
-            ]
-
-        for module in const_modules:
+        for module in get_const_modules(self.project, self.config):
             self._write_module(module, update, self.app_dir)
-
-        test_modules: list[AbstractModuleCode] = [
-            TestModuleCode(self.project.app_objects, self.config),
-            ConfTestModuleCode(self.project.app_objects, self.config, secure),
-        ]
-        for module in test_modules:
+        for module in get_test_modules(self.project, self.config):
             self._write_module(module, update, self.test_dir)
 
     def _generate_obj_code(self, obj: AppObject, update: bool) -> None:
-        modules = self._generate_modules(obj)
-        for module in modules:
+        for module in get_object_modules(obj, self.config):
             self._write_module(module, update, self.app_dir)
 
+    def _generate_code_parallel(self, update: bool) -> None:
+        # modules are rendered and formatted in worker processes, only the writes happen here
+        sources = {key: entry['source'] for key, entry in self.manifest.items()}
+        tasks: list[int | None] = [None, *range(len(self.project.app_objects))]
+        initargs = (self.project, self.config, sources)
+        with ProcessPoolExecutor(self.workers, initializer=init_render_worker, initargs=initargs) as pool:
+            rendered_modules = [module for modules in pool.map(render_modules, tasks) for module in modules]
+        files: list[tuple[Path, str, str | None]] = []
+        for module in rendered_modules:
+            dir = self._make_module_dir(self.project_dir / module.main_folder / module.folder, update)
+            files.append((dir / (module.filename + '.py'), module.text, module.formatted))
+        with ThreadPoolExecutor(min(self.workers, MAX_IO_WORKERS)) as io_pool:
+            list(io_pool.map(lambda file: self._write_file(*file), files))
+
     def _write_module(self, module: AbstractModuleCode, update: bool, main_dir: Path) -> None:
-        dir = main_dir / module.folder
-        if not dir.exists():
-            dir.mkdir(parents=True, exist_ok=update)
-            init_file = dir / '__init__.py'
-            init_file.write_text('')
+        dir = self._make_module_dir(main_dir / module.folder, update)
         module_file = dir / (module.filename + '.py')
-        module_file.write_text(str(module))
-
-    def _generate_modules(self, obj: AppObject) -> list[AbstractModuleCode]:
-        return [
-            ModelModuleCode(obj, self.config),
-            RepoModuleCode(obj, self.config),
-            RoutesModuleCode(obj, self.config),
-            SchemaModuleCode(obj, self.config),
-            ServiceModuleCode(obj, self.config),
-        ]
+        self._write_file(module_file, str(module))
+
+    def _make_module_dir(self, dir: Path, update: bool) -> Path:
+        if not self.sink.is_dir(self._get_key(dir)):
+            self._make_dir(dir, update)
+            init_file = dir / '__init__.py'
+            self._write_file(init_file, '')
+        return dir
 
     def _generate_alembic(self, update: bool) -> None:
         alembic_dir = self.project_dir / self.config.alembic_folder
-        alembic_dir.mkdir(parents=True, exist_ok=update)
+        self._make_dir(alembic_dir, update)
         alembic_ini = self.project_dir / 'alembic.ini'
-        alembic_ini.write_text(get_alembic_ini_code(self.config))
+        self._write_file(alembic_ini, get_alembic_ini_code(self.config))
         versions_dir = alembic_dir / 'versions'
-        versions_dir.mkdir(parents=True, exist_ok=update)
+        self._make_dir(versions_dir, update)
         env_file = alembic_dir / 'env.py'
-        env_file.write_text(get_alembic_env_code(self.config))
+        self._write_file(env_file, get_alembic_env_code(self.config))
         readme_file = alembic_dir / 'README'
-        readme_file.write_text(get_alembic_readme())
+        self._write_file(readme_file, get_alembic_readme())
         mako_file = alembic_dir / 'script.py.mako'
-        mako_file.write_text(get_script_py_mako())
+        self._write_file(mako_file, get_script_py_mako())
 
     def _copy_env_file(self) -> None:
         env_template = ''
         env_template = dotenv.get_postgress_env()
         if self.deployment == 'local':
-            env_template = dotenv.get_sqlite_env()
+            env_template = dotenv.get_sqlite_env(self.config.async_mode)
         dest = self.project_dir / '.env'
-        dest.write_text(env_template)
+        self._write_file(dest, env_template)
 
     def _generate_requirements_txt(self) -> None:
         file = self.project_dir / 'requirements.txt'
-        txt = '\n'.join(self.requirements)
-        file.write_text(txt)
+        # a new list, the creator and the list it was given stay the same for the next run
+        requirements = [*self.requirements]
+        if self.config.async_mode:
+            requirements.append('aiosqlite')
+        if self.config.orjson_mode:
+            requirements.append('orjson')
+        if self.deployment in ('Docker', 'production'):
+            requirements.append('asyncpg' if self.config.async_mode else 'psycopg2')
+        if self.deployment == 'production':
+            requirements += ['gunicorn', 'uvicorn[standard]']
+        if self.project.auth_object:
+            requirements += [
+                'python-jose[cryptography]',
+                'passlib',
+                'bcrypt',
+                'types-python-jose',
+                'types-passlib',
+            ]
+        txt = '\n'.join(dict.fromkeys(requirements))
+        self._write_file(file, txt)
 
     def _generate_startup_script(self) -> None:
         script_file = self.project_dir / 'startup.sh'
-        script = local.get_startup_script()
-        script_file.write_text(script)
+        script = local.get_startup_script(self.config, self.deployment == 'production')
+        self._write_file(script_file, script)
 
     def _generate_docker_files(self) -> None:
         docker_file = self.project_dir / 'dockerfile'
         compose_file = self.project_dir / 'compose.yml'
         dockerignroe_file = self.project_dir / '.dockerignore'
-        docker_file.write_text(docker.get_dockerfile(self.config))
-        compose_file.write_text(docker.get_compose_file())
-        dockerignroe_file.write_text(docker.get_dockerignore())
+        production = self.deployment == 'production'
+        if production:
+            self._write_file(docker_file, docker.get_production_dockerfile(self.config))
+            gunicorn_file = self.project_dir / 'gunicorn.conf.py'
+            self._write_file(gunicorn_file, docker.get_gunicorn_config(self.config.async_mode))
+        else:
+            self._write_file(docker_file, docker.get_dockerfile(self.config))
+        self._write_file(compose_file, docker.get_compose_file(self.config.async_mode, production))
+        self._write_file(dockerignroe_file, docker.get_dockerignore())
 
     def _generate_git_files(self) -> None:
         gitignore_file = self.project_dir / '.gitignore'
-        gitignore_file.write_text(git.get_gitignore())
+        self._write_file(gitignore_file, git.get_gitignore())
+
+    def _write_file(self, path: Path, text: str, formatted: str | None = None) -> None:
+        # the manifest keeps the hash of the rendered text and of the formatted file,
+        # unchanged files are skipped without formatting unless they were edited since the last run
+        key = self._get_key(path)
+        source_hash = get_hash(text)
+        entry = self.manifest.get(key)
+        if entry and entry['source'] == source_hash:
+            current = self.sink.read_text(key)
+            if current is not None and get_hash(current) == entry['output']:
+                return
+        if formatted is None:
+            formatted = format_code(text) if path.suffix == '.py' else text
+        self.sink.write_text(key, formatted)
+        self.manifest[key] = {'source': source_hash, 'output': get_hash(formatted)}
+
+    def _make_dir(self, dir: Path, update: bool) -> None:
+        self.sink.make_dir(self._get_key(dir), exist_ok=update)
+
+    def _get_key(self, path: Path) -> str:
+        return path.relative_to(self.project_dir).as_posix()
+
+    def _read_manifest(self) -> dict[str, dict[str, str]]:
+        text = self.sink.read_text(MANIFEST_FILENAME)
+        if text is None:
+            return {}
+        manifest: dict[str, dict[str, str]] = json.loads(text)
+        return manifest
+
+    def _write_manifest(self) -> None:
+        self.sink.write_text(MANIFEST_FILENAME, json.dumps(self.manifest, indent=2, sort_keys=True))
+
+
+def get_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def get_object_modules(obj: AppObject, config: StructureConfig) -> list[AbstractModuleCode]:
+    return [
+        ModelModuleCode(obj, config),
+        RepoModuleCode(obj, config),
+        RoutesModuleCode(obj, config),
+        SchemaModuleCode(obj, config),
+        ServiceModuleCode(obj, config),
+    ]
+
+
+def get_const_modules(project: AppProject, config: StructureConfig) -> list[AbstractModuleCode]:
+    secure = bool(project.auth_object)
+    const_modules: list[AbstractModuleCode] = [
+        MainModuleCode(project, config),
+        DatabaseModuleCode(config),
+        DependanciesModuleCode(config, project.auth_object),
+        SettingsModuleCode(config, project.name),
+        CommonSchemaModule(config, secure),
+        BaseModuleCode(project.app_objects, config),
+        RepoBaseModule(config),
+        MainRouterCode(project.app_objects, config),
+    ]
+    if any(uses_cache(obj) for obj in project.app_objects):
+        const_modules.append(CacheModuleCode(config))
+    if project.auth_object:
+        const_modules += [
+            LoginRouteModule(project.auth_object, config),
+            SecurityModuleCode(project.auth_object, config),
+        ]
+    return const_modules
+
+
+def get_test_modules(project: AppProject, config: StructureConfig) -> list[AbstractModuleCode]:
+    secure = bool(project.auth_object)
+    test_modules: list[AbstractModuleCode] = [
+        TestModuleCode(project.app_objects, config),
+        ConfTestModuleCode(project.app_objects, config, secure),
+    ]
+    if config.orjson_mode:
+        test_modules.append(ListBenchModuleCode(project.app_objects, config))
+    return test_modules
+
+
+class RenderedModule(NamedTuple):
+    main_folder: str
+    folder: str
+    filename: str
+    text: str
+    formatted: str | None
+
+
+_render_state: dict[str, Any] = {}
+
+
+def init_render_worker(project: AppProject, config: StructureConfig, sources: dict[str, str]) -> None:
+    # every worker receives the project graph once instead of once per task
+    _render_state.update(project=project, config=config, sources=sources)
+
 
-    def _reformat_code(self) -> None:
-        full_path = self.project_dir.resolve()
-        subprocess.run(['ruff', full_path, '--fix', '-s', '-n'])
-        subprocess.run(['black', full_path, '-q'])
+def render_modules(index: int | None) -> list[RenderedModule]:
+    project: AppProject = _render_state['project']
+    config: StructureConfig = _render_state['config']
+    sources: dict[str, str] = _render_state['sources']
+    if index is None:
+        modules = [(config.app_foldername, module) for module in get_const_modules(project, config)]
+        modules += [('tests', module) for module in get_test_modules(project, config)]
+    else:
+        obj = project.app_objects[index]
+        modules = [(config.app_foldername, module) for module in get_object_modules(obj, config)]
+    rendered_modules: list[RenderedModule] = []
+    for main_folder, module in modules:
+        text = str(module)
+        key = Path(main_folder, module.folder, module.filename + '.py').as_posix()
+        # unchanged modules are skipped when written, so they are not formatted here
+        formatted = None if sources.get(key) == get_hash(text) else format_code(text)
+        rendered_modules.append(RenderedModule(main_folder, module.folder, module.filename, text, formatted))
+    return rendered_modules
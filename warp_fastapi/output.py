@@ -0,0 +1,218 @@
+"""
+Output sinks receive the folders and files of a generated project.
+
+ProjectCreator writes to the disk by default. A StagedDiskSink writes the files next to the project folder and moves
+them into place once the whole project was generated. A MemorySink keeps the project in a dict, for diffs against an
+existing checkout and for tests, an ArchiveSink streams it into a zip or tar archive. Paths are relative to the project
+folder and use forward slashes.
+"""
+from __future__ import annotations
+
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path, PurePosixPath
+from types import TracebackType
+from typing import BinaryIO, Literal
+
+
+class OutputSink(ABC):
+    @abstractmethod
+    def make_dir(self, path: str, exist_ok: bool = False) -> None:
+        """
+        Creates a folder and its missing parents.
+
+        Raises:
+            FileExistsError: If the folder exists and exist_ok is False.
+        """
+
+    @abstractmethod
+    def is_dir(self, path: str) -> bool:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    def read_text(self, path: str) -> str | None:
+        """
+        Returns the content of a file, or None if the file doesn't exist.
+        """
+
+    @abstractmethod
+    def write_text(self, path: str, text: str) -> None:
+        pass  # pragma: no cover
+
+    def commit(self) -> None:
+        """
+        Called once a run has written all files.
+        """
+
+    def discard(self) -> None:
+        """
+        Called when a run fails before all files were written.
+        """
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> OutputSink:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+
+class DiskSink(OutputSink):
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def make_dir(self, path: str, exist_ok: bool = False) -> None:
+        (self.root / path).mkdir(parents=True, exist_ok=exist_ok)
+
+    def is_dir(self, path: str) -> bool:
+        return (self.root / path).is_dir()
+
+    def read_text(self, path: str) -> str | None:
+        file = self.root / path
+        return file.read_text() if file.is_file() else None
+
+    def write_text(self, path: str, text: str) -> None:
+        (self.root / path).write_text(text)
+
+
+class StagedDiskSink(DiskSink):
+    """
+    Writes the files of a run into a staging folder next to the project folder and moves them into place on commit.
+
+    A failed or interrupted run leaves the project untouched, and the files are moved in one pass after the slow
+    rendering and formatting. Without fsync the files are only moved, which is faster but may lose the new content
+    on a power failure, fine for containers and CI runs that are thrown away anyway.
+    """
+
+    def __init__(self, root: str | Path, fsync: bool = True):
+        super().__init__(root)
+        self.fsync = fsync
+        self._staging_dir: Path | None = None
+        self._dirs: set[str] = set()
+        self._files: set[str] = set()
+
+    def make_dir(self, path: str, exist_ok: bool = False) -> None:
+        if not exist_ok and (path in self._dirs or (self.root / path).exists()):
+            raise FileExistsError(f'Folder {self.root / path} already exists!')
+        (self._get_staging_dir() / path).mkdir(parents=True, exist_ok=True)
+        self._dirs.add(path)
+
+    def is_dir(self, path: str) -> bool:
+        return path in self._dirs or super().is_dir(path)
+
+    def read_text(self, path: str) -> str | None:
+        if path in self._files:
+            return (self._get_staging_dir() / path).read_text()
+        return super().read_text(path)
+
+    def write_text(self, path: str, text: str) -> None:
+        parent = str(PurePosixPath(path).parent)
+        if parent not in self._dirs:
+            # folders that already exist in the project are only created in the staging folder on first use
+            (self._get_staging_dir() / parent).mkdir(parents=True, exist_ok=True)
+            self._dirs.add(parent)
+        with open(self._get_staging_dir() / path, 'w') as file:
+            file.write(text)
+            if self.fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        self._files.add(path)
+
+    def commit(self) -> None:
+        if self._staging_dir is None:
+            return
+        for path in sorted(self._dirs):
+            (self.root / path).mkdir(parents=True, exist_ok=True)
+        for path in self._files:
+            # a rename within one file system replaces the file atomically
+            os.replace(self._staging_dir / path, self.root / path)
+        if self.fsync and os.name == 'posix':
+            # the renames are only durable once the folders holding them are synced
+            for dir in {(self.root / path).parent for path in self._files}:
+                fd = os.open(dir, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+        self.discard()
+
+    def discard(self) -> None:
+        if self._staging_dir is not None:
+            shutil.rmtree(self._staging_dir, ignore_errors=True)
+        self._staging_dir = None
+        self._dirs.clear()
+        self._files.clear()
+
+    def _get_staging_dir(self) -> Path:
+        if self._staging_dir is None:
+            # the staging folder shares the file system of the project, so files are moved instead of copied
+            self.root.parent.mkdir(parents=True, exist_ok=True)
+            self._staging_dir = Path(tempfile.mkdtemp(prefix=f'.{self.root.name}.staged-', dir=self.root.parent))
+        return self._staging_dir
+
+
+class MemorySink(OutputSink):
+    def __init__(self, files: dict[str, str] | None = None):
+        # existing files can be given to update a project in memory
+        self.files: dict[str, str] = dict(files or {})
+        self.dirs: set[str] = {str(parent) for path in self.files for parent in PurePosixPath(path).parents}
+
+    def make_dir(self, path: str, exist_ok: bool = False) -> None:
+        if path in self.dirs and not exist_ok:
+            raise FileExistsError(f'Folder {path} already exists!')
+        self.dirs.add(path)
+        self.dirs.update(str(parent) for parent in PurePosixPath(path).parents)
+
+    def is_dir(self, path: str) -> bool:
+        return path in self.dirs
+
+    def read_text(self, path: str) -> str | None:
+        return self.files.get(path)
+
+    def write_text(self, path: str, text: str) -> None:
+        self.files[path] = text
+
+
+class ArchiveSink(MemorySink):
+    """
+    Streams the files into a zip or gzipped tar archive, the archive is complete once the sink is closed.
+
+    Only the folders are kept in memory, so files can't be read back and every file is generated and formatted.
+    """
+
+    def __init__(self, file: str | Path | BinaryIO, format: Literal['zip', 'tar'] = 'zip', root: str = ''):
+        super().__init__()
+        self.root = PurePosixPath(root)
+        # files are written from several threads when the project is generated with workers
+        self._lock = threading.Lock()
+        self._archive: zipfile.ZipFile | tarfile.TarFile
+        if format == 'zip':
+            self._archive = zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED)
+        elif isinstance(file, str | Path):
+            self._archive = tarfile.open(file, 'w:gz')
+        else:
+            self._archive = tarfile.open(fileobj=file, mode='w|gz')
+
+    def write_text(self, path: str, text: str) -> None:
+        name = str(self.root / path)
+        data = text.encode()
+        with self._lock:
+            if isinstance(self._archive, zipfile.ZipFile):
+                self._archive.writestr(name, data)
+            else:
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                self._archive.addfile(info, io.BytesIO(data))
+
+    def close(self) -> None:
+        self._archive.close()
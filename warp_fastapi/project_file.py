@@ -0,0 +1,328 @@
+"""
+Loads projects from declarative YAML or JSON project files.
+
+A project file maps object names to their attributes, relationships, indexes and config:
+
+    name: galactic_app
+    auth_object: user
+    objects:
+      planet:
+        attributes:
+          planet_name: string
+          distance: {type: int, optional: true}
+        relationships:
+          - {name: inhabited_by, type: one_to_many, object: starship, back_populates: planet}
+      starship:
+        attributes:
+          ship_name: string
+        config: {lazy: selectin}
+      user:
+        attributes:
+          username: {type: string, unique: true}
+          password: string
+
+Loaded projects are pickled into a cache folder next to the file, keyed on the hash of its content. Loading an
+unchanged file again skips parsing and validation of the whole object graph.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Literal, NamedTuple, cast
+
+import pydantic
+from pydantic import BaseModel, ConfigDict
+
+from .app_object import AppConfig, AppObject, AuthObject, CompositeIndex
+from .app_project import AppProject
+from .attributes import Attribute, IndexType
+from .data_types import (
+    DataType,
+    bigint_type,
+    bool_type,
+    date_only_type,
+    date_time_type,
+    decimal_type,
+    email_type,
+    float_type,
+    int_type,
+    string_type,
+    text_type,
+    time_type,
+    timedelta_type,
+    unicode_type,
+)
+from .relationships import BackpopulatesRelationship, LoadStrategy, Relationship, RelationshipType
+
+CACHE_FOLDER = '.warp_cache'
+# bump when the pickled graph changes shape, older caches are then rebuilt
+CACHE_VERSION = 1
+
+DataTypeName = Literal[
+    'int',
+    'bigint',
+    'string',
+    'text',
+    'unicode',
+    'float',
+    'decimal',
+    'bool',
+    'date',
+    'datetime',
+    'time',
+    'timedelta',
+    'email',
+]
+DATA_TYPES: dict[str, DataType] = {
+    'int': int_type,
+    'bigint': bigint_type,
+    'string': string_type,
+    'text': text_type,
+    'unicode': unicode_type,
+    'float': float_type,
+    'decimal': decimal_type,
+    'bool': bool_type,
+    'date': date_only_type,
+    'datetime': date_time_type,
+    'time': time_type,
+    'timedelta': timedelta_type,
+    'email': email_type,
+}
+
+
+class AttributeSpec(BaseModel):
+    """
+    An attribute in a project file, attributes given only by their type name use the defaults.
+    """
+
+    model_config = ConfigDict(extra='forbid')
+
+    type: DataTypeName
+    default: Any = None
+    unique: bool = False
+    optional: bool = False
+    indexed: bool = False
+    index_type: IndexType | None = None
+
+
+class RelationshipSpec(BaseModel):
+    """
+    A relationship in a project file, the object is the name of the related object.
+    """
+
+    model_config = ConfigDict(extra='forbid')
+
+    name: str
+    type: Literal['one_to_one', 'one_to_many', 'many_to_one', 'many_to_many']
+    object: str
+    back_populates: str | None = None
+    optional: bool = False
+    lazy: LoadStrategy | None = None
+
+
+class ObjectSpec(BaseModel):
+    """
+    An object in a project file.
+    """
+
+    model_config = ConfigDict(extra='forbid')
+
+    attributes: dict[str, DataTypeName | AttributeSpec] = {}
+    relationships: list[RelationshipSpec] = []
+    indexes: list[CompositeIndex] = []
+    config: AppConfig = AppConfig()
+    secure: bool = False
+
+
+class CachedProject(NamedTuple):
+    """
+    A project stored as flat lists, objects and relationships reference each other by their position.
+
+    Pickling the object graph itself recurses once for every object of a relationship chain.
+    """
+
+    name: str
+    objects: list[tuple[type[AppObject], dict[str, Any], list[int], list[int]]]
+    relationships: list[tuple[type[Relationship | BackpopulatesRelationship], dict[str, Any]]]
+    auth_object: int | None
+
+
+class ProjectSpec(BaseModel):
+    """
+    The content of a project file.
+    """
+
+    model_config = ConfigDict(extra='forbid')
+
+    name: str
+    objects: dict[str, ObjectSpec]
+    auth_object: str | None = None
+
+
+def load_project(path: str | Path, use_cache: bool = True) -> AppProject:
+    """
+    Loads a project from a YAML or JSON project file.
+
+    Args:
+        path (str | Path): The project file, files ending with .yaml or .yml are read as YAML, others as JSON.
+        use_cache (bool): Whether to reuse and store the compiled project in the cache folder next to the file.
+
+    Returns:
+        AppProject: The project defined by the file.
+    """
+    path = Path(path)
+    content = path.read_bytes()
+    cache_file = path.parent / CACHE_FOLDER / f'{path.name}.{get_cache_key(content)}.pickle'
+    if use_cache and cache_file.exists():
+        project = read_cache(cache_file)
+        if project is not None:
+            return project
+    project = build_project(parse_project_file(content, path.suffix))
+    if use_cache:
+        write_cache(cache_file, project)
+    return project
+
+
+def parse_project_file(content: bytes, suffix: str) -> ProjectSpec:
+    """
+    Parses and validates the content of a project file.
+
+    Args:
+        content (bytes): The content of the file.
+        suffix (str): The suffix of the file name.
+
+    Returns:
+        ProjectSpec: The validated project file.
+    """
+    if suffix in ('.yaml', '.yml'):
+        # pyyaml is only needed for YAML project files
+        import yaml
+
+        data = yaml.safe_load(content)
+    else:
+        data = json.loads(content)
+    return ProjectSpec.model_validate(data)
+
+
+def build_project(spec: ProjectSpec) -> AppProject:
+    """
+    Builds the objects and relationships of a project file.
+
+    Args:
+        spec (ProjectSpec): The validated project file.
+
+    Returns:
+        AppProject: The project.
+
+    Raises:
+        ValueError: If the auth object or a related object is not defined in the file.
+    """
+    if spec.auth_object is not None and spec.auth_object not in spec.objects:
+        raise ValueError(f'Auth object {spec.auth_object} not found in project file!')
+    objects: dict[str, AppObject] = {}
+    auth_object: AuthObject | None = None
+    for name, obj_spec in spec.objects.items():
+        attributes = [build_attribute(att_name, att_spec) for att_name, att_spec in obj_spec.attributes.items()]
+        if name == spec.auth_object:
+            auth_object = AuthObject(name, *attributes, config=obj_spec.config, secure=obj_spec.secure)
+            objects[name] = auth_object
+        else:
+            objects[name] = AppObject(name, *attributes, config=obj_spec.config, secure=obj_spec.secure)
+    for name, obj_spec in spec.objects.items():
+        for rel in obj_spec.relationships:
+            if rel.object not in objects:
+                raise ValueError(f'Object {rel.object} of relationship {name}.{rel.name} not found in project file!')
+            objects[name].add_relationship(
+                objects[rel.object], RelationshipType[rel.type], rel.name, rel.back_populates, rel.optional, rel.lazy
+            )
+    # indexes can cover foreign keys, so they are added once all relationships exist
+    for name, obj_spec in spec.objects.items():
+        for index in obj_spec.indexes:
+            objects[name].add_index(*index.columns, unique=index.unique, index_type=index.index_type)
+    app_objects = [obj for obj in objects.values() if obj is not auth_object]
+    return AppProject(spec.name, *app_objects, auth_object=auth_object)
+
+
+def build_attribute(name: str, spec: DataTypeName | AttributeSpec) -> Attribute:
+    if isinstance(spec, str):
+        spec = AttributeSpec(type=spec)
+    return Attribute(
+        name,
+        DATA_TYPES[spec.type],
+        spec.default,
+        spec.unique,
+        spec.optional,
+        indexed=spec.indexed,
+        index_type=spec.index_type,
+    )
+
+
+def get_cache_key(content: bytes) -> str:
+    # pickled pydantic models are only valid for the pydantic version that wrote them
+    salt = f'{CACHE_VERSION}:{pydantic.VERSION}:'.encode()
+    return hashlib.sha256(salt + content).hexdigest()
+
+
+def read_cache(cache_file: Path) -> AppProject | None:
+    try:
+        cached = pickle.loads(cache_file.read_bytes())
+        return restore_project(cached) if isinstance(cached, CachedProject) else None
+    except Exception:
+        # a damaged or incompatible cache is rebuilt from the project file
+        return None
+
+
+def write_cache(cache_file: Path, project: AppProject) -> None:
+    cache_file.parent.mkdir(exist_ok=True)
+    # only the cache of the current content is kept
+    source_name = cache_file.name.rsplit('.', 2)[0]
+    for old_file in cache_file.parent.glob('*.pickle'):
+        if old_file.name.rsplit('.', 2)[0] == source_name:
+            old_file.unlink()
+    # written to a temporary file first, so a concurrent run never reads a partial cache
+    fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as tmp_file:
+        pickle.dump(flatten_project(project), tmp_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_name, cache_file)
+
+
+def flatten_project(project: AppProject) -> CachedProject:
+    positions = {id(obj): i for i, obj in enumerate(project.app_objects)}
+    rel_positions: dict[int, int] = {}
+    relationships: list[tuple[type[Relationship | BackpopulatesRelationship], dict[str, Any]]] = []
+    for obj in project.app_objects:
+        for rel in obj.relationships:
+            fields = {name: getattr(rel, name) for name in rel.model_fields}
+            fields['related_object'] = positions[id(rel.related_object)]
+            if isinstance(rel, BackpopulatesRelationship):
+                fields['back_populates_object'] = positions[id(rel.back_populates_object)]
+            rel_positions[id(rel)] = len(relationships)
+            relationships.append((type(rel), fields))
+    objects: list[tuple[type[AppObject], dict[str, Any], list[int], list[int]]] = []
+    for obj in project.app_objects:
+        fields = {name: getattr(obj, name) for name in obj.model_fields}
+        own = [rel_positions[id(rel)] for rel in fields.pop('relationships')]
+        back_populates = [rel_positions[id(rel)] for rel in fields.pop('back_populates_relationships')]
+        objects.append((type(obj), fields, own, back_populates))
+    auth_object = positions[id(project.auth_object)] if project.auth_object else None
+    return CachedProject(project.name, objects, relationships, auth_object)
+
+
+def restore_project(cached: CachedProject) -> AppProject:
+    # the cached models were validated when the project file was loaded, they are constructed without validation
+    objects = [obj_cls.model_construct(**fields) for obj_cls, fields, _, _ in cached.objects]
+    relationships: list[Relationship | BackpopulatesRelationship] = []
+    for rel_cls, fields in cached.relationships:
+        fields = dict(fields, related_object=objects[fields['related_object']])
+        if 'back_populates_object' in fields:
+            fields['back_populates_object'] = objects[fields['back_populates_object']]
+        relationships.append(rel_cls.model_construct(**fields))
+    for obj, (_, _, own, back_populates) in zip(objects, cached.objects):
+        obj.relationships = [relationships[i] for i in own]
+        obj.back_populates_relationships = [cast(BackpopulatesRelationship, relationships[i]) for i in back_populates]
+    auth_object = objects[cached.auth_object] if cached.auth_object is not None else None
+    return AppProject.model_construct(name=cached.name, app_objects=objects, auth_object=auth_object)
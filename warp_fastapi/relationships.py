@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from enum import Enum, auto
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Literal
+
+from pydantic import field_serializer
 
 from .base import TemplateModel
 from .exceptions import RelationshipException, RelMsgErr
@@ -22,8 +25,47 @@ many_to_one = RelationshipType.many_to_one
 one_to_one = RelationshipType.one_to_one
 many_to_many = RelationshipType.many_to_many
 
+# 'ids' keeps the relationship lazy and fills the `<name>_id` lists with one query per page
+LoadStrategy = Literal['select', 'selectin', 'joined', 'raise', 'ids']
+
 
-class Relationship(TemplateModel):
+class GraphEdge(TemplateModel):
+    """
+    Base class for Relationship and BackpopulatesRelationship.
+
+    Relationships reference AppObjects, which reference their relationships again. Dumps, representations,
+    equality and hashing of relationships use the names of the referenced objects, so they never walk the graph
+    and stay linear in its size even when it has cycles.
+    """
+
+    related_object: AppObject
+    relationship_type: RelationshipType
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+
+    @field_serializer('related_object', 'back_populates_object', check_fields=False)
+    def _serialize_reference(self, obj: AppObject) -> str:
+        return obj.name
+
+    def __repr_args__(self) -> Iterator[tuple[str | None, Any]]:
+        for key, value in super().__repr_args__():
+            if key in ('related_object', 'back_populates_object'):
+                value = value.name
+            yield key, value
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, GraphEdge):
+            return NotImplemented
+        return type(self) is type(other) and self.model_dump() == other.model_dump()
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__, self.name, self.related_object.name))
+
+
+class Relationship(GraphEdge):
     """
     A class representing a relationship between two objects.
 
@@ -32,14 +74,14 @@ class Relationship(TemplateModel):
         obj (AppObject): The object that this relationship is associated with.
         type (RelationshipType): The type of relationship.
         optional (bool, optional): Whether the relationship is optional. Defaults to False.
+        lazy (LoadStrategy | None, optional): How the relationship is loaded. Defaults to None.
 
     Raises:
         RelationshipException: If the relationship type is `many_to_many`.
     """
 
-    related_object: AppObject
-    relationship_type: RelationshipType
     optional: bool = False
+    lazy: LoadStrategy | None = None
 
     def __init__(
         self,
@@ -47,6 +89,7 @@ class Relationship(TemplateModel):
         obj: AppObject,
         type: RelationshipType,
         optional: bool = False,
+        lazy: LoadStrategy | None = None,
     ) -> None:
         if type == many_to_many:
             raise RelationshipException(RelMsgErr.MANY_MANY_ERR)
@@ -55,10 +98,11 @@ class Relationship(TemplateModel):
             related_object=obj,
             relationship_type=type,
             optional=optional,
+            lazy=lazy,
         )
 
 
-class BackpopulatesRelationship(TemplateModel):
+class BackpopulatesRelationship(GraphEdge):
     """
     A class representing a backpopulates relationship between two objects.
 
@@ -69,13 +113,14 @@ class BackpopulatesRelationship(TemplateModel):
         back_populates_name (str): The name of the backpopulates relationship on the related object.
         back_populates_object (AppObject): The related object.
         optional (bool, optional): Whether the relationship is optional. Defaults to False.
+        lazy (LoadStrategy | None, optional): How the relationship is loaded. Both sides share the relationship,
+            so the strategy applies to the back populated side as well. Defaults to None.
     """
 
-    related_object: AppObject
-    relationship_type: RelationshipType
     optional: bool = False
     back_populates_name: str
     back_populates_object: AppObject
+    lazy: LoadStrategy | None = None
 
     def __init__(
         self,
@@ -85,6 +130,7 @@ class BackpopulatesRelationship(TemplateModel):
         back_populates_name: str,
         back_populates_object: AppObject,
         optional: bool = False,
+        lazy: LoadStrategy | None = None,
     ) -> None:
         super().__init__(
             name=name,
@@ -93,6 +139,7 @@ class BackpopulatesRelationship(TemplateModel):
             optional=optional,
             back_populates_object=back_populates_object,
             back_populates_name=back_populates_name,
+            lazy=lazy,
         )
 
 
@@ -103,6 +150,7 @@ def create_relationship(
     back_populates_object: AppObject | None = None,
     back_populates_name: str | None = None,
     optional: bool = False,
+    lazy: LoadStrategy | None = None,
 ) -> Relationship | BackpopulatesRelationship:
     """
     Creates a relationship between two objects.
@@ -114,10 +162,11 @@ def create_relationship(
     back_populates_object (AppObject | None): The related object.
     back_populates_name (str | None): The name of the backpopulates relationship on the related object.
     optional (bool): Whether the relationship is optional. Defaults to False.
+    lazy (LoadStrategy | None): How the relationship is loaded. Defaults to None.
 
     Returns:
     Relationship | BackpopulatesRelationship: The created relationship.
     """
     if back_populates_name and back_populates_object:
-        return BackpopulatesRelationship(name, obj, type, back_populates_name, back_populates_object, optional)
-    return Relationship(name, obj, type)
+        return BackpopulatesRelationship(name, obj, type, back_populates_name, back_populates_object, optional, lazy)
+    return Relationship(name, obj, type, lazy=lazy)